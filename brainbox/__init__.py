@@ -5,5 +5,5 @@ from .framework.brainbox import (
     CombinedPrerequisite, BrainBoxExtendedTask, BrainBox, BrainBoxServer, BrainBoxServiceSettings
 )
 from .framework.controllers import IController, ControllerOverDecider, ControllersSetup
-from .framework.job_processing import FailedJobArgument, SimplePlanner, AlwaysOnPlanner
+from .framework.job_processing import FailedJobArgument, SimplePlanner, AlwaysOnPlanner, ResourceAwarePlanner, CostModelPlanner
 from .framework.media_library import MediaLibrary
\ No newline at end of file
@@ -3,7 +3,6 @@ from ....framework import DockerWebServiceApi, File, FileLike, BrainBoxApi
 from .workflows import IWorkflow, TextToImage, Upscale, WD14Interrogate
 from .settings import ComfyUISettings
 from .controller import ComfyUIController
-import requests
 import time
 from pathlib import Path
 from yo_fluq import FileIO
@@ -37,14 +36,14 @@ class ComfyUI(DockerWebServiceApi[ComfyUISettings, ComfyUIController]):
         json = workflow.create_workflow_json(self.current_job_id)
 
         address = f'http://{self.address}/prompt'
-        result = requests.post(address, json=dict(prompt=json))
+        result = self.session.post(address, json=dict(prompt=json))
         if result.status_code!=200:
             raise ValueError(
                 f"Decider ComfyUI could not schedule the workflow {type(workflow)}:\n\n{result.text}\n\n{json}\n\n{[f.name for f in input_files]}"
             )
 
         while True:
-            queue_state = requests.get(address).json()
+            queue_state = self.session.get(address).json()
             remaining = queue_state.get('exec_info', {}).get('queue_remaining', None)
             if remaining is None:
                 raise ValueError(f"Unexpected state reply {queue_state}")
@@ -56,7 +55,10 @@ class ComfyUI(DockerWebServiceApi[ComfyUISettings, ComfyUIController]):
         output_folder = self.controller.resource_folder('output')
         for file in sorted(os.listdir(output_folder)):
             if file.startswith(self.current_job_id):
-                resulting_files.append(File.read(output_folder/file))
+                content = File.read(output_folder/file)
+                resulting_files.append(content)
+                # ComfyUI reports only the completion of the whole prompt, so the outputs are streamed once it is done
+                self.context.logger.partial_result(content)
                 os.unlink(output_folder/file)
 
         for input_file_name in input_files:
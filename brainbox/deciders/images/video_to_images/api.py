@@ -14,15 +14,16 @@ class VideoToImages(OnDemandDockerApi[VideoToImagesSettings, VideoToImagesContro
         self.controller.get_deployment().stop().remove()
         self.controller.run_with_configuration(config)
         folder = self.controller.resource_folder('output')
-        result = {}
-        for file in Query.folder(folder):
-            name = int(file.name.split('.')[0])
+        index_to_file = {int(file.name.split('.')[0]): file for file in Query.folder(folder)}
+        result = []
+        for name in sorted(index_to_file):
+            if cap_result_count is not None and len(result) >= cap_result_count:
+                break
             fname = f'{self.current_job_id}.{name}.png'
-            shutil.copy(file, self.cache_folder/fname)
-            result[name] = fname
-        result = [result[key] for key in sorted(result)]
-        if cap_result_count is not None:
-            result = result[:cap_result_count]
+            with self.context.cache_store.write_file(fname) as path:
+                shutil.copy(index_to_file[name], path)
+            self.context.logger.partial_result(fname)
+            result.append(fname)
         return result
 
 
@@ -1,6 +1,5 @@
 import base64
 from pathlib import Path
-import requests
 from ....framework import DockerWebServiceApi, FileLike
 from .controller import YoloController
 from .settings import YoloSettings
@@ -21,17 +20,17 @@ class Yolo(DockerWebServiceApi):
 
         with FileLike(file, self.cache_folder) as stream:
             data = base64.b64encode(stream.read()).decode("utf-8")
-            response = requests.post(f"http://{self.address}/post_image", data={"image_base64": data})
+            response = self.session.post(f"http://{self.address}/post_image", data={"image_base64": data})
         if response.status_code != 200:
             raise ValueError(response.text)
-        response = requests.get(f"http://{self.address}/get_coordinates_faces")
+        response = self.session.get(f"http://{self.address}/get_coordinates_faces")
         if response.status_code != 200:
             raise ValueError(response.text)
         return response.json()
 
 
     def load_model(self, model_id: str):
-        reply = requests.post(
+        reply = self.session.post(
             f"http://{self.address}/load_model",
             json={
             "model_id": model_id,
@@ -41,7 +40,7 @@ class Yolo(DockerWebServiceApi):
 
 
     def get_loaded_model(self):
-        reply = requests.get(f"http://{self.address}/get_loaded_model")
+        reply = self.session.get(f"http://{self.address}/get_loaded_model")
         return reply.json()['name']
 
 
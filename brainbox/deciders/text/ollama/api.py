@@ -1,4 +1,3 @@
-import requests
 from ....framework import DockerWebServiceApi
 from .model import OllamaModel
 from .settings import OllamaSettings
@@ -10,7 +9,7 @@ class Ollama(DockerWebServiceApi[OllamaSettings, OllamaController]):
 
 
     def completions_json(self, prompt: str, **kwargs):
-        reply = requests.post(
+        reply = self.session.post(
             f'http://{self.address}/api/generate',
             json=dict(
                 model=self.container_parameter,
@@ -27,7 +26,7 @@ class Ollama(DockerWebServiceApi[OllamaSettings, OllamaController]):
         return self.completions_json(prompt, **kwargs)['response']
 
     def question_json(self, prompt: str):
-        reply = requests.post(
+        reply = self.session.post(
             f'http://{self.address}/api/chat',
             json=dict(
                 model=self.container_parameter,
@@ -9,7 +9,15 @@ from .functional_task_builder import FunctionalTaskBuilder
 class Collector(IDecider):
 
     def to_media_library(self, tags: Dict[str, Dict], **kwargs):
-        return CollectorToMediaLibraryConvertor(self.current_job_id, self.cache_folder, tags, kwargs).convert()
+        return CollectorToMediaLibraryConvertor(
+            self.current_job_id,
+            self.cache_folder,
+            self.context.cache_store,
+            tags,
+            kwargs,
+            self.context.logger.partial_result,
+            self.context.logger.report_progress
+        ).convert()
 
 
     def to_array(self, tags: dict[str, dict], **kwargs):
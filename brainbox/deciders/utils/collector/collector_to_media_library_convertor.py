@@ -1,14 +1,25 @@
 import uuid
 from typing import *
-from ....framework import FailedJobArgument, MediaLibrary
+from ....framework import FailedJobArgument, MediaLibrary, CacheStore
 from datetime import datetime
 from pathlib import Path
 import copy
 
 class CollectorToMediaLibraryConvertor:
-    def __init__(self, current_job_id: str, cache_folder: Path, tags: dict[str, dict], results: dict):
+    def __init__(self,
+                 current_job_id: str,
+                 cache_folder: Path,
+                 cache_store: CacheStore,
+                 tags: dict[str, dict],
+                 results: dict,
+                 on_record: Callable[[MediaLibrary.Record], None]|None = None,
+                 on_progress: Callable[[float], None]|None = None
+                 ):
         self.current_job_id = current_job_id
+        self.on_record = on_record
+        self.on_progress = on_progress
         self.cache_folder = cache_folder
+        self.cache_store = cache_store
         self.tags = tags
         self.results = results
         self.errors = []
@@ -50,6 +61,8 @@ class CollectorToMediaLibraryConvertor:
         )
         record.tags['option_index'] = index
         self.records.append(record)
+        if self.on_record is not None:
+            self.on_record(record)
 
     def convert(self):
         for id, tags in self.tags.items():
@@ -63,5 +76,6 @@ class CollectorToMediaLibraryConvertor:
 
         library = MediaLibrary(tuple(self.records), tuple(self.errors))
         fname = f'{self.current_job_id}.output.zip'
-        library.save(self.cache_folder / fname)
+        with self.cache_store.write_file(fname) as path:
+            library.save(path, on_progress=self.on_progress)
         return fname
\ No newline at end of file
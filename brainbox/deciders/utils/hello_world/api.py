@@ -1,5 +1,4 @@
 from ....framework import DockerWebServiceApi, File, FileLike, CacheUploadPrerequisite
-import requests
 from .settings import HelloBrainBoxSettings
 from .controller import HelloBrainBoxController
 from .model import HelloBrainBoxModel
@@ -12,7 +11,7 @@ class HelloBrainBox(DockerWebServiceApi[HelloBrainBoxSettings, HelloBrainBoxCont
 
 
     def json(self, argument: str):
-        result = requests.post(
+        result = self.session.post(
             self.endpoint('/decide'),
             json = dict(
                 argument=argument,
@@ -31,7 +30,7 @@ class HelloBrainBox(DockerWebServiceApi[HelloBrainBoxSettings, HelloBrainBoxCont
             return len(stream.read())
 
     def resources(self):
-        result = requests.get(self.endpoint('/resources'))
+        result = self.session.get(self.endpoint('/resources'))
         if result.status_code!=200:
             raise ValueError(f"Endpoint /resources returned unexpected status code {result.status_code}\n{result.text}")
         return result.json()
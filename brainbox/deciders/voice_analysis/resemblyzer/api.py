@@ -1,4 +1,3 @@
-import requests
 from pathlib import Path
 from ....framework import DockerWebServiceApi, FileLike, BrainBoxApi, MediaLibrary, ResourcePrerequisite, CombinedPrerequisite
 from .settings import ResemblyzerSettings
@@ -15,7 +14,7 @@ class Resemblyzer(DockerWebServiceApi[ResemblyzerSettings, ResemblyzerController
 
     def classify(self, file: str|Path|bytes, model: str):
         with FileLike(file, self.cache_folder) as file:
-            reply = requests.post(
+            reply = self.session.post(
                 f'http://{self.address}/classify/{model}',
                 files=(
                     ('file', file),
@@ -26,7 +25,7 @@ class Resemblyzer(DockerWebServiceApi[ResemblyzerSettings, ResemblyzerController
             return reply.json()['speaker']
 
     def train(self, model: str):
-        reply = requests.post(f'http://{self.address}/train/{model}')
+        reply = self.session.post(f'http://{self.address}/train/{model}')
         if reply.status_code != 200:
             raise ValueError(f"Resemblyzer threw an error\n{reply.text}")
         return reply.json()
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from brainbox.framework import ConnectionSettings
+from brainbox.framework import ConnectionSettings, ResourceCost
 
 @dataclass
 class ResemblyzerSettings:
     connection: ConnectionSettings = ConnectionSettings(20103, 15)
+    resource_cost: ResourceCost = ResourceCost(memory_in_gb=1, cpu_cores=1)
@@ -1,4 +1,3 @@
-import requests
 from ....framework import DockerWebServiceApi, FileLike
 from .controller import RhasspyKaldiController
 from .settings import RhasspyKaldiSettings
@@ -13,14 +12,14 @@ class RhasspyKaldi(DockerWebServiceApi[RhasspyKaldiSettings, RhasspyKaldiControl
             custom_words_str = '\n'.join(f'{k} {v}' for k, v in custom_words.items())
         else:
             custom_words_str = ''
-        reply = requests.post(f'http://{self.address}/train/{language}/{model}', json=dict(sentences=sentences, custom_words=custom_words_str))
+        reply = self.session.post(f'http://{self.address}/train/{language}/{model}', json=dict(sentences=sentences, custom_words=custom_words_str))
         if reply.status_code != 200:
             raise ValueError(f"RhasspyKaldi couldn't train for {language}/{model}\n{reply.text}")
         return reply.json()
 
     def transcribe(self, file: FileLike.Type, model: str):
         with FileLike(file, self.cache_folder) as file:
-            reply = requests.post(
+            reply = self.session.post(
                 f'http://{self.address}/transcribe/{model}',
                 files=(
                     ('file', file),
@@ -31,7 +30,7 @@ class RhasspyKaldi(DockerWebServiceApi[RhasspyKaldiSettings, RhasspyKaldiControl
             return reply.json()
 
     def phonemes(self, language: str):
-        return requests.get(f'http://{self.address}/phonemes/{language}').text
+        return self.session.get(f'http://{self.address}/phonemes/{language}').text
 
     Controller = RhasspyKaldiController
     Settings = RhasspyKaldiSettings
@@ -2,7 +2,6 @@ from ....framework import DockerWebServiceApi, FileLike, ISingleLoadableModelApi
 from .settings import WhisperSettings
 from .model import WhisperModel
 from .controller import WhisperController
-import requests
 from io import BytesIO
 import json
 
@@ -29,7 +28,7 @@ class Whisper(DockerWebServiceApi[WhisperSettings, WhisperController], ISingleLo
         json_file.seek(0)
 
         with FileLike(file, self.cache_folder) as stream:
-            reply = requests.post(
+            reply = self.session.post(
                 f'http://{self.address}/transcribe',
                 files=(
                     ('file', stream),
@@ -52,15 +51,15 @@ class Whisper(DockerWebServiceApi[WhisperSettings, WhisperController], ISingleLo
 
 
     def load_model(self, model: str):
-        reply = requests.post(f'http://{self.address}/load_model', json=dict(model=model))
+        reply = self.session.post(f'http://{self.address}/load_model', json=dict(model=model))
         if reply.status_code != 200:
             raise ValueError(reply.text)
 
     def get_loaded_model_name(self) -> str|None:
-        return requests.get(self.endpoint('/get_loaded_model')).json()
+        return self.session.get(self.endpoint('/get_loaded_model')).json()
 
     def get_loaded_model(self):
-        reply = requests.get(f'http://{self.address}/get_loaded_model')
+        reply = self.session.get(f'http://{self.address}/get_loaded_model')
         return reply.json()
 
     Controller = WhisperController
@@ -70,3 +69,7 @@ class Whisper(DockerWebServiceApi[WhisperSettings, WhisperController], ISingleLo
     @classmethod
     def get_ordering_arguments_sequence(cls) -> tuple[str,...]|None:
         return ('model',)
+
+    @classmethod
+    def is_result_cacheable(cls, method: str|None) -> bool:
+        return method in ('transcribe', 'transcribe_json')
@@ -1,11 +1,12 @@
 from dataclasses import dataclass
-from ....framework import ConnectionSettings
+from ....framework import ConnectionSettings, ResourceCost
 from .model import WhisperModel
 
 
 @dataclass
 class WhisperSettings:
     connection: ConnectionSettings = ConnectionSettings(20102, 15)
+    resource_cost: ResourceCost = ResourceCost(memory_in_gb=2, cpu_cores=2, gpu_memory_in_gb=1)
 
     models_to_download: tuple[WhisperModel,...] = (
         WhisperModel('base'),
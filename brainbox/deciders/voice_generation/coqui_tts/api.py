@@ -1,4 +1,3 @@
-import requests
 from ....framework import ResourcePrerequisite, DockerWebServiceApi, File, CombinedPrerequisite, ISingleLoadableModelApi
 from .controller import CoquiTTSController
 from .settings import CoquiTTSSettings
@@ -9,7 +8,7 @@ class CoquiTTS(DockerWebServiceApi[CoquiTTSSettings, CoquiTTSController], ISingl
         super().__init__(address)
 
     def load_model(self, model: str):
-        result = requests.post(
+        result = self.session.post(
             f'http://{self.address}/load_model',
             json=dict(model=model)
         )
@@ -18,7 +17,7 @@ class CoquiTTS(DockerWebServiceApi[CoquiTTSSettings, CoquiTTSController], ISingl
         return result.json()
 
     def get_loaded_model(self):
-        result =requests.get(
+        result =self.session.get(
             self.endpoint('/get_loaded_model')
         )
         if result.status_code!=200:
@@ -32,7 +31,7 @@ class CoquiTTS(DockerWebServiceApi[CoquiTTSSettings, CoquiTTSController], ISingl
         return model['name']
 
     def dub(self, text: str, model: str|None = None, voice: str|None = None, language: str|None = None):
-        reply = requests.post(
+        reply = self.session.post(
             self.endpoint('/dub'),
             json=dict(text=text, model=model, voice=voice, language=language)
         )
@@ -41,7 +40,7 @@ class CoquiTTS(DockerWebServiceApi[CoquiTTSSettings, CoquiTTSController], ISingl
         return File(self.current_job_id + '.output.wav', reply.content, File.Kind.Audio)
 
     def voice_clone(self, text: str, model: str|None = None, voice: str|None = None, language: str|None = None):
-        reply = requests.post(
+        reply = self.session.post(
             self.endpoint('/voice_clone'),
             json=dict(text=text, model=model, voice=voice, language=language)
         )
@@ -1,5 +1,4 @@
 from typing import *
-import requests
 from urllib.parse import urlencode
 from ....framework import IDecider, File, DockerWebServiceApi
 from .settings import OpenTTSSettings
@@ -18,7 +17,7 @@ class OpenTTS(DockerWebServiceApi[OpenTTSSettings, OpenTTSController]):
              ):
         parameters = dict(text=text, voice=voice, lang=lang, speakerId=speakerId)
         query_string = urlencode(parameters)
-        reply = requests.get(f'http://{self.address}/api/tts?' + query_string)
+        reply = self.session.get(f'http://{self.address}/api/tts?' + query_string)
         if reply.status_code != 200:
             raise ValueError(f'OpenTTS server returned {reply.status_code}\n{reply.text}')
         result = File(self.current_job_id+'.output.wav', reply.content, File.Kind.Audio)
@@ -33,4 +32,8 @@ class OpenTTS(DockerWebServiceApi[OpenTTSSettings, OpenTTSController]):
         return self.voiceover(text,voice,lang,speakerId)
 
     Controller = OpenTTSController
-    Settings = OpenTTSSettings
\ No newline at end of file
+    Settings = OpenTTSSettings
+
+    @classmethod
+    def is_result_cacheable(cls, method: str|None) -> bool:
+        return method in (None, 'voiceover')
\ No newline at end of file
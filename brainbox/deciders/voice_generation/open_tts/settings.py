@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from ....framework import ConnectionSettings
+from ....framework import ConnectionSettings, ResourceCost
 
 @dataclass
 class OpenTTSSettings:
     connection = ConnectionSettings(20201, 30)
+    resource_cost: ResourceCost = ResourceCost(memory_in_gb=1, cpu_cores=1)
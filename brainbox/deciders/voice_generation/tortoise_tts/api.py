@@ -1,6 +1,5 @@
 from typing import Iterable, Optional
 import os
-import requests
 from ....framework import File, DockerWebServiceApi, FileIO, Loc, LocalExecutor, CombinedPrerequisite, IPrerequisite
 from pathlib import Path
 from .controller import TortoiseTTSController
@@ -17,7 +16,7 @@ class TortoiseTTS(DockerWebServiceApi[TortoiseTTSSettings, TortoiseTTSController
 
 
     def dub(self, text: str, voice: str, count = 3):
-        result = requests.post(f'http://{self.address}/dub', json=dict(output_file_name = self.current_job_id, text=text, voice=voice, count=count))
+        result = self.session.post(f'http://{self.address}/dub', json=dict(output_file_name = self.current_job_id, text=text, voice=voice, count=count))
         if result.status_code == 500:
             raise ValueError(f"TortoiseTTS server returned {result.status_code}\n{result.text}")
         files = []
@@ -1,10 +1,12 @@
-from typing import Iterable, Union
-from ...common.marshalling import Api, bind_to_api, TestApi
-from ...common import File, Loc, FileLike, IDecider, Locator
+from typing import Iterable, Union, BinaryIO, AsyncIterator
+from ...common.marshalling import Api, bind_to_api, TestApi, AsyncApi, bind_to_async_api
+from ...common import File, Loc, FileLike, IDecider, Locator, CacheStore, HttpSessionSettings
 from .interface import IBrainboxService
+from .task import IBrainBoxTask
 from .service import BrainBoxService
 from ...controllers import IController, ControllerRegistry, ControllerApi
 import os
+import asyncio
 import requests
 from .server import BrainBoxServer, BrainBoxServiceSettings
 from pathlib import Path
@@ -17,14 +19,17 @@ from functools import partial
 class BrainBoxApi(Api, IBrainboxService):
     def __init__(self,
                  address: str = '127.0.0.1:18090',
-                 cache_folder: Path|None = None
+                 cache_folder: Path|None = None,
+                 session_settings: HttpSessionSettings|None = None
                  ):
-        super().__init__(address)
+        super().__init__(address, session_settings)
         self.cache_folder = cache_folder if cache_folder is not None else Loc.cache_folder
+        self.upload_chunk_size = 16*1024*1024
+        self.transfer_attempts = 3
 
     @property
     def controller_api(self) -> ControllerApi:
-        return ControllerApi(self.address)
+        return ControllerApi(self.address, self.session_settings)
 
     def _process_download_arguments(
             self,
@@ -42,25 +47,50 @@ class BrainBoxApi(Api, IBrainboxService):
                 should_download = False
         return should_download, fname, custom_file_path
 
-    def _download_and_cache(self, fname: str, path: Path) -> bytes:
+    def _download_and_cache(self, fname: str, path: Path):
         address = f'http://{self.address}/cache/download/{fname}'
-        response = requests.get(address)
-        if response.status_code != 200:
-            raise ValueError(f"Couldn't get file content for {address}\n" + response.text)
-        content = response.content
-
-        with open(path, 'wb') as stream:
-            stream.write(content)
-        return content
-
+        # The partial file is kept when the transfer fails, so the next download of the same file resumes it
+        partial_path = path.parent/f'{path.name}.partial'
+        for attempt in range(self.transfer_attempts):
+            offset = partial_path.stat().st_size if partial_path.is_file() else 0
+            headers = {} if offset == 0 else {'Range': f'bytes={offset}-'}
+            try:
+                with self.session.get(address, headers=headers, stream=True) as response:
+                    if response.status_code == 416:
+                        # The partial file doesn't match the file on the server anymore
+                        os.unlink(partial_path)
+                        continue
+                    if response.status_code not in (200, 206):
+                        raise ValueError(f"Couldn't get file content for {address}\n" + response.text)
+                    with open(partial_path, 'ab' if response.status_code == 206 else 'wb') as stream:
+                        for chunk in response.iter_content(CacheStore.ChunkSize):
+                            stream.write(chunk)
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                if attempt == self.transfer_attempts - 1:
+                    raise
+        else:
+            raise ValueError(f"Couldn't download {address} in {self.transfer_attempts} attempts")
+        os.replace(partial_path, path)
 
     def open_file(self, fname: str|File) -> File:
         should_download, fname, path = self._process_download_arguments(fname)
         if should_download:
-            content = self._download_and_cache(fname, path)
-            return File(fname, content)
-        else:
-            return File.read(path)
+            self._download_and_cache(fname, path)
+        return File.read(path)
+
+    def open_file_stream(self, fname: str|File) -> BinaryIO:
+        if isinstance(fname, File):
+            fname = fname.name
+        path = self.cache_folder/fname
+        if path.is_file():
+            return open(path, 'rb')
+        address = f'http://{self.address}/cache/download/{fname}'
+        response = self.session.get(address, stream=True)
+        if response.status_code != 200:
+            raise ValueError(f"Couldn't get file content for {address}\n" + response.text)
+        response.raw.decode_content = True
+        return response.raw
 
     def download(self, fname: str|File, custom_file_path: Path|None = None, replace: bool = False) -> Path:
         should_download, fname, path = self._process_download_arguments(fname, custom_file_path, replace)
@@ -70,14 +100,79 @@ class BrainBoxApi(Api, IBrainboxService):
 
     def upload(self, filename: str, data: FileLike.Type):
         with FileLike(data, None) as stream:
-            reply = requests.post(
-                f'http://{self.address}/cache/upload',
-                files=(
-                    (filename, stream),
-                )
-            )
-        if reply.status_code != 200:
-            raise ValueError(reply.text)
+            # The server keeps files by content, so the same content is only linked under the new name
+            hash = CacheStore.hash_stream(stream)
+            if self.link_cached_file(filename, hash):
+                return
+            self._upload_stream(filename, hash, stream)
+
+    def _upload_stream(self, filename: str, hash: str, stream: BinaryIO):
+        address = f'http://{self.address}/cache/upload_stream/{hash}'
+        offset = int(self.session.get(address).text)
+        failures = 0
+        while True:
+            stream.seek(offset)
+            chunk = stream.read(self.upload_chunk_size)
+            params = dict(offset=offset)
+            if len(chunk) < self.upload_chunk_size:
+                params['name'] = filename
+            try:
+                reply = self.session.put(address, params=params, data=chunk)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError):
+                reply = None
+            if reply is None or reply.status_code == 409:
+                # The server has a different view of what was received, which is restored from the server side
+                failures += 1
+                if failures >= self.transfer_attempts:
+                    raise ValueError(f"Couldn't upload {filename} in {self.transfer_attempts} attempts")
+                offset = int(self.session.get(address).text)
+                continue
+            if reply.status_code != 200:
+                raise ValueError(reply.text)
+            offset = int(reply.text)
+            if 'name' in params:
+                return
+
+
+    @bind_to_async_api(BrainBoxService)
+    class Async(AsyncApi):
+        def __init__(self,
+                     address: str = '127.0.0.1:18090',
+                     cache_folder: Path|None = None,
+                     session_settings: HttpSessionSettings|None = None
+                     ):
+            super().__init__(address, session_settings)
+            # Prerequisites and postprocessors of the tasks are synchronous and work with the blocking API,
+            # so they run in a worker thread, while the jobs themselves are awaited on the event loop
+            self.sync_api = BrainBoxApi(address, cache_folder, session_settings)
+
+        async def add(self, task: Union[IBrainBoxTask, Iterable[IBrainBoxTask]]):
+            job_dicts = await asyncio.to_thread(IBrainboxService._create_job_dicts, task, self.sync_api)
+            await self.base_add(job_dicts)
+
+        async def join(self, task: Union[IBrainBoxTask, str, Iterable[Union[IBrainBoxTask, str]]]):
+            ids, postprocessors, not_list = IBrainboxService._prepare_join(task, self.sync_api)
+            result = await self.base_join(ids)
+            return await asyncio.to_thread(IBrainboxService._postprocess_join, result, postprocessors, not_list)
+
+        async def execute(self, task: Union[IBrainBoxTask, Iterable[IBrainBoxTask]]):
+            await self.add(task)
+            return await self.join(task)
+
+        async def iterate_results(self, task: Union[IBrainBoxTask, str]) -> AsyncIterator:
+            id = IBrainboxService._get_job_id(task)
+            start = 0
+            while True:
+                reply = await self.partial_results(id, start)
+                for chunk in reply['chunks']:
+                    yield chunk
+                start += len(reply['chunks'])
+                if not reply['finished']:
+                    continue
+                IBrainboxService._check_partial_results_reply(id, reply)
+                if start == 0:
+                    yield reply['result']
+                return
 
 
     class Test(TestApi['BrainBoxApi']):
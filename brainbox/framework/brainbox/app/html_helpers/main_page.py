@@ -1,6 +1,6 @@
 import pandas as pd
 
-from ....job_processing import Job
+from ....job_processing import Job, QueueEstimate
 from .batch_page import _select, _pretty_sec
 from sqlalchemy import select, case, func
 from yo_fluq import *
@@ -107,15 +107,37 @@ def _to_html(df):
     return ''.join(html)
 
 
-def create_main_page(session):
+def _estimates_to_html(estimates: list[QueueEstimate]):
+    if len(estimates) == 0:
+        return ''
+    html = ['<table border=1 cellspacing=0>']
+    html.append('<tr><th>Decider</th><th>Tasks</th><th>Startup</th><th>Processing</th><th>Done in</th></tr>')
+    elapsed = 0
+    for estimate in estimates:
+        elapsed += estimate.total_in_seconds
+        html.append('<tr>')
+        html.append(f'<td>{estimate.key}</td>')
+        html.append(f'<td>{estimate.tasks_count}</td>')
+        html.append(f'<td>{_pretty_sec(estimate.startup_in_seconds)}</td>')
+        html.append(f'<td>{_pretty_sec(estimate.processing_in_seconds)}</td>')
+        html.append(f'<td>{_pretty_sec(elapsed)}</td>')
+        html.append('</tr>')
+    html.append('</table>')
+    html.append(f'Expected queue drain time: {_pretty_sec(elapsed)}</br></br>')
+    return ''.join(html)
+
+
+def create_main_page(session, estimates: list[QueueEstimate]|None = None):
     df = _get_merged_frame(*_get_frames(session))
     if df is None:
         html = ''
     else:
         html = _to_html(df)
+    estimates_html = _estimates_to_html(estimates) if estimates is not None else ''
     return f'''
 <html><body>
 [<a href="/html/jobs/operator_log">Operator log</a>]&nbsp;[<a href="/html/controllers/status">Controllers</a>]</br>
+{estimates_html}
 <table border=1 cellspacing=0>
 {html}
 </table></body></html>'
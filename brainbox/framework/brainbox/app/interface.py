@@ -2,6 +2,7 @@ from typing import *
 from .task import IBrainBoxTask
 from abc import ABC, abstractmethod
 from ...job_processing import Job, OperatorLogItem
+from ...common import CacheMaintenanceReport
 
 
 
@@ -37,6 +38,10 @@ class IBrainboxService(ABC):
     def job(self, id: str) -> Job:
         pass
 
+    @abstractmethod
+    def partial_results(self, id: str, start: int = 0, timeout_in_seconds: float = 10) -> dict:
+        pass
+
     @abstractmethod
     def summary(self, ids: list[str]|None = None, batch_id: str|None = None) -> list[dict]:
         pass
@@ -49,13 +54,22 @@ class IBrainboxService(ABC):
     def get_operator_log(self, entries_count: int = 100) -> list[OperatorLogItem]:
         pass
 
+    @abstractmethod
+    def link_cached_file(self, name: str, hash: str) -> bool:
+        pass
+
+    @abstractmethod
+    def maintain_cache(self) -> CacheMaintenanceReport:
+        pass
+
     @abstractmethod
     def shutdown(self):
         pass
 
-    def add(self, task: Union[IBrainBoxTask, Iterable[IBrainBoxTask]]):
+    @staticmethod
+    def _create_job_dicts(task: Union[IBrainBoxTask, Iterable[IBrainBoxTask]], api) -> list[dict]:
         if isinstance(task, IBrainBoxTask):
-            task.before_add(self)
+            task.before_add(api)
             task = [task]
         else:
             try:
@@ -65,7 +79,7 @@ class IBrainboxService(ABC):
             for index, t in enumerate(task):
                 if not isinstance(t, IBrainBoxTask):
                     raise ValueError(f"Expected task at position #{index}, but was {t}")
-                t.before_add(self)
+                t.before_add(api)
 
         job_dicts = []
         for t in task:
@@ -73,13 +87,14 @@ class IBrainboxService(ABC):
             batch_id = t.get_resulting_id()
             for j in jobs:
                 j.batch = batch_id
-                d = j.__dict__
-                del d['_sa_instance_state']
-                job_dicts.append(d)
+                job_dicts.append(j.to_dict())
+        return job_dicts
 
-        self.base_add(job_dicts)
+    def add(self, task: Union[IBrainBoxTask, Iterable[IBrainBoxTask]]):
+        self.base_add(IBrainboxService._create_job_dicts(task, self))
 
-    def join(self, task: Union[IBrainBoxTask, str, Iterable[Union[IBrainBoxTask, str]]]):
+    @staticmethod
+    def _prepare_join(task: Union[IBrainBoxTask, str, Iterable[Union[IBrainBoxTask, str]]], api) -> tuple[list[str], list[_ArrayPostprocessor], bool]:
         if isinstance(task, str) or isinstance(task, IBrainBoxTask):
             task = [task]
             not_list = True
@@ -96,26 +111,61 @@ class IBrainboxService(ABC):
         for true_index, t in enumerate(task):
             if isinstance(t, str):
                 ids.append(t)
-                postprocessors.append(_ArrayPostprocessor(index, self))
+                postprocessors.append(_ArrayPostprocessor(index, api))
                 index += 1
 
             elif isinstance(t, IBrainBoxTask):
                 id = t.get_resulting_id()
                 if id is None:
-                    postprocessors.append(_ArrayPostprocessor(None, self))
+                    postprocessors.append(_ArrayPostprocessor(None, api))
                 else:
                     ids.append(t.get_resulting_id())
-                    postprocessors.append(_ArrayPostprocessor(index, self, t.postprocess_result))
+                    postprocessors.append(_ArrayPostprocessor(index, api, t.postprocess_result))
                     index+=1
             else:
                 raise ValueError(f"Error at index {true_index}: expected str (job id) or IBrainBoxTask, but was {t}")
+        return ids, postprocessors, not_list
 
-        result = self.base_join(ids)
+    @staticmethod
+    def _postprocess_join(result: list, postprocessors: list[_ArrayPostprocessor], not_list: bool):
         result = [postproc(result) for postproc in postprocessors]
         if not_list:
             return result[0]
         return result
 
+    def join(self, task: Union[IBrainBoxTask, str, Iterable[Union[IBrainBoxTask, str]]]):
+        ids, postprocessors, not_list = IBrainboxService._prepare_join(task, self)
+        return IBrainboxService._postprocess_join(self.base_join(ids), postprocessors, not_list)
+
+    @staticmethod
+    def _get_job_id(task: Union[IBrainBoxTask, str]) -> str:
+        if isinstance(task, IBrainBoxTask):
+            return task.get_resulting_id()
+        elif isinstance(task, str):
+            return task
+        raise ValueError(f"Task is expected to be str (job id) or IBrainBoxTask, but was {task}")
+
+    @staticmethod
+    def _check_partial_results_reply(id: str, reply: dict):
+        if not reply['success']:
+            stars = '*~' * 30
+            raise ValueError(f"Job {id} threw an error:\n{stars}\n{reply['error']}\n{stars}")
+
+    def iterate_results(self, task: Union[IBrainBoxTask, str]) -> Iterable:
+        id = IBrainboxService._get_job_id(task)
+        start = 0
+        while True:
+            reply = self.partial_results(id, start)
+            yield from reply['chunks']
+            start += len(reply['chunks'])
+            if not reply['finished']:
+                continue
+            IBrainboxService._check_partial_results_reply(id, reply)
+            # Deciders that do not stream their output produce the whole result as the only chunk
+            if start == 0:
+                yield reply['result']
+            return
+
     def execute(self, task: Union[IBrainBoxTask, Iterable[IBrainBoxTask]]):
         self.add(task)
         return self.join(task)
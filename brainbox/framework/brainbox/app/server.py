@@ -1,13 +1,11 @@
 import pickle
 import flask
 from ...common.marshalling import Server
-from ...common import Loc
+from ...common import Loc, UploadOffsetMismatchError
 from .service import BrainBoxServiceSettings, BrainBoxService
 from ...controllers import ControllerServer, ControllerServerSettings
 from flask import Flask
 from . import html_helpers
-from sqlalchemy.orm import Session
-import io
 
 class BrainBoxServer(Server):
     def __init__(self, settings: BrainBoxServiceSettings):
@@ -15,7 +13,7 @@ class BrainBoxServer(Server):
         controller_settings = ControllerServerSettings(settings.registry, settings.port)
         self._controller_server = ControllerServer(controller_settings)
         self.service = BrainBoxService(settings)
-        super().__init__(settings.port, self.service)
+        super().__init__(settings.port, self.service, serving=settings.serving)
 
     def __call__(self):
         self.service.run()
@@ -30,6 +28,8 @@ class BrainBoxServer(Server):
 
         app.add_url_rule('/cache/upload/', view_func=self._upload_cache_file, methods=['POST'])
         app.add_url_rule('/cache/download/<fname>', view_func=self._download_cache_file, methods=['GET'])
+        app.add_url_rule('/cache/upload_stream/<hash>', view_func=self._get_upload_offset, methods=['GET'])
+        app.add_url_rule('/cache/upload_stream/<hash>', view_func=self._upload_cache_file_chunk, methods=['PUT'])
 
 
         app.add_url_rule('/html/jobs/main_page', view_func=self._main_page, methods=['GET'])
@@ -37,11 +37,11 @@ class BrainBoxServer(Server):
         app.add_url_rule('/html/jobs/operator_log', view_func=self._operator_log, methods=['GET'])
 
     def _main_page(self):
-        with Session(self.service.engine) as session:
-            return html_helpers.create_main_page(session)
+        with self.service.store.create_session() as session:
+            return html_helpers.create_main_page(session, self.service.get_queue_estimates())
 
     def _batch_page(self, batch_id: str):
-        with Session(self.service.engine) as session:
+        with self.service.store.create_session() as session:
             return html_helpers.create_batch_page(session, batch_id)
 
     def _operator_log(self):
@@ -50,12 +50,29 @@ class BrainBoxServer(Server):
 
     def _upload_cache_file(self):
         for key, value in flask.request.files.items():
-            value.save(self.settings.locator.cache_folder/key)
+            self.service.cache_store.put_stream(key, value.stream)
         return 'OK'
 
+    def _get_upload_offset(self, hash):
+        return str(self.service.cache_store.get_upload_offset(hash))
+
+    def _upload_cache_file_chunk(self, hash):
+        store = self.service.cache_store
+        offset = int(flask.request.args.get('offset', 0))
+        try:
+            new_offset = store.append_upload(hash, offset, flask.request.stream)
+        except UploadOffsetMismatchError as error:
+            return str(error.current_offset), 409
+        name = flask.request.args.get('name', None)
+        if name is not None:
+            store.finish_upload(hash, name)
+        return str(new_offset)
+
     def _download_cache_file(self, fname):
-        with open(self.settings.locator.cache_folder/fname, 'rb') as file:
-            return flask.send_file(
-                io.BytesIO(file.read()),
-                mimetype='application/octet-stream'
-            )
+        self.service.cache_store.touch(fname)
+        # send_file streams the file from the disk, using sendfile where the server supports it, and answers range requests
+        return flask.send_file(
+            self.settings.locator.cache_folder/fname,
+            mimetype='application/octet-stream',
+            conditional=True
+        )
@@ -3,6 +3,7 @@ from ...common import IDecider
 from .service import BrainBoxService, BrainBoxServiceSettings
 from ...controllers import ControllerRegistry, IController
 from ...common import Locator, Loc
+from ...job_processing import IJobStore, IPlanner, SimplePlanner
 
 
 class ServerlessTest:
@@ -10,10 +11,16 @@ class ServerlessTest:
                  services: Iterable[Union[Union[IController, IDecider]]],
                  time_limit_in_seconds: int = 10,
                  allow_failures: bool = False,
+                 job_store: IJobStore|None = None,
+                 planner: IPlanner|None = None,
+                 result_cache_max_entries: int = 0,
                  ):
         self.services = services
         self.time_limit_in_seconds = time_limit_in_seconds
         self.allow_failures = allow_failures
+        self.job_store = job_store
+        self.planner = planner if planner is not None else SimplePlanner()
+        self.result_cache_max_entries = result_cache_max_entries
         self.folder = Loc.create_test_folder('brainbox_serverless_test_runs')
 
 
@@ -22,7 +29,10 @@ class ServerlessTest:
         locator = Locator(self.folder.path)
         self._service = BrainBoxService(BrainBoxServiceSettings(
             ControllerRegistry(self.services),
-            locator=locator
+            planner=self.planner,
+            locator=locator,
+            job_store=self.job_store,
+            result_cache_max_entries=self.result_cache_max_entries
         ))
         self._service.run()
         return self._service
@@ -1,16 +1,17 @@
 from ...common.marshalling import endpoint
 from .interface import IBrainboxService
 from ...controllers import ControllerRegistry
-from ...job_processing import IPlanner, MainLoop, Core, Job, SimplePlanner, OperatorLogItem, FailedJobArgument
+from ...job_processing import (
+    IPlanner, MainLoop, Core, Job, JobLog, JobChunk, JobPayload, SimplePlanner, OperatorLogItem, FailedJobArgument, IJobStore,
+    SqliteJobStore, CompletionWaiter, QueueEstimate, ResultCache
+)
 from dataclasses import dataclass, field
 from pathlib import Path
-from ...common import Loc, Locator
-from sqlalchemy import create_engine, select, Engine
-from sqlalchemy.orm import Session
+from ...common import Loc, Locator, CacheStore, CacheMaintenanceReport, IServingBackend, ThreadPoolServing
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from threading import Thread
 from datetime import datetime, timedelta
-from ...job_processing.core.job import BrainBoxBase
-import time
 
 @dataclass
 class BrainBoxServiceSettings:
@@ -20,6 +21,12 @@ class BrainBoxServiceSettings:
     debug_output: bool = False
     locator: Locator = Loc
     stop_controllers_at_termination: bool = True
+    job_store: IJobStore|None = None
+    cache_byte_budget: int|None = None
+    cache_ttl_in_seconds: float|None = None
+    result_cache_max_entries: int = 0
+    result_cache_ttl_in_seconds: float|None = 24*60*60
+    serving: IServingBackend = field(default_factory=ThreadPoolServing)
 
 
 
@@ -30,9 +37,26 @@ class BrainBoxService(IBrainboxService):
 
 
     def run(self):
-        self.engine = create_engine('sqlite:///'+str(self.settings.locator.db_path))
-        BrainBoxBase.metadata.create_all(self.engine)
-        core = Core(self.engine, self.settings.registry, self.settings.locator, self.settings.debug_output)
+        self.store = self.settings.job_store
+        if self.store is None:
+            self.store = SqliteJobStore(self.settings.locator.db_path)
+        self.store.initialize()
+        self.engine = self.store.engine
+        self.cache_store = CacheStore(
+            self.settings.locator.cache_folder,
+            self.settings.cache_byte_budget,
+            self.settings.cache_ttl_in_seconds
+        )
+        core = Core(self.store, self.settings.registry, self.settings.locator, self.settings.debug_output)
+        core.cache_store = self.cache_store
+        self.result_cache = None
+        if self.settings.result_cache_max_entries > 0:
+            self.result_cache = ResultCache(
+                self.cache_store,
+                self.settings.result_cache_max_entries,
+                self.settings.result_cache_ttl_in_seconds
+            )
+        core.result_cache = self.result_cache
         self.loop = MainLoop(core, self.settings.planner, self.settings.stop_controllers_at_termination)
         self.loop_thread = Thread(target=self.loop.run)
         self.loop_thread.start()
@@ -40,12 +64,43 @@ class BrainBoxService(IBrainboxService):
     @endpoint(url='/jobs/add', method='POST')
     def base_add(self, jobs:list[dict]):
         now = datetime.now()
-        with Session(self.engine) as session:
+        dependencies = []
+        completed_from_cache = []
+        with self.store.create_session() as session:
             for i, job_dict in enumerate(jobs):
                 job = Job(**job_dict)
                 job = job.set_defaults(now + timedelta(microseconds=i))
                 session.add(job)
+                dependencies.append((job.id, job.dependencies))
+                self.cache_store.add_references(job.id, self.cache_store.find_names(job.arguments))
+                if job.dependencies is not None:
+                    self.cache_store.add_dependencies(job.id, job.dependencies.values())
+                if self._complete_from_result_cache(job, now):
+                    completed_from_cache.append(job.id)
             session.commit()
+        self.loop.core.dependency_index.on_jobs_added(dependencies)
+        if len(completed_from_cache) > 0:
+            self.loop.core.on_jobs_finished(completed_from_cache)
+        self.loop.notify()
+
+    def _complete_from_result_cache(self, job: Job, now: datetime) -> bool:
+        if self.result_cache is None:
+            return False
+        key = self.result_cache.get_key(job)
+        if key is None:
+            return False
+        found, result = self.result_cache.try_get(key)
+        if not found:
+            self.result_cache.expect(job.id, key)
+            return False
+        job.result = result
+        job.ready = True
+        job.ready_timestamp = now
+        job.finished = True
+        job.finished_timestamp = now
+        job.success = True
+        job.progress = 1
+        return True
 
     @endpoint(url='/jobs/join', method='GET')
     def base_join(self,
@@ -54,47 +109,106 @@ class BrainBoxService(IBrainboxService):
                   allow_failures: bool = False
                   ) -> list:
         begin = datetime.now()
+        waiter = self.loop.core.completion_registry.register(ids)
+        try:
+            self._wait_for_completion(waiter, ids, begin, time_limit_in_secods, allow_failures)
+        finally:
+            self.loop.core.completion_registry.unregister(waiter)
+
+        with self.store.create_session() as session:
+            jobs: list[Job] = list(session.scalars(select(Job).where(Job.id.in_(ids)).options(selectinload(Job.payload))))
+        id_to_job = {job.id: job for job in jobs}
+        result = []
+        for id in ids:
+            job = id_to_job[id]
+            if job.success:
+                result.append(job.result)
+            else:
+                result.append(FailedJobArgument(job))
+        return result
+
+    def _wait_for_completion(self,
+                             waiter: CompletionWaiter,
+                             ids: list[str],
+                             begin: datetime,
+                             time_limit_in_secods: int|None,
+                             allow_failures: bool
+                             ):
+        # Only the status columns are read here, and only after the main loop reports that some of the jobs finished.
+        # The timeout is a safety net against jobs that were closed bypassing the loop.
+        remaining = set(ids)
+        first_check = True
         while True:
-            with Session(self.engine) as session:
-                jobs: list[Job] = list(session.scalars(select(Job).where(Job.id.in_(ids))))
-            if len(jobs) != len(ids):
-                missing = list(set(ids) - set(j.id for j in jobs))
+            with self.store.create_session() as session:
+                statuses = list(session.execute(
+                    select(Job.id, Job.finished, Job.success, Job.decider, Job.decider_parameter, Job.method, Job.error)
+                    .where(Job.id.in_(remaining))
+                ))
+            if first_check and len(statuses) != len(remaining):
+                missing = list(remaining - set(s.id for s in statuses))
                 raise ValueError(f'Join_execute is missing jobs for ids {missing}')
-            id_to_job = {}
-            for job in jobs:
-                if not job.finished:
-                    break
-                if not job.success:
-                    if allow_failures:
-                        id_to_job[job.id] = FailedJobArgument(job)
-                    else:
-                        stars='*~'*30
-                        raise ValueError(f"{job.decider}/{job.decider_parameter}:{job.method} threw an error:\n{stars}\n{job.error}\n{stars}")
-                else:
-                    id_to_job[job.id] = job
-            if len(id_to_job) == len(ids):
-                result = []
-                for id in ids:
-                    if isinstance(id_to_job[id], FailedJobArgument):
-                        result.append(id_to_job[id])
-                    else:
-                        result.append(id_to_job[id].result)
-                return result
+            first_check = False
+            for status in statuses:
+                if not status.finished:
+                    continue
+                if not status.success and not allow_failures:
+                    stars = '*~' * 30
+                    raise ValueError(f"{status.decider}/{status.decider_parameter}:{status.method} threw an error:\n{stars}\n{status.error}\n{stars}")
+                remaining.discard(status.id)
+            if len(remaining) == 0:
+                return
+
+            timeout = 10
             if time_limit_in_secods is not None:
-                delta = datetime.now() - begin
-                if delta.total_seconds() > time_limit_in_secods:
+                left = time_limit_in_secods - (datetime.now() - begin).total_seconds()
+                if left <= 0:
                     raise ValueError(f"Could not wait for join in {time_limit_in_secods} seconds")
-            time.sleep(0.1)
+                timeout = min(timeout, left)
+            waiter.wait(timeout)
 
     @endpoint(url='/jobs/result', method='GET')
     def result(self, id: str):
-        with Session(self.engine) as session:
-            result = list(session.scalars(select(Job.result).where(Job.finished.and_(Job.id == id))))
+        with self.store.create_session() as session:
+            result = list(session.scalars(
+                select(JobPayload.result)
+                .join(Job, Job.id == JobPayload.id)
+                .where(Job.finished.and_(Job.id == id))
+            ))
             if len(result)==0:
                 return None
             return result[0]
 
 
+    @endpoint(url='/jobs/partial_results', method='GET')
+    def partial_results(self, id: str, start: int = 0, timeout_in_seconds: float = 10) -> dict:
+        waiter = self.loop.core.completion_registry.register([id])
+        try:
+            while True:
+                reply = self._read_partial_results(id, start)
+                if reply['finished'] or len(reply['chunks']) > 0:
+                    return reply
+                if not waiter.wait(timeout_in_seconds):
+                    return self._read_partial_results(id, start)
+        finally:
+            self.loop.core.completion_registry.unregister(waiter)
+
+    def _read_partial_results(self, id: str, start: int) -> dict:
+        with self.store.create_session() as session:
+            # The status is read before the chunks: once the job is seen finished, all its chunks are already committed
+            status = session.execute(select(Job.finished, Job.success, Job.error).where(Job.id == id)).one_or_none()
+            if status is None:
+                raise ValueError(f"Can't find a job with the id {id}")
+            chunks = list(session.scalars(
+                select(JobChunk.payload)
+                .where(JobChunk.job_id == id)
+                .order_by(JobChunk.record_id)
+                .offset(start)
+            ))
+            result = None
+            if status.finished and status.success and start + len(chunks) == 0:
+                result = session.scalar(select(JobPayload.result).where(JobPayload.id == id))
+        return dict(chunks=chunks, finished=status.finished, success=status.success, error=status.error, result=result)
+
     @endpoint(url='/jobs/summary', method='GET')
     def summary(self, ids: list[str]|None = None, batch_id: str|None = None) -> list[dict]:
         query = select(
@@ -106,7 +220,7 @@ class BrainBoxService(IBrainboxService):
             query = query.where(Job.id.in_(ids))
         if batch_id is not None:
             query = query.where(Job.batch==batch_id)
-        with Session(self.engine) as session:
+        with self.store.create_session() as session:
             rows = list(dict(r._mapping) for r in session.execute(query))
         return rows
 
@@ -116,21 +230,39 @@ class BrainBoxService(IBrainboxService):
 
     @endpoint(url='/jobs/job', method='GET')
     def job(self, id: str):
-        with Session(self.engine) as session:
-            result = list(session.scalars(select(Job).where(Job.finished.and_(Job.id == id))))
-        if len(result) == 0:
-            raise ValueError(f"Can't find a job with the id {id}")
+        with self.store.create_session() as session:
+            result = list(session.scalars(select(Job).where(Job.finished.and_(Job.id == id)).options(selectinload(Job.payload))))
+            if len(result) == 0:
+                raise ValueError(f"Can't find a job with the id {id}")
+            log = list(session.scalars(select(JobLog.payload).where(JobLog.job_id == id).order_by(JobLog.record_id)))
+            session.expunge(result[0])
+        if len(log) > 0:
+            result[0].log = log
         return result[0]
 
     @endpoint(url='/jobs/operator_log', method='GET')
     def get_operator_log(self, entries_count: int = 100) -> list[OperatorLogItem]:
         return self.loop.core.operator_log.log_items[-entries_count:]
 
+    def get_queue_estimates(self) -> list[QueueEstimate]:
+        core = self.loop.core
+        tasks = core.jobs_for_planner if core.jobs_for_planner is not None else ()
+        active_keys = [state.key for state in list(core.operator_states.values())]
+        return core.duration_estimates.estimate_queue(tasks, active_keys)
+
+    @endpoint(url='/cache/link', method='POST')
+    def link_cached_file(self, name: str, hash: str) -> bool:
+        return self.cache_store.link(name, hash)
+
+    @endpoint(url='/cache/maintain', method='POST')
+    def maintain_cache(self) -> CacheMaintenanceReport:
+        return self.cache_store.maintain()
+
     @endpoint(url='/shutdown', method='POST')
     def shutdown(self):
         self.loop.terminate()
         self.loop_thread.join()
-        self.engine.dispose()
+        self.store.dispose()
 
     @property
     def cache_folder(self) -> Path:
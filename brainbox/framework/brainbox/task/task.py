@@ -26,6 +26,7 @@ class BrainBoxTask(IBrainBoxTask):
                  decider_method: Union[None, str, Callable] = None,
                  decider_parameter: None|str = None,
                  ordering_token: str|None = None,
+                 cacheable: bool = False,
                  ):
         if id is not None:
             self.id = id
@@ -42,6 +43,7 @@ class BrainBoxTask(IBrainBoxTask):
         self.batch = batch
         self.decider_parameter = decider_parameter
         self.ordering_token = ordering_token
+        self.cacheable = cacheable
         
 
 
@@ -76,6 +78,7 @@ class BrainBoxTask(IBrainBoxTask):
             info = self.info,
             batch = self.batch,
             ordering_token = self.ordering_token,
+            cacheable = self.cacheable,
             dependencies = self.dependencies
         )
         return [job]
@@ -13,6 +13,7 @@ class BrainBoxTaskBuilderResult(IOneBrainBoxTaskFactory):
                  ordering_token: str|None = None,
                  fake_dependencies: list[str|IBrainBoxTask]|None = None,
                  decider_parameter: str|None = None,
+                 cacheable: bool = False,
                  ):
         self._type = type
         self._method = method
@@ -21,6 +22,7 @@ class BrainBoxTaskBuilderResult(IOneBrainBoxTaskFactory):
         self._fake_dependencies = fake_dependencies
         self._id = IBrainBoxTask.safe_id()
         self._decider_parameter = decider_parameter
+        self._cacheable = cacheable
 
 
     def to_task(self, id: str|None = None, batch_id: str|None = None) -> IBrainBoxTask:
@@ -35,14 +37,15 @@ class BrainBoxTaskBuilderResult(IOneBrainBoxTaskFactory):
             decider_parameter=self._decider_parameter,
             ordering_token=self._ordering_token,
             fake_dependencies=self._fake_dependencies,
-            batch=batch_id if batch_id is not None else actual_id
+            batch=batch_id if batch_id is not None else actual_id,
+            cacheable=self._cacheable
         )
 
 
 
 
     def dependent_on(self, *args: str|IBrainBoxTask):
-        return BrainBoxTaskBuilderResult(self._type, self._method, self._arguments, self._ordering_token, list(args))
+        return BrainBoxTaskBuilderResult(self._type, self._method, self._arguments, self._ordering_token, list(args), cacheable=self._cacheable)
 
 
 def _get_ordering_token(tp: type[IDecider], arguments: dict):
@@ -86,7 +89,8 @@ class BrainBoxTaskBuilder:
             self._method,
             arguments,
             _get_ordering_token(self._type, arguments),
-            decider_parameter = self._decider_parameter
+            decider_parameter = self._decider_parameter,
+            cacheable = self._type.is_result_cacheable(self._method)
         )
 
 
@@ -1,7 +1,10 @@
 from .api_utils import ApiUtils
+from .http_session import HttpSessions, HttpSessionSettings
+from .serving import IServingBackend, ThreadPoolServing, FlaskDevelopmentServing
 from .decider import IDecider, DeciderContext, ISelfManagingDecider
 from .file import File
 from .file_like import FileLike
+from .cache_store import CacheStore, CacheMaintenanceReport, UploadOffsetMismatchError
 from .fork import Fork
 from .loc import Loc, Locator
 from .logger import Logger
@@ -0,0 +1,359 @@
+from typing import *
+from pathlib import Path
+from dataclasses import dataclass, field
+from threading import RLock
+from contextlib import contextmanager
+from uuid import uuid4
+import hashlib
+import os
+import shutil
+import time
+
+
+@dataclass
+class CacheMaintenanceReport:
+    ingested_files: int = 0
+    deduplicated_files: int = 0
+    evicted_files: list[str] = field(default_factory=list)
+    evicted_bytes: int = 0
+    total_bytes: int = 0
+
+
+class UploadOffsetMismatchError(ValueError):
+    def __init__(self, hash: str, current_offset: int, offset: int):
+        super().__init__(f"Upload of {hash} is at the offset {current_offset}, but the chunk starts at {offset}")
+        self.current_offset = current_offset
+
+
+class CacheStore:
+    # Blobs are named by the sha256 of their content and live in a sibling folder, so listing the cache folder shows only the names.
+    # The files in the cache folder are hardlinks to the blobs, so everything that opens cache_folder/name keeps working,
+    # while the same content is stored only once. Hence, the files of the cache must be replaced, never rewritten in place:
+    # write_file does so, and the blobs are read-only, so that an in-place write fails instead of changing every name of the content.
+    BlobsFolderSuffix = '_blobs'
+    ChunkSize = 1024*1024
+    PartialUploadLifetimeInSeconds = 24*60*60
+
+    def __init__(self,
+                 folder: Path,
+                 byte_budget: int|None = None,
+                 ttl_in_seconds: float|None = None,
+                 ingestion_delay_in_seconds: float = 60
+                 ):
+        self.folder = folder
+        self.byte_budget = byte_budget
+        self.ttl_in_seconds = ttl_in_seconds
+        self.ingestion_delay_in_seconds = ingestion_delay_in_seconds
+        self._lock = RLock()
+        self._owner_to_names: dict[str, set[str]] = {}
+        self._name_to_owners: dict[str, set[str]] = {}
+        self._dependency_to_owners: dict[str, set[str]] = {}
+        self._owner_to_dependencies: dict[str, set[str]] = {}
+        self._names: set[str]|None = None
+        self._name_to_hash: dict[str, tuple[str, int, int|None]] = {}
+
+    @property
+    def blobs_folder(self) -> Path:
+        os.makedirs(self.folder, exist_ok=True)
+        path = self.folder.parent/(self.folder.name + CacheStore.BlobsFolderSuffix)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def hash_stream(stream: BinaryIO) -> str:
+        hash = hashlib.sha256()
+        while True:
+            chunk = stream.read(CacheStore.ChunkSize)
+            if not chunk:
+                break
+            hash.update(chunk)
+        return hash.hexdigest()
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        with open(path, 'rb') as stream:
+            return CacheStore.hash_stream(stream)
+
+    def _check_name(self, name: str):
+        if name != Path(name).name or name in ('', '.', '..'):
+            raise ValueError(f"Name {name} cannot be used for a file in cache")
+
+    @staticmethod
+    def _make_read_only(path: Path):
+        # Windows can't replace or delete read-only files, so there the blobs stay writable
+        if os.name == 'posix':
+            os.chmod(path, 0o444)
+
+    def _get_names(self) -> set[str]:
+        with self._lock:
+            if self._names is None:
+                os.makedirs(self.folder, exist_ok=True)
+                self._names = set(entry.name for entry in os.scandir(self.folder) if entry.is_file())
+            return self._names
+
+    def contains(self, name: str) -> bool:
+        return name in self._get_names()
+
+    def find_names(self, value, result: list[str]|None = None) -> list[str]:
+        # The names are checked against the index, so scanning the arguments or the results does not touch the disk
+        if result is None:
+            result = []
+        if isinstance(value, dict):
+            for item in value.values():
+                self.find_names(item, result)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                self.find_names(item, result)
+        elif isinstance(value, str) and 0 < len(value) < 256 and self.contains(value):
+            result.append(value)
+        return result
+
+    def _link(self, name: str, hash: str):
+        self._check_name(name)
+        temp_path = self.blobs_folder/f'{uuid4()}.link'
+        try:
+            os.link(self.blobs_folder/hash, temp_path)
+        except OSError:
+            shutil.copyfile(self.blobs_folder/hash, temp_path)
+            self._make_read_only(temp_path)
+        os.replace(temp_path, self.folder/name)
+        self._get_names().add(name)
+        # The linked file is read-only, so its inode is enough to tell that the name still has this content
+        self._name_to_hash[name] = (hash, os.stat(self.folder/name).st_ino, None)
+
+    def get_hash(self, name: str) -> str:
+        # The hashes known at upload or link time are reused. The files written into the folder directly are hashed once,
+        # and the hash is reused while the file is not rewritten
+        stat = os.stat(self.folder/name)
+        with self._lock:
+            known = self._name_to_hash.get(name)
+        if known is not None:
+            hash, inode, mtime = known
+            if inode == stat.st_ino and (mtime is None or mtime == stat.st_mtime_ns):
+                return hash
+        hash = self.hash_file(self.folder/name)
+        with self._lock:
+            self._name_to_hash[name] = (hash, stat.st_ino, stat.st_mtime_ns)
+        return hash
+
+    def put_stream(self, name: str, stream: BinaryIO) -> str:
+        self._check_name(name)
+        temp_path = self.blobs_folder/f'{uuid4()}.upload'
+        hash = hashlib.sha256()
+        with open(temp_path, 'wb') as file:
+            while True:
+                chunk = stream.read(CacheStore.ChunkSize)
+                if not chunk:
+                    break
+                hash.update(chunk)
+                file.write(chunk)
+        return self._store_temp_file(name, temp_path, hash.hexdigest())
+
+    @contextmanager
+    def write_file(self, name: str) -> Iterator[Path]:
+        self._check_name(name)
+        temp_path = self.blobs_folder/f'{uuid4()}.upload'
+        try:
+            yield temp_path
+            self._store_temp_file(name, temp_path, self.hash_file(temp_path))
+        finally:
+            if temp_path.is_file():
+                os.unlink(temp_path)
+
+    def put_bytes(self, name: str, content: bytes) -> str:
+        self._check_name(name)
+        temp_path = self.blobs_folder/f'{uuid4()}.upload'
+        with open(temp_path, 'wb') as file:
+            file.write(content)
+        return self._store_temp_file(name, temp_path, hashlib.sha256(content).hexdigest())
+
+    # Resumable uploads are keyed by the hash of the expected content, so resuming never mixes the chunks of different files
+    def _partial_upload_path(self, hash: str) -> Path:
+        if not hash.isalnum():
+            raise ValueError(f"{hash} is not a valid hash")
+        return self.blobs_folder/f'{hash}.partial'
+
+    def get_upload_offset(self, hash: str) -> int:
+        path = self._partial_upload_path(hash)
+        if not path.is_file():
+            return 0
+        return path.stat().st_size
+
+    def append_upload(self, hash: str, offset: int, stream: BinaryIO) -> int:
+        path = self._partial_upload_path(hash)
+        with self._lock:
+            current_offset = self.get_upload_offset(hash)
+            if offset != current_offset:
+                raise UploadOffsetMismatchError(hash, current_offset, offset)
+            with open(path, 'ab') as file:
+                while True:
+                    chunk = stream.read(CacheStore.ChunkSize)
+                    if not chunk:
+                        break
+                    file.write(chunk)
+            return self.get_upload_offset(hash)
+
+    def finish_upload(self, hash: str, name: str) -> str:
+        self._check_name(name)
+        path = self._partial_upload_path(hash)
+        if not path.is_file():
+            path.touch()
+        actual_hash = self.hash_file(path)
+        if actual_hash != hash:
+            os.unlink(path)
+            raise ValueError(f"Upload of {name} was expected to have the hash {hash}, but had {actual_hash}")
+        return self._store_temp_file(name, path, hash)
+
+    def _store_temp_file(self, name: str, temp_path: Path, hash: str) -> str:
+        with self._lock:
+            blob_path = self.blobs_folder/hash
+            if blob_path.is_file():
+                os.unlink(temp_path)
+            else:
+                self._make_read_only(temp_path)
+                os.replace(temp_path, blob_path)
+            self._link(name, hash)
+            self.touch(name)
+        return hash
+
+    def link(self, name: str, hash: str) -> bool:
+        with self._lock:
+            if not (self.blobs_folder/hash).is_file():
+                return False
+            self._link(name, hash)
+            self.touch(name)
+        return True
+
+    def touch(self, name: str):
+        # Hardlinks share the inode, so the modification time of any name is the last access time of the whole blob
+        path = self.folder/name
+        if path.is_file():
+            os.utime(path)
+
+    def _add_reference(self, owner: str, name: str):
+        self._owner_to_names.setdefault(owner, set()).add(name)
+        self._name_to_owners.setdefault(name, set()).add(owner)
+
+    def add_references(self, owner: str, names: Iterable[str]):
+        # The files produced by a job are also referenced by the jobs that depend on it, as they will be their arguments
+        with self._lock:
+            for name in names:
+                self._add_reference(owner, name)
+                for dependent in self._dependency_to_owners.get(owner, ()):
+                    self._add_reference(dependent, name)
+
+    def add_dependencies(self, owner: str, dependencies: Iterable[str]):
+        with self._lock:
+            for dependency in dependencies:
+                self._dependency_to_owners.setdefault(dependency, set()).add(owner)
+                self._owner_to_dependencies.setdefault(owner, set()).add(dependency)
+                for name in list(self._owner_to_names.get(dependency, ())):
+                    self._add_reference(owner, name)
+
+    def release_references(self, owners: Iterable[str]):
+        with self._lock:
+            for owner in owners:
+                for dependency in self._owner_to_dependencies.pop(owner, ()):
+                    dependents = self._dependency_to_owners.get(dependency)
+                    if dependents is not None:
+                        dependents.discard(owner)
+                        if len(dependents) == 0:
+                            del self._dependency_to_owners[dependency]
+                for name in self._owner_to_names.pop(owner, ()):
+                    owners_of_name = self._name_to_owners.get(name)
+                    if owners_of_name is None:
+                        continue
+                    owners_of_name.discard(owner)
+                    if len(owners_of_name) == 0:
+                        del self._name_to_owners[name]
+
+    def is_referenced(self, name: str) -> bool:
+        with self._lock:
+            return name in self._name_to_owners
+
+    def _ingest(self, path: Path, inode_to_hash: dict[int, str], report: CacheMaintenanceReport) -> str:
+        hash = self.hash_file(path)
+        blob_path = self.blobs_folder/hash
+        report.ingested_files += 1
+        if blob_path.is_file():
+            report.deduplicated_files += 1
+            self._link(path.name, hash)
+            return hash
+        try:
+            os.link(path, blob_path)
+        except OSError:
+            shutil.copyfile(path, blob_path)
+        self._make_read_only(blob_path)
+        inode_to_hash[blob_path.stat().st_ino] = hash
+        return hash
+
+    def maintain(self) -> CacheMaintenanceReport:
+        report = CacheMaintenanceReport()
+        with self._lock:
+            now = time.time()
+            inode_to_hash = {}
+            hash_to_stat = {}
+            for entry in os.scandir(self.blobs_folder):
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                if '.' in entry.name:
+                    # Leftovers of interrupted writes. Resumable uploads are kept longer, as the client may come back
+                    lifetime = self.ingestion_delay_in_seconds
+                    if entry.name.endswith('.partial'):
+                        lifetime = CacheStore.PartialUploadLifetimeInSeconds
+                    if now - stat.st_mtime >= lifetime:
+                        os.unlink(entry.path)
+                    continue
+                inode_to_hash[stat.st_ino] = entry.name
+                hash_to_stat[entry.name] = stat
+
+            hash_to_names: dict[str, list[str]] = {}
+            all_names = set()
+            for entry in os.scandir(self.folder):
+                if not entry.is_file():
+                    continue
+                all_names.add(entry.name)
+                stat = entry.stat()
+                hash = inode_to_hash.get(stat.st_ino)
+                if hash is None:
+                    # Files written directly into the cache folder, e.g. by deciders or by the previous versions.
+                    # The recent ones may still be being written, so they wait for the next maintenance
+                    if now - stat.st_mtime < self.ingestion_delay_in_seconds:
+                        continue
+                    hash = self._ingest(Path(entry.path), inode_to_hash, report)
+                    hash_to_stat[hash] = (self.blobs_folder/hash).stat()
+                hash_to_names.setdefault(hash, []).append(entry.name)
+
+            candidates = []
+            for hash, stat in hash_to_stat.items():
+                names = hash_to_names.get(hash, [])
+                if any(self.is_referenced(name) for name in names):
+                    continue
+                if len(names) == 0 and now - stat.st_mtime < self.ingestion_delay_in_seconds:
+                    # A fresh blob without names may belong to the upload that is being linked right now
+                    continue
+                candidates.append((stat.st_mtime, hash, names, stat.st_size))
+            candidates.sort()
+
+            self._names = all_names
+            self._name_to_hash = {name: known for name, known in self._name_to_hash.items() if name in all_names}
+
+            total_bytes = sum(stat.st_size for stat in hash_to_stat.values())
+            for mtime, hash, names, size in candidates:
+                expired = self.ttl_in_seconds is not None and now - mtime > self.ttl_in_seconds
+                over_budget = self.byte_budget is not None and total_bytes > self.byte_budget
+                orphan = len(names) == 0
+                if not (expired or over_budget or orphan):
+                    continue
+                for name in names:
+                    os.unlink(self.folder/name)
+                os.unlink(self.blobs_folder/hash)
+                self._names.difference_update(names)
+                for name in names:
+                    self._name_to_hash.pop(name, None)
+                total_bytes -= size
+                report.evicted_files.extend(names)
+                report.evicted_bytes += size
+            report.total_bytes = total_bytes
+        return report
@@ -1,6 +1,7 @@
 from uuid import uuid4
 from .logger import Logger
 from .loc import Loc
+from .cache_store import CacheStore
 from pathlib import Path
 from dataclasses import dataclass, field
 
@@ -8,7 +9,9 @@ class DeciderContext:
     def __init__(self):
         self._logger : Logger|None = None
         self._current_job_id: str|None = None
+        self._current_batch_ids: tuple[str,...]|None = None
         self._cache_folder: Path|None = None
+        self._cache_store: CacheStore|None = None
 
     @property
     def logger(self) -> Logger:
@@ -22,12 +25,25 @@ class DeciderContext:
             return str(uuid4())
         return self._current_job_id
 
+    @property
+    def current_batch_ids(self) -> tuple[str,...]:
+        if self._current_batch_ids is None:
+            return (self.current_job_id,)
+        return self._current_batch_ids
+
     @property
     def cache_folder(self) -> Path:
         if self._cache_folder is None:
             return Loc.cache_folder
         return self._cache_folder
 
+    @property
+    def cache_store(self) -> CacheStore:
+        # Inside BrainBox, the store of the service is shared by all the deciders, so the writes go under its lock
+        if self._cache_store is None:
+            self._cache_store = CacheStore(self.cache_folder)
+        return self._cache_store
+
 
 class IDecider:
     @property
@@ -52,6 +68,18 @@ class IDecider:
     def get_ordering_arguments_sequence(cls) -> tuple[str,...]|None:
         return None
 
+    @classmethod
+    def is_result_cacheable(cls, method: str|None) -> bool:
+        return False
+
+    @classmethod
+    def get_max_batch_size(cls) -> int:
+        return 1
+
+    def run_batch(self, method: str|None, arguments: list[dict]) -> list:
+        method_instance = self if method is None else getattr(self, method)
+        return [method_instance(**a) for a in arguments]
+
 
 class ISelfManagingDecider(IDecider):
     def warmup(self, parameter: str|None):
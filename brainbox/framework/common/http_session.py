@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from threading import Lock
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import os
+import requests
+
+
+@dataclass(frozen=True)
+class HttpSessionSettings:
+    pool_size: int = 10
+    connect_timeout_in_seconds: float|None = 10
+    read_timeout_in_seconds: float|None = None
+    retries: int = 3
+    backoff_factor: float = 0.3
+    retry_status_codes: tuple[int, ...] = (502, 503, 504)
+
+
+class _PooledSession(requests.Session):
+    def __init__(self, settings: HttpSessionSettings):
+        super().__init__()
+        self.settings = settings
+        # Connection errors are retried for every method, as the request has not reached the server yet.
+        # Read errors and bad statuses are retried only for the idempotent methods, which is the default of Retry
+        retry = Retry(
+            total=settings.retries,
+            backoff_factor=settings.backoff_factor,
+            status_forcelist=settings.retry_status_codes,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=settings.pool_size, max_retries=retry)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def request(self, method, url, **kwargs):
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = (self.settings.connect_timeout_in_seconds, self.settings.read_timeout_in_seconds)
+        return super().request(method, url, **kwargs)
+
+
+class HttpSessions:
+    _lock = Lock()
+    _sessions: dict[tuple[int, str, HttpSessionSettings], requests.Session] = {}
+
+    @staticmethod
+    def get(address: str, settings: HttpSessionSettings|None = None) -> requests.Session:
+        if settings is None:
+            settings = HttpSessionSettings()
+        # Forked processes must not share the sockets of the parent, so the sessions are also keyed by the process
+        key = (os.getpid(), address, settings)
+        with HttpSessions._lock:
+            session = HttpSessions._sessions.get(key)
+            if session is None:
+                session = _PooledSession(settings)
+                HttpSessions._sessions[key] = session
+            return session
+
+    @staticmethod
+    def close_all():
+        with HttpSessions._lock:
+            for (pid, _, _), session in HttpSessions._sessions.items():
+                if pid == os.getpid():
+                    session.close()
+            HttpSessions._sessions.clear()
@@ -5,4 +5,7 @@ class Logger:
     def log(self, s):
         print(s)
 
+    def partial_result(self, chunk):
+        pass
+
 
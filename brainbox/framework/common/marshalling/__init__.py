@@ -1,4 +1,5 @@
 from .endpoint import endpoint
 from .server import Server
 from .api import Api, bind_to_api
-from .test_api import TestApi
\ No newline at end of file
+from .async_api import AsyncApi, bind_to_async_api
+from .test_api import TestApi
@@ -3,7 +3,7 @@ from typing import *
 from .marshalling_metadata import MarshallingMetadata
 from .api_binding import ApiBinding
 from ..api_utils import ApiUtils
-import requests
+from ..http_session import HttpSessions, HttpSessionSettings
 import re
 
 def bind_to_api(api_type: Type):
@@ -21,12 +21,17 @@ def bind_to_api(api_type: Type):
 
 
 class Api:
-    def __init__(self, address: str):
+    def __init__(self, address: str, session_settings: HttpSessionSettings|None = None):
         ApiUtils.check_address(address)
         self.address = address
+        self.session_settings = session_settings
 
         for meta in type(self).__api_endpoints__:
-            setattr(self, meta.name, ApiBinding(address, meta))
+            setattr(self, meta.name, ApiBinding(address, meta, session_settings=session_settings))
+
+    @property
+    def session(self):
+        return HttpSessions.get(self.address, self.session_settings)
 
 
     def wait(self, max_time_in_seconds=10):
@@ -1,29 +1,40 @@
 from .marshalling_metadata import MarshallingMetadata
 from .format import Format
-import requests
+from ..http_session import HttpSessions, HttpSessionSettings
 
 class ApiBinding:
     def __init__(self,
                  address: str,
                  metadata: MarshallingMetadata,
+                 binary: bool = True,
+                 session_settings: HttpSessionSettings|None = None
                  ):
         self.metadata = metadata
         self.address = address
+        self.binary = binary
+        self.session_settings = session_settings
 
-    def __call__(self, *args, **kwargs):
+    def _get_binary_body(self, arguments: dict) -> tuple[bytes, dict]:
+        headers = {
+            'Content-Type': Format.BINARY_CONTENT_TYPE,
+            'Accept': f'{Format.BINARY_CONTENT_TYPE}, application/json'
+        }
+        return Format.encode_binary(dict(arguments=arguments)), headers
+
+    def _get_json_body(self, arguments: dict) -> dict:
+        return dict(arguments=Format.encode(arguments))
+
+    def _prepare(self, args, kwargs) -> tuple[str, dict]:
         address = f'http://{self.address}{self.metadata.get_endpoint_address()}'
         arguments = self.metadata.signature.to_kwargs_only(*args, **kwargs)
-        data = dict(
-            arguments = Format.encode(arguments),
-        )
-
-        reply = requests.request(
-            self.metadata.endpoint.method,
-            address,
-            json = data,
-        )
+        return address, arguments
+
+    def _parse_reply(self, address: str, reply):
         if reply.status_code == 200:
-            result = Format.decode(reply.json())
+            if reply.headers.get('Content-Type', '').startswith(Format.BINARY_CONTENT_TYPE):
+                result = Format.decode_binary(reply.content)
+            else:
+                result = Format.decode(reply.json())
             return result['result']
         try:
             error = reply.json()
@@ -33,3 +44,18 @@ class ApiBinding:
             raise ValueError(f"Call to {address} caused unprocessed error on the server\n\n{error}")
         raise ValueError(f"Call to {address} caused exception:\n\n{error['error']}")
 
+    def __call__(self, *args, **kwargs):
+        address, arguments = self._prepare(args, kwargs)
+        session = HttpSessions.get(self.address, self.session_settings)
+
+        reply = None
+        if self.binary:
+            content, headers = self._get_binary_body(arguments)
+            reply = session.request(self.metadata.endpoint.method, address, data=content, headers=headers)
+            if reply.status_code == 415:
+                # The server predates the binary format, so JSON is used for this endpoint from now on
+                self.binary = False
+        if not self.binary:
+            reply = session.request(self.metadata.endpoint.method, address, json=self._get_json_body(arguments))
+
+        return self._parse_reply(address, reply)
@@ -0,0 +1,70 @@
+import asyncio
+from typing import *
+from .marshalling_metadata import MarshallingMetadata
+from .async_api_binding import AsyncApiBinding
+from ..api_utils import ApiUtils
+from ..http_session import HttpSessionSettings
+import httpx
+
+
+def bind_to_async_api(api_type: Type):
+    # Unlike bind_to_api, the endpoints are not checked against the abstract methods:
+    # the async twin cannot inherit the synchronous interface, as all its methods are coroutines
+    def decorator(cls):
+        cls.__api_endpoints__ = MarshallingMetadata.get_endpoints_from_type(api_type)
+        return cls
+    return decorator
+
+
+class AsyncApi:
+    def __init__(self, address: str, session_settings: HttpSessionSettings|None = None):
+        ApiUtils.check_address(address)
+        self.address = address
+        self.session_settings = session_settings if session_settings is not None else HttpSessionSettings()
+        self._client: httpx.AsyncClient|None = None
+
+        for meta in type(self).__api_endpoints__:
+            setattr(self, meta.name, AsyncApiBinding(address, meta, self._get_client))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # The client is bound to the event loop it was first used in, so an AsyncApi must not be shared between loops
+        if self._client is None:
+            settings = self.session_settings
+            transport = httpx.AsyncHTTPTransport(
+                retries=settings.retries,
+                limits=httpx.Limits(max_connections=settings.pool_size, max_keepalive_connections=settings.pool_size)
+            )
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(
+                    None,
+                    connect=settings.connect_timeout_in_seconds,
+                    read=settings.read_timeout_in_seconds
+                )
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def wait(self, max_time_in_seconds=10):
+        loop = asyncio.get_running_loop()
+        begin = loop.time()
+        while True:
+            try:
+                reply = await self._get_client().get(f'http://{self.address}/heartbeat')
+                if reply.status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if loop.time() - begin > max_time_in_seconds:
+                raise ValueError(f"Endpoint {self.address} was not reacheable within {max_time_in_seconds} seconds")
+            await asyncio.sleep(0.01)
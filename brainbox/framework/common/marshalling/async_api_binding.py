@@ -0,0 +1,30 @@
+from typing import Callable
+from .marshalling_metadata import MarshallingMetadata
+from .api_binding import ApiBinding
+import httpx
+
+
+class AsyncApiBinding(ApiBinding):
+    def __init__(self,
+                 address: str,
+                 metadata: MarshallingMetadata,
+                 get_client: Callable[[], httpx.AsyncClient],
+                 binary: bool = True
+                 ):
+        super().__init__(address, metadata, binary)
+        self.get_client = get_client
+
+    async def __call__(self, *args, **kwargs):
+        address, arguments = self._prepare(args, kwargs)
+        client = self.get_client()
+
+        reply = None
+        if self.binary:
+            content, headers = self._get_binary_body(arguments)
+            reply = await client.request(self.metadata.endpoint.method, address, content=content, headers=headers)
+            if reply.status_code == 415:
+                self.binary = False
+        if not self.binary:
+            reply = await client.request(self.metadata.endpoint.method, address, json=self._get_json_body(arguments))
+
+        return self._parse_reply(address, reply)
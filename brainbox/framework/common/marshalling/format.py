@@ -1,6 +1,8 @@
 import json
 import pickle
 import base64
+import struct
+import io
 
 
 
@@ -11,9 +13,23 @@ class NoTupleJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _restore_bytes(buffer):
+    return bytes(buffer)
+
+
+class _OutOfBandPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        if type(obj) is bytes and len(obj) >= Format.OUT_OF_BAND_THRESHOLD:
+            return _restore_bytes, (pickle.PickleBuffer(obj),)
+        return NotImplemented
+
+
 class Format:
     CONTROL_FIELD = '@type'
     CONTENT_FIELD = '@content'
+    BINARY_CONTENT_TYPE = 'application/x-brainbox-frames'
+    BINARY_MAGIC = b'BBF1'
+    OUT_OF_BAND_THRESHOLD = 1024
 
     @staticmethod
     def check_json(obj):
@@ -54,3 +70,28 @@ class Format:
             else:
                 result[key] = data[key]
         return result
+
+    @staticmethod
+    def encode_binary(data: dict) -> bytes:
+        # The frames are: the pickle of the data with the protocol 5, and then the large bytes objects, that were kept out of it.
+        # Each frame is prefixed in the header by its length, so the buffers are neither base64-encoded nor escaped
+        buffers = []
+        stream = io.BytesIO()
+        _OutOfBandPickler(stream, protocol=5, buffer_callback=buffers.append).dump(data)
+        frames = [stream.getbuffer()] + [buffer.raw() for buffer in buffers]
+        header = Format.BINARY_MAGIC + struct.pack(f'<I{len(frames)}Q', len(frames), *(len(frame) for frame in frames))
+        return b''.join([header] + frames)
+
+    @staticmethod
+    def decode_binary(body: bytes) -> dict:
+        view = memoryview(body)
+        if bytes(view[:4]) != Format.BINARY_MAGIC:
+            raise ValueError("The body is not in the binary marshalling format")
+        count, = struct.unpack_from('<I', view, 4)
+        lengths = struct.unpack_from(f'<{count}Q', view, 8)
+        position = 8 + 8*count
+        frames = []
+        for length in lengths:
+            frames.append(view[position:position+length])
+            position += length
+        return pickle.loads(frames[0], buffers=frames[1:])
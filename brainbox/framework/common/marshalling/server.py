@@ -1,12 +1,14 @@
 from .marshalling_metadata import MarshallingMetadata
 from flask import Flask
 from .server_binding import ServerBinding
+from ..serving import IServingBackend, ThreadPoolServing
 
 
 class Server:
-    def __init__(self, port: int, *objects):
+    def __init__(self, port: int, *objects, serving: IServingBackend|None = None):
         self.objects = objects
         self.port = port
+        self.serving = serving if serving is not None else ThreadPoolServing()
         metadata = []
         for object in objects:
             metadata.extend(MarshallingMetadata.get_endpoints_from_object(object))
@@ -40,4 +42,4 @@ class Server:
     def __call__(self):
         app = Flask('RPC_'+'_'.join(type(o).__name__ for o in self.objects))
         self.bind_app(app)
-        app.run('0.0.0.0', self.port)
\ No newline at end of file
+        self.serving.serve(app, '0.0.0.0', self.port)
@@ -18,8 +18,7 @@ class ServerBinding:
             return self.meta.name
         return self.custom_method_name
 
-    def _get_arguments(self, kwargs, data):
-        arguments = Format.decode(data['arguments'])
+    def _get_arguments(self, kwargs, arguments):
         for key, value in kwargs.items():
             if key in arguments:
                 raise ValueError(f"{key} is provided via address and via json")
@@ -29,14 +28,20 @@ class ServerBinding:
     def _process(self, kwargs, arguments):
         arguments = self._get_arguments(kwargs, arguments)
         result = self.meta.method(**arguments)
-        result = dict(result=result, error = None)
-        result = Format.encode(result)
-        return result
+        return dict(result=result, error = None)
 
     def __call__(self, **kwargs):
-        data = flask.request.json
+        binary = flask.request.mimetype == Format.BINARY_CONTENT_TYPE
+        data = flask.request.get_data() if binary else flask.request.json
         try:
-            return flask.jsonify(self._process(kwargs, data))
+            if binary:
+                arguments = Format.decode_binary(data)['arguments']
+            else:
+                arguments = Format.decode(data['arguments'])
+            result = self._process(kwargs, arguments)
+            if Format.BINARY_CONTENT_TYPE in flask.request.headers.get('Accept', ''):
+                return flask.Response(Format.encode_binary(result), mimetype=Format.BINARY_CONTENT_TYPE)
+            return flask.jsonify(Format.encode(result))
         except:
             tb = traceback.format_exc()
             print(tb)
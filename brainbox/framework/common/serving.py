@@ -0,0 +1,128 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from threading import Thread, Condition
+from queue import Queue
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+import os
+import signal
+import threading
+
+
+class IServingBackend(ABC):
+    @abstractmethod
+    def serve(self, app, host: str, port: int):
+        pass
+
+
+class FlaskDevelopmentServing(IServingBackend):
+    def serve(self, app, host: str, port: int):
+        app.run(host, port)
+
+
+class _ThreadPoolWSGIServer(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host: str, port: int, app, handler: type[WSGIRequestHandler], threads: int):
+        super().__init__(host, port, app, handler=handler)
+        self._requests = Queue()
+        self._in_flight = 0
+        self._in_flight_condition = Condition()
+        # The workers are daemons: a request that outlives the shutdown timeout must not keep the process alive
+        for index in range(threads):
+            Thread(target=self._work, name=f'wsgi-worker-{index}', daemon=True).start()
+
+    def process_request(self, request, client_address):
+        self._requests.put((request, client_address))
+
+    def on_request_started(self):
+        with self._in_flight_condition:
+            self._in_flight += 1
+
+    def on_request_finished(self):
+        with self._in_flight_condition:
+            self._in_flight -= 1
+            self._in_flight_condition.notify_all()
+
+    def _work(self):
+        while True:
+            request, client_address = self._requests.get()
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def wait_for_requests(self, timeout_in_seconds: float) -> bool:
+        with self._in_flight_condition:
+            return self._in_flight_condition.wait_for(lambda: self._in_flight == 0, timeout_in_seconds)
+
+
+@dataclass
+class ThreadPoolServing(IServingBackend):
+    # Long-polling endpoints such as /jobs/join hold a thread for the whole duration of the job, so the pool is generous
+    threads: int = 64
+    # Applies to socket reads and writes, so a silent or stalled client releases its thread. A running handler is never interrupted
+    request_timeout_in_seconds: float|None = 300
+    # A worker serves one connection at a time, so a connection that waits for its next request, kept alive or freshly opened,
+    # is closed quickly to free the worker
+    keep_alive_timeout_in_seconds: float|None = 5
+    shutdown_timeout_in_seconds: float = 10
+
+    def on_listening(self, port: int):
+        pass
+
+    def _create_handler(self) -> type[WSGIRequestHandler]:
+        settings = self
+
+        class Handler(WSGIRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            timeout = self.request_timeout_in_seconds
+
+            def handle_one_request(self):
+                self.connection.settimeout(settings.keep_alive_timeout_in_seconds)
+                try:
+                    started = len(self.rfile.peek(1)) > 0
+                except (TimeoutError, ConnectionError):
+                    started = False
+                if not started:
+                    self.close_connection = True
+                    return
+                self.connection.settimeout(settings.request_timeout_in_seconds)
+                super().handle_one_request()
+
+            # Only the requests being processed are waited for at shutdown, not the idle kept-alive connections
+            def run_wsgi(self):
+                self.server.on_request_started()
+                try:
+                    super().run_wsgi()
+                finally:
+                    self.server.on_request_finished()
+        return Handler
+
+    def serve(self, app, host: str, port: int):
+        server = _ThreadPoolWSGIServer(host, port, app, self._create_handler(), self.threads)
+        self.on_listening(server.server_port)
+        received_signals = []
+
+        def on_signal(signum, frame):
+            received_signals.append(signum)
+            # shutdown blocks until serve_forever returns, so it can't be called from the thread that serves
+            Thread(target=server.shutdown, daemon=True).start()
+
+        previous_handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                previous_handlers[signum] = signal.signal(signum, on_signal)
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            server.wait_for_requests(self.shutdown_timeout_in_seconds)
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler if handler is not None else signal.SIG_DFL)
+
+        # The in-flight requests are drained, and the process now reacts to the signal the way it would without the server
+        if len(received_signals) > 0:
+            os.kill(os.getpid(), received_signals[0])
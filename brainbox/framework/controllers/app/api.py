@@ -4,15 +4,14 @@ from brainbox.framework import Loc, Locator
 from .interface import IControllerService
 from .service import ControllerService, ControllerServerSettings
 from .server import ControllerServer
-from ...common import IDecider, File, FileLike
+from ...common import IDecider, File, FileLike, HttpSessionSettings
 from ..controller import IController, ControllerRegistry
 from pathlib import Path
-import requests
 
 @bind_to_api(ControllerService)
 class ControllerApi(Api, IControllerService):
-    def __init__(self, address: str):
-        super().__init__(address)
+    def __init__(self, address: str, session_settings: HttpSessionSettings|None = None):
+        super().__init__(address, session_settings)
 
     def download_resource(self,
                  decider: str|IDecider|IController|type[IDecider]|type[IController],
@@ -20,7 +19,7 @@ class ControllerApi(Api, IControllerService):
                  ) -> File:
         decider = ControllerRegistry.to_controller_name(decider)
         address = f'http://{self.address}/resources/download/{decider}/{path}'
-        response = requests.get(address)
+        response = self.session.get(address)
         if response.status_code != 200:
             raise ValueError(f"Couldn't get file content for {address}\n" + response.text)
         content = response.content
@@ -33,7 +32,7 @@ class ControllerApi(Api, IControllerService):
                ):
         decider = ControllerRegistry.to_controller_name(decider)
         with FileLike(data, None) as stream:
-            reply = requests.post(
+            reply = self.session.post(
                 f'http://{self.address}/resources/upload/{decider}/{path}',
                 files=(
                     ('filename', stream),
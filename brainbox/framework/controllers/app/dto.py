@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
 from ..controller import InstallationStatus
 from .logging import Log
 
@@ -30,9 +32,31 @@ class ControllerServiceStatus:
 
 @dataclass
 class InstallationReport:
+    @dataclass
+    class Step:
+        class Status(Enum):
+            Pending = 0
+            Running = 1
+            Done = 2
+            Skipped = 3
+            Failed = 4
+
+        name: str
+        status: 'InstallationReport.Step.Status' = Status.Pending
+        started_at: datetime|None = None
+        finished_at: datetime|None = None
+        error: str|None = None
+
+        @property
+        def duration_in_seconds(self) -> float|None:
+            if self.started_at is None or self.finished_at is None:
+                return None
+            return (self.finished_at - self.started_at).total_seconds()
+
     name: str
     log: Log
     error: str|None = None
+    steps: list['InstallationReport.Step'] = field(default_factory=list)
 
 
 @dataclass
@@ -51,7 +51,7 @@ class IControllerService(ABC):
         pass
 
     @abstractmethod
-    def setup(self, setup: ControllersSetup):
+    def setup(self, setup: ControllersSetup) -> InstallationReport:
         pass
 
     @abstractmethod
@@ -16,7 +16,8 @@ class ControllerServer(Server):
         self.service = ControllerService(settings)
         super().__init__(
             settings.port,
-            self.service
+            self.service,
+            serving=settings.serving
         )
 
     def bind_custom_endpoints(self, app):
@@ -1,10 +1,10 @@
 import os
 import shutil
 import traceback
-from dataclasses import dataclass
-from threading import Thread
+from dataclasses import dataclass, field
+from threading import Thread, Lock
 
-from ...common import Loc, FileIO
+from ...common import Loc, FileIO, IServingBackend, ThreadPoolServing
 from ...common.marshalling import endpoint
 from ..controller import TestReport, DockerWebServiceApi, ControllerRegistry, IController, IModelDownloadingController
 from .interface import IControllerService, ControllerServiceStatus, InstallationReport, ControllersSetup
@@ -34,11 +34,17 @@ class RunningInstallation:
 class ControllerServerSettings:
     registry: ControllerRegistry
     port: int = 8091
+    serving: IServingBackend = field(default_factory=ThreadPoolServing)
+    setup_parallelism: int = 4
 
 class ControllerService(IControllerService):
+    # On the class, so the service stays picklable and can be run in fork
+    _installation_lock = Lock()
+
     def __init__(self, settings: ControllerServerSettings):
         self.settings = settings
         self.running_installation: RunningInstallation|None = None
+        self.running_setup: InstallationReport|None = None
 
     def get_controller(self, decider: str|type):
         name = ControllerRegistry.to_controller_name(decider)
@@ -46,20 +52,19 @@ class ControllerService(IControllerService):
 
     @endpoint(url='/controllers/install')
     def install(self, decider: str|type, join: bool = True) -> InstallationReport|None:
-        if self.running_installation is not None and not self.running_installation.exited:
-            raise ValueError("Another installation is in progress")
-        self.running_installation = None
-
         controller = self.get_controller(decider)
-        log = Log()
-        controller.context._executor = LoggingLocalExecutor(log)
-        controller.context._logger = LogLogger(log)
-
-        installation_report = InstallationReport(controller.get_name(), log)
-        installation = RunningInstallation(installation_report, controller)
-        installation.thread = Thread(target=installation.run)
-        installation.thread.start()
-        self.running_installation = installation
+        with self._installation_lock:
+            self._check_no_installation_in_progress()
+            self.running_installation = None
+            log = Log()
+            controller.context._executor = LoggingLocalExecutor(log)
+            controller.context._logger = LogLogger(log)
+
+            installation_report = InstallationReport(controller.get_name(), log)
+            installation = RunningInstallation(installation_report, controller)
+            installation.thread = Thread(target=installation.run)
+            installation.thread.start()
+            self.running_installation = installation
 
         if join:
             return self.join_installation()
@@ -70,6 +75,12 @@ class ControllerService(IControllerService):
         self.get_controller(decider).uninstall(purge)
 
 
+    def _check_no_installation_in_progress(self):
+        # The setup installs the controllers too, so it excludes the installations and the other setups
+        installing = self.running_installation is not None and not self.running_installation.exited()
+        if installing or self.running_setup is not None:
+            raise ValueError("Another installation is in progress")
+
     @endpoint(url='/controllers/run')
     def run(self, decider: str|type, parameter: str | None = None) -> str:
         if parameter == '':
@@ -100,9 +111,12 @@ class ControllerService(IControllerService):
 
     @endpoint(url='/controllers/installation-report')
     def installation_report(self) -> InstallationReport:
-        if self.running_installation is None:
-            raise ValueError("No installation is in progress")
-        return self.running_installation.report
+        if self.running_installation is not None:
+            return self.running_installation.report
+        # The steps of the running setup are updated in place, so the report shows its progress
+        if self.running_setup is not None:
+            return self.running_setup
+        raise ValueError("No installation is in progress")
 
 
 
@@ -199,10 +213,22 @@ class ControllerService(IControllerService):
                 raise ValueError(f"Cannot delete {path} of decider {controller.get_name()}: no such file/folder")
 
     @endpoint(url="/resources/setup", method='POST')
-    def setup(self, setup: ControllersSetup):
+    def setup(self, setup: ControllersSetup) -> InstallationReport:
         from .setuper import Setuper
-        setuper = Setuper(setup, self)
-        setuper.make_all()
+        setuper = Setuper(
+            setup,
+            self,
+            self.settings.setup_parallelism,
+            self.settings.registry.locator.data_folder/'controllers_setup_journal.json'
+        )
+        with self._installation_lock:
+            self._check_no_installation_in_progress()
+            self.running_installation = None
+            self.running_setup = setuper.report
+        try:
+            return setuper.make_all()
+        finally:
+            self.running_setup = None
 
     @endpoint(url='/resources/download_models', method='POST')
     def download_models(self, decider: str|type, models: list):
@@ -1,12 +1,34 @@
 from .interface import ControllersSetup, ControllerInstanceSetup
-from .service import ControllerService, ControllerServiceStatus, ControllerServiceStatus
+from .service import ControllerService, ControllerServiceStatus
+from .dto import InstallationReport
+from .logging import Log, LoggingLocalExecutor, LogLogger
 from ..controller import ControllerRegistry, ISingleLoadableModelApi
+from ...common import FileIO
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from datetime import datetime
+from pathlib import Path
 from yo_fluq import Query
+import traceback
+
 
 class Setuper:
-    def __init__(self, setup: ControllersSetup, service: ControllerService):
+    # Each controller is set up by its own chain of steps: installation (building or pulling the image and downloading the models),
+    # then running the instances and loading their models. The chains of different controllers are independent and run in parallel;
+    # the steps of one chain share the controller and its containers, so they run sequentially.
+    def __init__(self,
+                 setup: ControllersSetup,
+                 service: ControllerService,
+                 max_parallelism: int = 4,
+                 journal_path: Path|None = None
+                 ):
         self.setup = setup.controllers
         self.service = service
+        self.max_parallelism = max_parallelism
+        self.journal_path = journal_path
+        self.report = InstallationReport('setup', Log())
+        self._lock = Lock()
+        self._interrupted_installations: set[str] = set()
 
     def find(self, statuses: ControllerServiceStatus, setup: ControllerInstanceSetup) -> tuple[ControllerServiceStatus.Controller, ControllerServiceStatus.Instance|None]:
         name = ControllerRegistry.to_controller_name(setup.decider)
@@ -16,49 +38,105 @@ class Setuper:
                 return status, instance
         return status, None
 
-    def _install(self, statuses: ControllerServiceStatus):
-        changed = False
-        for s in self.setup:
-            status, _ = self.find(statuses, s)
-            if not status.installation_status.installed:
-                self.service.install(s.decider)
-                changed = True
-        return changed
+    # The journal keeps the installations that were started but not finished. The image of such a controller may already exist,
+    # while the models are not downloaded yet, so the installation is repeated after the interruption
+    def _read_journal(self):
+        if self.journal_path is not None and self.journal_path.is_file():
+            self._interrupted_installations = set(FileIO.read_json(self.journal_path))
 
+    def _update_journal(self, name: str, started: bool):
+        with self._lock:
+            if started:
+                self._interrupted_installations.add(name)
+            else:
+                self._interrupted_installations.discard(name)
+            if self.journal_path is not None:
+                FileIO.write_json(sorted(self._interrupted_installations), self.journal_path)
 
-    def _run(self, statuses: ControllerServiceStatus):
-        changed = False
-        for s in self.setup:
-            status, instance = self.find(statuses, s)
-            if instance is None:
-                self.service.run(s.decider, s.parameter)
-                changed = True
-        return changed
+    def _add_step(self, name: str) -> InstallationReport.Step:
+        step = InstallationReport.Step(name)
+        self.report.steps.append(step)
+        return step
 
-    def _load_model(self, statuses: ControllerServiceStatus):
-        changed = False
-        for s in self.setup:
-            _, instance = self.find(statuses, s)
-            if instance is None:
-                raise ValueError(f"The required service {s.decider} failed to start")
+    def _execute_step(self, step: InstallationReport.Step, action) -> bool:
+        step.status = InstallationReport.Step.Status.Running
+        step.started_at = datetime.now()
+        self.report.log.items.append(Log.Item(step.started_at, f'Step {step.name} started'))
+        try:
+            changed = action()
+        except:
+            step.error = traceback.format_exc()
+            step.status = InstallationReport.Step.Status.Failed
+            return False
+        finally:
+            step.finished_at = datetime.now()
+        step.status = InstallationReport.Step.Status.Done if changed else InstallationReport.Step.Status.Skipped
+        self.report.log.items.append(Log.Item(step.finished_at, f'Step {step.name} {step.status.name.lower()} in {step.duration_in_seconds:.1f} seconds'))
+        return True
 
-            if s.loaded_model is None:
-                continue
+    def _install(self, name: str, status: ControllerServiceStatus.Controller) -> bool:
+        if status.installation_status.installed and name not in self._interrupted_installations:
+            return False
+        controller = self.service.get_controller(name)
+        controller.context._executor = LoggingLocalExecutor(self.report.log)
+        controller.context._logger = LogLogger(self.report.log)
+        self._update_journal(name, True)
+        controller.install()
+        self._update_journal(name, False)
+        return True
 
-            controller = self.service.get_controller(s.decider)
-            api = controller.find_api(instance.instance_id)
-            if not isinstance(api, ISingleLoadableModelApi):
-                raise ValueError(f"Setup for controller {s.decider} expects model {s.loaded_model}, but the decider is not ISingleLoadableModelApi")
-            if api.get_loaded_model_name() != s.loaded_model:
-                api.load_model(s.loaded_model)
-                changed = True
-        return changed
+    def _run(self, name: str, setup: ControllerInstanceSetup) -> bool:
+        controller = self.service.get_controller(name)
+        if setup.parameter in controller.get_running_instances_id_to_parameter().values():
+            return False
+        controller.run(setup.parameter)
+        return True
 
+    def _load_model(self, name: str, setup: ControllerInstanceSetup) -> bool:
+        if setup.loaded_model is None:
+            return False
+        controller = self.service.get_controller(name)
+        instance_id = Query.dict(controller.get_running_instances_id_to_parameter()).where(lambda z: z.value == setup.parameter).select(lambda z: z.key).first_or_default()
+        if instance_id is None:
+            raise ValueError(f"The required service {setup.decider} failed to start")
+        api = controller.find_api(instance_id)
+        if not isinstance(api, ISingleLoadableModelApi):
+            raise ValueError(f"Setup for controller {setup.decider} expects model {setup.loaded_model}, but the decider is not ISingleLoadableModelApi")
+        if api.get_loaded_model_name() == setup.loaded_model:
+            return False
+        api.load_model(setup.loaded_model)
+        return True
 
-    def make_all(self):
+    def _make_chain(self, name: str, status: ControllerServiceStatus.Controller, setups: list[ControllerInstanceSetup]):
+        steps = [(self._add_step(f'install {name}'), lambda: self._install(name, status))]
+        for setup in setups:
+            instance_name = name if setup.parameter is None else f'{name}/{setup.parameter}'
+            steps.append((self._add_step(f'run {instance_name}'), lambda setup=setup: self._run(name, setup)))
+            if setup.loaded_model is not None:
+                steps.append((self._add_step(f'load {setup.loaded_model} to {instance_name}'), lambda setup=setup: self._load_model(name, setup)))
+
+        def chain():
+            for step, action in steps:
+                if not self._execute_step(step, action):
+                    break
+        return chain
+
+    def make_all(self) -> InstallationReport:
+        self._read_journal()
         statuses = self.service.status()
-        if self._install(statuses):
-            statuses = self.service.status()
-        if self._run(statuses):
-            statuses = self.service.status()
-        self._load_model(statuses)
+        name_to_setups: dict[str, list[ControllerInstanceSetup]] = {}
+        for s in self.setup:
+            name_to_setups.setdefault(ControllerRegistry.to_controller_name(s.decider), []).append(s)
+        chains = [
+            self._make_chain(name, self.find(statuses, setups[0])[0], setups)
+            for name, setups in name_to_setups.items()
+        ]
+        with ThreadPoolExecutor(max(1, self.max_parallelism)) as executor:
+            for future in [executor.submit(chain) for chain in chains]:
+                future.result()
+
+        failed = [step for step in self.report.steps if step.status == InstallationReport.Step.Status.Failed]
+        if len(failed) > 0:
+            self.report.error = '\n'.join(f'Step {step.name} failed:\n{step.error}' for step in failed)
+            raise ValueError(f"Setup failed\n{self.report.error}")
+        return self.report
@@ -1,5 +1,6 @@
 from .docker_web_service_api import DockerWebServiceApi
 from .connection_settings import ConnectionSettings
+from .resource_cost import ResourceCost
 from .controller import IController
 from .controller_context import ControllerContext
 from .docker_controller import DockerController
@@ -7,6 +7,7 @@ from .test_report import TestReport
 from ...common import Loc
 from .resource_folder import ResourceFolder
 from .controller_context import ControllerContext
+from .resource_cost import ResourceCost
 from dataclasses import dataclass
 import re
 from .test_report import create_self_test_report_page, TestReport
@@ -108,6 +109,17 @@ class IController(ABC, Generic[TSettings]):
         return ''.join(result)
 
 
+    def get_resource_cost(self) -> ResourceCost:
+        cost = getattr(self.settings, 'resource_cost', None)
+        if cost is None:
+            return ResourceCost()
+        return cost
+
+    def is_ready(self, instance_id: str, model: str|None = None) -> bool:
+        # The readiness probe: the operator processes the jobs only once it returns True.
+        # `model` is the model the instance is expected to have loaded, if any
+        return True
+
     def is_running(self, parameter: str|None):
         return parameter in self.get_running_instances_id_to_parameter().values()
 
@@ -4,16 +4,24 @@ from unittest import TestCase
 from . import TestReport
 from ...common import IDecider, ISelfManagingDecider
 from .controller import IController, TSettings
+from .resource_cost import ResourceCost
 from uuid import uuid4
+from dataclasses import dataclass
 
 
 class ControllerOverDecider(IController):
+    @dataclass
+    class Settings:
+        resource_cost: ResourceCost|None = None
+
     def __init__(self,
                  decider: IDecider,
-                 custom_name: str|None = None
+                 custom_name: str|None = None,
+                 resource_cost: ResourceCost|None = None
                  ):
         self.decider = decider
         self.custom_name = custom_name
+        self.resource_cost = resource_cost
         self.virtual_instances = {}
 
     def install(self):
@@ -26,7 +34,7 @@ class ControllerOverDecider(IController):
         return IController.DockerlessInstallation()
 
     def get_default_settings(self) -> TSettings:
-        return object()
+        return ControllerOverDecider.Settings(self.resource_cost)
 
     def run(self, parameter: str|None) -> str:
         if isinstance(self.decider, ISelfManagingDecider):
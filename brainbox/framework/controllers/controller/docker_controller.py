@@ -1,6 +1,5 @@
-import json
 from .controller import IController, TSettings
-from ...deployment import IImageSource, IImageBuilder, Deployment, LocalImageSource, IContainerRunner, Command
+from ...deployment import IImageSource, IImageBuilder, Deployment, LocalImageSource, IContainerRunner, Command, ContainerStateCache
 import shutil
 from .runner import BrainBoxRunner
 from .run_configuration import RunConfiguration
@@ -23,6 +22,9 @@ class DockerController(IController[TSettings]):
     def get_executor(self):
         return self.context.executor
 
+    def get_container_state_cache(self) -> ContainerStateCache:
+        return ContainerStateCache.for_executor(self.get_executor())
+
     def get_deployment(self, runner: IContainerRunner|None = None):
         return Deployment(
             self.get_image_source(),
@@ -41,6 +43,7 @@ class DockerController(IController[TSettings]):
 
 
     def install(self):
+        self.get_container_state_cache().invalidate()
         self.context.logger.log("Running pre-install")
         self.pre_install()
         self.context.logger.log("Stopping the current container, if exists")
@@ -61,6 +64,7 @@ class DockerController(IController[TSettings]):
 
     def uninstall(self, purge: bool = False):
         self.get_deployment().stop().remove()
+        self.get_container_state_cache().invalidate()
         images = self.get_image_source().get_relevant_images(self.get_executor())
         for image in images:
             self.get_executor().execute(['docker', 'rmi', image])
@@ -75,51 +79,56 @@ class DockerController(IController[TSettings]):
 
     def run_with_configuration(self, configuration: RunConfiguration) -> str:
         runner = BrainBoxRunner(self.context, configuration, True)
-        result = runner.run(self.get_image_source().get_image_name(), self.get_image_source().get_container_name(), self.get_executor())
+        try:
+            result = runner.run(self.get_image_source().get_image_name(), self.get_image_source().get_container_name(), self.get_executor())
+        finally:
+            self.get_container_state_cache().invalidate()
         return result[:12]
 
     def stop(self, instance_id: str):
         self.get_executor().execute(['docker','stop',instance_id])
         self.get_executor().execute(['docker', 'rm', instance_id], Command.Options(ignore_exit_code=True))
+        self.get_container_state_cache().invalidate()
+
 
+    @staticmethod
+    def _parse_parameter(value: str) -> str|None:
+        value = value.strip()
+        if value.startswith('*'):
+            return value[1:]
+        return None
 
     def instance_id_to_parameter(self, instance_id):
-        parameter = self.get_executor().execute(
-            ['docker', 'exec', instance_id, 'printenv', 'BRAINBOX_PARAMETER'],
-            Command.Options(return_output=True)
-        )
-        parameter = parameter.strip()
-        if parameter.startswith('*'):
-            parameter = parameter[1:]
-        else:
-            parameter = None
-        return parameter
+        # The parameter is read from the environment the container state cache already holds, instead of a docker exec.
+        # A container started elsewhere may be missing from a fresh cache, so the cache is re-read once before failing
+        cache = self.get_container_state_cache()
+        for attempt in range(2):
+            for container in cache.get_containers(self.get_executor()):
+                if container.id == instance_id[:12]:
+                    return DockerController._parse_parameter(container.environment.get('BRAINBOX_PARAMETER', ''))
+            cache.invalidate()
+        raise ValueError(f"Container {instance_id} is not running")
 
     def get_running_instances_id_to_parameter(self) -> dict[str, str|None]:
-        containers = self.get_executor().execute(
-            [
-                'docker', 'ps',
-                '--format', '{"id":"{{.ID}}","name":"{{.Names}}"}',
-                '--filter', f'ancestor={self.get_image_source().get_image_name()}'
-            ],
-            Command.Options(return_output=True)
+        containers = self.get_container_state_cache().get_containers_by_image(
+            self.get_executor(),
+            self.get_image_source().get_image_name()
         )
-        result = {}
-        containers = containers.strip()
-        if containers == '':
-            return result
-        for container in containers.split('\n'):
-            data = json.loads(container)
-            result[data['id']] = self.instance_id_to_parameter(data['name'])
-        return result
+        return {
+            container.id: DockerController._parse_parameter(container.environment.get('BRAINBOX_PARAMETER', ''))
+            for container in containers
+        }
 
     def run_auxiliary_configuration(self, cfg):
         runner = BrainBoxRunner(self.context, cfg, False)
-        runner.run(
-            self.get_image_source().get_image_name(),
-            self.get_image_source().get_container_name(),
-            self.get_executor()
-        )
+        try:
+            runner.run(
+                self.get_image_source().get_image_name(),
+                self.get_image_source().get_container_name(),
+                self.get_executor()
+            )
+        finally:
+            self.get_container_state_cache().invalidate()
 
 
 
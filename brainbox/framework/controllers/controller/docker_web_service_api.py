@@ -1,11 +1,13 @@
 from typing import TypeVar, Generic
 from .docker_web_service_controller import DockerWebServiceController
-from ...common import ApiUtils, IDecider
+from ...common import ApiUtils, IDecider, HttpSessions, HttpSessionSettings
 
 TSettings = TypeVar('TSettings')
 TController = TypeVar('TController')
 
 class DockerWebServiceApi(IDecider, Generic[TSettings, TController]):
+    session_settings: HttpSessionSettings|None = None
+
     def __init__(self, address: str|None, container_parameter: str|None = None):
         if address is not None:
             ApiUtils.check_address(address)
@@ -29,6 +31,11 @@ class DockerWebServiceApi(IDecider, Generic[TSettings, TController]):
             return self._custom_address
         return self.controller.address
 
+    @property
+    def session(self):
+        # Shared by all the instances pointing to the same container, so the chained calls reuse the kept-alive connections
+        return HttpSessions.get(self.address, self.session_settings)
+
     def endpoint(self, endpoint=''):
         return 'http://'+self.address+endpoint
 
@@ -2,10 +2,13 @@ from .docker_controller import DockerController, TSettings
 from abc import ABC, abstractmethod
 from .run_configuration import RunConfiguration
 from .connection_settings import ConnectionSettings
+from .single_loadable_model_api import ISingleLoadableModelApi
 import requests
 from ...common import ApiUtils
 
 class DockerWebServiceController(DockerController[TSettings], ABC):
+    ReadinessProbeTimeoutInSeconds = 5
+
     @abstractmethod
     def get_service_run_configuration(self, parameter: str|None) -> RunConfiguration:
         pass
@@ -47,9 +50,20 @@ class DockerWebServiceController(DockerController[TSettings], ABC):
             self.get_name()
         )
 
-    def is_reachable(self):
+    def is_ready(self, instance_id: str, model: str|None = None) -> bool:
+        if instance_id not in self.get_running_instances_id_to_parameter():
+            return False
+        if not self.is_reachable(self.ReadinessProbeTimeoutInSeconds):
+            return False
+        if model is not None:
+            api = self.find_api(instance_id)
+            if isinstance(api, ISingleLoadableModelApi) and api.get_loaded_model_name() != model:
+                return False
+        return True
+
+    def is_reachable(self, timeout_in_seconds: float|None = None):
         try:
-            reply = requests.get(self.endpoint())
+            reply = requests.get(self.endpoint(), timeout=timeout_in_seconds)
         except:
             return False
         if reply.status_code != 200:
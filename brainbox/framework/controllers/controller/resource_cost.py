@@ -0,0 +1,29 @@
+from dataclasses import dataclass, fields
+
+
+@dataclass(frozen=True)
+class ResourceCost:
+    # As a cost, an unspecified dimension is not used at all; as a limit, it is not limited
+    memory_in_gb: float|None = None
+    cpu_cores: float|None = None
+    gpu_memory_in_gb: float|None = None
+
+    def _combine(self, other: 'ResourceCost', sign: int) -> 'ResourceCost':
+        values = {}
+        for f in fields(self):
+            a, b = getattr(self, f.name), getattr(other, f.name)
+            values[f.name] = None if a is None and b is None else (a or 0) + sign*(b or 0)
+        return ResourceCost(**values)
+
+    def __add__(self, other: 'ResourceCost') -> 'ResourceCost':
+        return self._combine(other, 1)
+
+    def __sub__(self, other: 'ResourceCost') -> 'ResourceCost':
+        return self._combine(other, -1)
+
+    def fits_into(self, limits: 'ResourceCost') -> bool:
+        for f in fields(self):
+            limit = getattr(limits, f.name)
+            if limit is not None and (getattr(self, f.name) or 0) > limit:
+                return False
+        return True
@@ -3,3 +3,4 @@ from .executor import *
 from .image_builder import *
 from .image_source import *
 from .deployment import Deployment
+from .container_state_cache import ContainerState, ContainerStateCache
@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from threading import Lock
+from .executor import IExecutor, Command
+import json
+import time
+
+
+@dataclass
+class ContainerState:
+    id: str
+    name: str
+    image: str
+    environment: dict[str, str] = field(default_factory=dict)
+
+
+class ContainerStateCache:
+    # One `docker ps` and one `docker inspect` of all the running containers serve every controller, instead of
+    # a `docker ps` per image and a `docker exec` per container. The cache is shared per machine,
+    # and the controllers invalidate it whenever they start or stop containers themselves.
+    TimeToLiveInSeconds = 5
+    _lock = Lock()
+    _caches: dict[tuple[str, str], 'ContainerStateCache'] = {}
+
+    def __init__(self, time_to_live_in_seconds: float = TimeToLiveInSeconds):
+        self.time_to_live_in_seconds = time_to_live_in_seconds
+        self._lock = Lock()
+        self._containers: list[ContainerState]|None = None
+        self._timestamp: float|None = None
+
+    @staticmethod
+    def for_executor(executor: IExecutor) -> 'ContainerStateCache':
+        machine = executor.get_machine()
+        key = (machine.ip_address, machine.username)
+        with ContainerStateCache._lock:
+            if key not in ContainerStateCache._caches:
+                ContainerStateCache._caches[key] = ContainerStateCache()
+            return ContainerStateCache._caches[key]
+
+    @staticmethod
+    def normalize_image_name(image: str) -> str:
+        if ':' not in image.split('/')[-1] and '@' not in image:
+            return image + ':latest'
+        return image
+
+    def invalidate(self):
+        with self._lock:
+            self._containers = None
+
+    def get_containers(self, executor: IExecutor) -> list[ContainerState]:
+        with self._lock:
+            if self._containers is None or time.monotonic() - self._timestamp > self.time_to_live_in_seconds:
+                self._containers = self._read(executor)
+                self._timestamp = time.monotonic()
+            return list(self._containers)
+
+    def get_containers_by_image(self, executor: IExecutor, image: str) -> list[ContainerState]:
+        image = ContainerStateCache.normalize_image_name(image)
+        return [c for c in self.get_containers(executor) if ContainerStateCache.normalize_image_name(c.image) == image]
+
+    def _read(self, executor: IExecutor) -> list[ContainerState]:
+        ids = executor.execute(['docker', 'ps', '-q'], Command.Options(return_output=True))
+        ids = [id.strip() for id in ids.strip().split('\n') if id.strip() != '']
+        if len(ids) == 0:
+            return []
+        # The containers that stopped between the two calls make the exit code non-zero, but the rest are still reported
+        reply = executor.execute(
+            ['docker', 'inspect', '--format', '{"id":{{json .Id}},"name":{{json .Name}},"image":{{json .Config.Image}},"env":{{json .Config.Env}}}', *ids],
+            Command.Options(return_output=True, ignore_exit_code=True)
+        )
+        result = []
+        for line in reply.strip().split('\n'):
+            line = line.strip()
+            if not line.startswith('{'):
+                continue
+            data = json.loads(line)
+            environment = {}
+            for variable in data['env'] or []:
+                name, _, value = variable.partition('=')
+                environment[name] = value
+            result.append(ContainerState(
+                data['id'][:12],
+                data['name'].lstrip('/'),
+                data['image'],
+                environment
+            ))
+        return result
@@ -16,6 +16,8 @@ RUN usermod -aG sudo app
 USER app
 '''
 
+build_cache_syntax = '# syntax=docker/dockerfile:1\n'
+
 class SmallImageBuilder(IImageBuilder):
     def __init__(self,
                  code_path: Path,
@@ -24,7 +26,8 @@ class SmallImageBuilder(IImageBuilder):
                  add_current_user: bool = True,
                  copy_to_code_path: dict[Path, str]|None = None,
                  write_to_code_path: dict[str, str]|None = None,
-                 reset_code_folder: bool = False
+                 reset_code_folder: bool = False,
+                 use_build_cache: bool|None = None
     ):
         self.code_path = code_path
         self.docker_template = docker_template
@@ -33,6 +36,13 @@ class SmallImageBuilder(IImageBuilder):
         self.copy_to_code_path = copy_to_code_path
         self.reset_code_folder = reset_code_folder
         self.write_to_code_path = write_to_code_path
+        self.use_build_cache = use_build_cache if use_build_cache is not None else SmallImageBuilder.UseBuildCacheByDefault
+
+    # The wheelhouse is a BuildKit cache mount shared by all the images built on the machine, so a dependency
+    # is downloaded and compiled once, and the rebuild of an image with unchanged dependencies doesn't touch the network
+    UseBuildCacheByDefault = False
+    WheelhouseCacheId = 'brainbox-wheelhouse'
+    WheelhousePath = '/tmp/brainbox-wheelhouse'
 
     ADD_USER_PLACEHOLDER = 'add_user'
 
@@ -53,6 +63,9 @@ class SmallImageBuilder(IImageBuilder):
             return None
         result = []
         for line in self.dependencies:
+            if self.use_build_cache:
+                result.append(self._convert_dependencies_with_build_cache(line))
+                continue
             template = (
                 'RUN pip wheel --no-cache-dir --wheel-dir=/tmp/wheels {DEPS} && '  
                 'pip install --no-cache-dir --no-index --find-links=/tmp/wheels {DEPS} && '
@@ -61,6 +74,28 @@ class SmallImageBuilder(IImageBuilder):
             result.append(template.format(DEPS=' '.join(line)))
         return '\n\n'.join(result)
 
+    def _convert_dependencies_with_build_cache(self, line: list[str]):
+        deps = ' '.join(line)
+        wheelhouse = SmallImageBuilder.WheelhousePath
+        # `locked` serializes the concurrent builds that write the same wheels, `mode` lets the non-root user write
+        mount = f'--mount=type=cache,id={SmallImageBuilder.WheelhouseCacheId},target={wheelhouse},sharing=locked,mode=0777'
+        install = f'pip install --no-cache-dir --no-index --find-links={wheelhouse} {deps}'
+        return (
+            f'RUN {mount} '
+            f'{install} || '
+            f'(pip wheel --no-cache-dir --wheel-dir={wheelhouse} --find-links={wheelhouse} {deps} && {install})'
+        )
+
+    def _check_layers_order(self):
+        # The dependency layers must precede anything copied from `code_path`, or every change of the code rebuilds them
+        placeholder = '{'+SmallImageBuilder.PIP_INSTALL_PLACEHOLDER+'}'
+        if placeholder not in self.docker_template:
+            return
+        for line in self.docker_template[:self.docker_template.index(placeholder)].split('\n'):
+            instruction = line.strip().split(' ')[0].upper()
+            if instruction in ('COPY', 'ADD'):
+                raise ValueError(f"With the build cache, the dependencies must be installed before the code is copied, but found `{line.strip()}` before them")
+
     def _create_target_file(self, target_str_path: str):
         target = target_str_path
         while target.startswith('/'):
@@ -81,6 +116,9 @@ class SmallImageBuilder(IImageBuilder):
             format_kwargs[SmallImageBuilder.ADD_USER_PLACEHOLDER] = user_add_template.format(user_id=executor.get_machine().user_id, group_id=executor.get_machine().group_id)
 
         dockerfile = self.docker_template.format(**format_kwargs)
+        if self.use_build_cache:
+            self._check_layers_order()
+            dockerfile = build_cache_syntax + dockerfile.lstrip('\n')
         if self.reset_code_folder:
             shutil.rmtree(self.code_path, ignore_errors=True)
         os.makedirs(self.code_path, exist_ok=True)
@@ -108,8 +146,11 @@ class SmallImageBuilder(IImageBuilder):
     def build_image(self, image_name: str, executor: IExecutor) -> None:
         self._prepare_container_folder(executor)
         args = []
+        prefix = []
+        if self.use_build_cache:
+            prefix = ['env', 'DOCKER_BUILDKIT=1']
         executor.execute(
-            ['docker','build','-t', image_name] + args + ['.'],
+            prefix + ['docker','build','-t', image_name] + args + ['.'],
             Command.Options(workdir=self.code_path)
         )
 
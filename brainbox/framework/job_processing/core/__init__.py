@@ -1,8 +1,16 @@
-from .job import Job, BrainBoxBase
+from .job import Job, JobPayload, BrainBoxBase
+from .job_log import JobLog, JobChunk
 from .decider_instance_key import DeciderInstanceKey
 from .operator_message import OperatorMessage
+from .notifying_queue import NotifyingQueue
 from .operator_state import OperatorState, OperatorStateForPlanner
 from .job_for_planner import JobForPlanner
+from .dependency_index import DependencyIndex
+from .completion_registry import CompletionRegistry, CompletionWaiter
+from .duration_estimates import DurationEstimates, QueueEstimate
+from .schema_migration import migrate_schema
+from .job_store import IJobStore, EngineJobStore, SqliteJobStore, PostgresJobStore, InMemoryJobStore
+from .result_cache import ResultCache
 from .core import Core, ICoreAction
 from .trackable_session_factory import TrackableSessionFactory
 from .operator_log import OperatorLog, OperatorLogItem, OperatorLogHandle
\ No newline at end of file
@@ -0,0 +1,46 @@
+from typing import Iterable
+from threading import Lock, Event
+
+
+class CompletionWaiter:
+    def __init__(self, ids: Iterable[str]):
+        self.ids = tuple(ids)
+        self.event = Event()
+
+    def wait(self, timeout: float|None = None) -> bool:
+        result = self.event.wait(timeout)
+        self.event.clear()
+        return result
+
+
+class CompletionRegistry:
+    def __init__(self):
+        self._lock = Lock()
+        self._id_to_waiters: dict[str, list[CompletionWaiter]] = {}
+
+    def register(self, ids: Iterable[str]) -> CompletionWaiter:
+        waiter = CompletionWaiter(ids)
+        with self._lock:
+            for id in waiter.ids:
+                self._id_to_waiters.setdefault(id, []).append(waiter)
+        return waiter
+
+    def unregister(self, waiter: CompletionWaiter):
+        with self._lock:
+            for id in waiter.ids:
+                waiters = self._id_to_waiters.get(id)
+                if waiters is None:
+                    continue
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if len(waiters) == 0:
+                    del self._id_to_waiters[id]
+
+    def on_jobs_finished(self, ids: Iterable[str]):
+        self.on_jobs_updated(ids)
+
+    def on_jobs_updated(self, ids: Iterable[str]):
+        with self._lock:
+            for id in ids:
+                for waiter in self._id_to_waiters.get(id, ()):
+                    waiter.event.set()
@@ -1,34 +1,72 @@
+from typing import Iterable
 from ...controllers import ControllerRegistry
 from .operator_state import OperatorState
 from .operator_log import OperatorLog
-from sqlalchemy import Engine, select
+from sqlalchemy import Engine, select, event
 from sqlalchemy.orm import Session
 from .job import Job
+from .notifying_queue import NotifyingQueue
+from .dependency_index import DependencyIndex
+from .completion_registry import CompletionRegistry
+from .duration_estimates import DurationEstimates
+from .job_store import IJobStore, EngineJobStore
+from .result_cache import ResultCache
 import traceback
 from abc import ABC, abstractmethod
 from .trackable_session_factory import TrackableSessionFactory
 from .job_for_planner import JobForPlanner
-from ...common import Locator, Loc
+from .decider_instance_key import DeciderInstanceKey
+from ...common import Locator, Loc, CacheStore
+from threading import Event
 
 class Core:
     def __init__(self,
-                 engine: Engine,
+                 store: IJobStore|Engine,
                  registry: ControllerRegistry,
                  locator: Locator = Loc,
                  debug_output: bool = False,
                  ):
-        self._engine = engine
-        self.new_session = TrackableSessionFactory(self._engine, Core.job_to_id)
+        if isinstance(store, Engine):
+            store = EngineJobStore(store)
+        self.store = store
+        self._engine = store.engine
+        self.new_session = TrackableSessionFactory(self._engine, Core.job_to_id, store.create_session)
         self.registry = registry
         self.locator = locator
         self.operator_states: dict[str, OperatorState] = dict()
         self.operator_log: OperatorLog = OperatorLog(debug_output)
         self.jobs_for_planner: tuple[JobForPlanner,...]|None = None
+        self.upcoming_jobs_for_planner: dict[DeciderInstanceKey, int] = {}
+        self.wake_up_event: Event = Event()
+        self.dependency_index: DependencyIndex = DependencyIndex()
+        self.completion_registry: CompletionRegistry = CompletionRegistry()
+        self.duration_estimates: DurationEstimates = DurationEstimates()
+        self.cache_store: CacheStore|None = None
+        self.result_cache: ResultCache|None = None
 
     @staticmethod
     def job_to_id(job: Job):
         return job.id
 
+    def notify(self):
+        self.wake_up_event.set()
+
+    def on_jobs_finished(self, ids: Iterable[str]):
+        ids = list(ids)
+        self.dependency_index.on_jobs_finished(ids)
+        self.completion_registry.on_jobs_finished(ids)
+        if self.cache_store is not None:
+            self.cache_store.release_references(ids)
+        if self.result_cache is not None:
+            self.result_cache.forget(ids)
+        self.notify()
+
+    def on_partial_results(self, ids: Iterable[str]):
+        self.completion_registry.on_jobs_updated(ids)
+
+    def create_results_queue(self) -> NotifyingQueue:
+        return NotifyingQueue(self.wake_up_event)
+
     def get_job_by_id(self, session: Session, id: str):
         return session.scalar(select(Job).where(Job.id == id))
 
@@ -39,6 +77,8 @@ class Core:
         job.finished = True
         job.success = False
         job.error = custom_message
+        id = job.id
+        event.listen(session, 'after_commit', lambda _: self.on_jobs_finished([id]), once=True)
 
 
 class ICoreAction(ABC):
@@ -0,0 +1,65 @@
+from typing import Iterable
+from threading import Lock
+
+
+class DependencyIndex:
+    def __init__(self):
+        self.initialized: bool = False
+        self.dependency_to_waiting: dict[str, set[str]] = {}
+        self.waiting_to_remaining: dict[str, set[str]] = {}
+        self._added: list[tuple[str, dict[str, str]]] = []
+        self._finished: list[str] = []
+        self._lock = Lock()
+
+    def on_jobs_added(self, jobs: Iterable[tuple[str, dict[str, str]|None]]):
+        with self._lock:
+            self._added.extend((id, dependencies) for id, dependencies in jobs if dependencies is not None)
+
+    def on_jobs_finished(self, ids: Iterable[str]):
+        with self._lock:
+            self._finished.extend(ids)
+
+    def pop_added(self) -> list[tuple[str, dict[str, str]]]:
+        with self._lock:
+            result, self._added = self._added, []
+        return result
+
+    def pop_finished(self) -> list[str]:
+        with self._lock:
+            result, self._finished = self._finished, []
+        return result
+
+    def register(self, id: str, remaining_dependencies: Iterable[str]) -> bool:
+        remaining = set(remaining_dependencies)
+        if len(remaining) == 0:
+            self.remove(id)
+            return True
+        self.waiting_to_remaining[id] = remaining
+        for dependency in remaining:
+            self.dependency_to_waiting.setdefault(dependency, set()).add(id)
+        return False
+
+    def remove(self, id: str):
+        remaining = self.waiting_to_remaining.pop(id, None)
+        if remaining is None:
+            return
+        for dependency in remaining:
+            waiting = self.dependency_to_waiting.get(dependency)
+            if waiting is not None:
+                waiting.discard(id)
+                if len(waiting) == 0:
+                    del self.dependency_to_waiting[dependency]
+
+    def resolve(self, finished_ids: Iterable[str]) -> list[str]:
+        ready = []
+        for finished_id in finished_ids:
+            self.remove(finished_id)
+            for waiting_id in self.dependency_to_waiting.pop(finished_id, ()):
+                remaining = self.waiting_to_remaining.get(waiting_id)
+                if remaining is None:
+                    continue
+                remaining.discard(finished_id)
+                if len(remaining) == 0:
+                    del self.waiting_to_remaining[waiting_id]
+                    ready.append(waiting_id)
+        return ready
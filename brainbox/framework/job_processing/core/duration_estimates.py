@@ -0,0 +1,102 @@
+from typing import Iterable
+from dataclasses import dataclass
+from threading import Lock
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .job import Job
+from .job_for_planner import JobForPlanner
+from .decider_instance_key import DeciderInstanceKey
+
+
+@dataclass
+class QueueEstimate:
+    key: DeciderInstanceKey
+    tasks_count: int
+    startup_in_seconds: float
+    processing_in_seconds: float
+
+    @property
+    def total_in_seconds(self) -> float:
+        return self.startup_in_seconds + self.processing_in_seconds
+
+    @property
+    def seconds_per_task(self) -> float:
+        return self.total_in_seconds / self.tasks_count
+
+
+class DurationEstimates:
+    def __init__(self,
+                 smoothing: float = 0.1,
+                 history_size: int = 10000,
+                 default_startup_in_seconds: float = 10,
+                 default_processing_in_seconds: float = 1
+                 ):
+        self.smoothing = smoothing
+        self.history_size = history_size
+        self.default_startup_in_seconds = default_startup_in_seconds
+        self.default_processing_in_seconds = default_processing_in_seconds
+        self.initialized: bool = False
+        self._processing: dict[tuple[str, str|None, str|None], float] = {}
+        self._startup: dict[DeciderInstanceKey, float] = {}
+        self._lock = Lock()
+
+    def _update(self, storage: dict, key, value: float):
+        with self._lock:
+            current = storage.get(key)
+            if current is None:
+                storage[key] = value
+            else:
+                storage[key] = current + self.smoothing*(value - current)
+
+    def on_job_processed(self, decider: str, parameter: str|None, method: str|None, seconds: float):
+        self._update(self._processing, (decider, parameter, method), seconds)
+
+    def on_decider_started(self, key: DeciderInstanceKey, seconds: float):
+        self._update(self._startup, key, seconds)
+
+    def load_history(self, session: Session):
+        rows = list(session.execute(
+            select(Job.decider, Job.decider_parameter, Job.method, Job.accepted_timestamp, Job.finished_timestamp)
+            .where(Job.finished & Job.success & Job.accepted_timestamp.isnot(None))
+            .order_by(Job.finished_timestamp.desc())
+            .limit(self.history_size)
+        ))
+        # The oldest records go first, so the most recent ones weigh more in the moving average
+        for row in reversed(rows):
+            seconds = (row.finished_timestamp - row.accepted_timestamp).total_seconds()
+            self.on_job_processed(row.decider, row.decider_parameter, row.method, seconds)
+        self.initialized = True
+
+    def get_processing_time(self, decider: str, parameter: str|None, method: str|None) -> float:
+        with self._lock:
+            result = self._processing.get((decider, parameter, method))
+            if result is not None:
+                return result
+            same_method = [value for key, value in self._processing.items() if key[0] == decider and key[2] == method]
+        if len(same_method) > 0:
+            return sum(same_method)/len(same_method)
+        return self.default_processing_in_seconds
+
+    def get_startup_time(self, key: DeciderInstanceKey) -> float:
+        with self._lock:
+            result = self._startup.get(key)
+            if result is not None:
+                return result
+            same_decider = [value for k, value in self._startup.items() if k.decider_name == key.decider_name]
+        if len(same_decider) > 0:
+            return sum(same_decider)/len(same_decider)
+        return self.default_startup_in_seconds
+
+    def estimate_queue(self, tasks: Iterable[JobForPlanner], active_keys: Iterable[DeciderInstanceKey] = ()) -> list[QueueEstimate]:
+        active_keys = set(active_keys)
+        key_to_estimate: dict[DeciderInstanceKey, QueueEstimate] = {}
+        for task in tasks:
+            key = task.get_decider_instance_key()
+            if key not in key_to_estimate:
+                startup = 0 if key in active_keys else self.get_startup_time(key)
+                key_to_estimate[key] = QueueEstimate(key, 0, startup, 0)
+            estimate = key_to_estimate[key]
+            estimate.tasks_count += 1
+            estimate.processing_in_seconds += self.get_processing_time(task.decider, task.decider_parameters, task.method)
+        # Running the groups with the least time per task first minimizes the total waiting time of all the tasks
+        return sorted(key_to_estimate.values(), key=lambda z: (z.seconds_per_task, str(z.key)))
@@ -1,11 +1,21 @@
 from typing import *
-from sqlalchemy.orm import declarative_base, Mapped, mapped_column
-from sqlalchemy import JSON, PickleType
+from sqlalchemy.orm import declarative_base, Mapped, mapped_column, relationship
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy import JSON, PickleType, ForeignKey, Index
 from datetime import datetime
 from .decider_instance_key import DeciderInstanceKey
 
 BrainBoxBase = declarative_base()
 
+
+class JobPayload(BrainBoxBase):
+    __tablename__ = "brain_box_job_payloads"
+
+    id: Mapped[str] = mapped_column(ForeignKey("brain_box_jobs.id"), primary_key=True)
+    arguments: Mapped[Any] = mapped_column(type_ = PickleType, nullable=True)
+    result: Mapped[Any] = mapped_column(type_ = PickleType, nullable=True, default=None)
+
+
 class Job(BrainBoxBase):
     __tablename__ = "brain_box_jobs"
 
@@ -13,10 +23,10 @@ class Job(BrainBoxBase):
     decider: Mapped[str] = mapped_column()
     decider_parameter: Mapped[str] = mapped_column(nullable=True)
     method: Mapped[str] = mapped_column(nullable=True)
-    arguments: Mapped[Any] = mapped_column(type_ = PickleType)
     info: Mapped[Any] = mapped_column(type_= PickleType, nullable=True)
     batch: Mapped[str] = mapped_column()
     ordering_token: Mapped[str] = mapped_column(nullable=True)
+    cacheable: Mapped[bool] = mapped_column(default=False)
 
     received_timestamp: Mapped[datetime] = mapped_column()
 
@@ -32,14 +42,26 @@ class Job(BrainBoxBase):
     accepted_timestamp: Mapped[datetime] = mapped_column(nullable=True)
 
     progress: Mapped[Optional[float]] = mapped_column(nullable=True, default=None)
-    log: Mapped[Optional[List[str]]] = mapped_column(nullable=True, default=None, type_ = JSON)
+    # Not a column: the log lives in brain_box_job_logs, and BrainBoxService.job fills it in
+    log = None
 
     finished: Mapped[bool] = mapped_column(default=False)
     finished_timestamp: Mapped[datetime] = mapped_column(nullable=True)
     success: Mapped[bool] = mapped_column(default=False)
-    result: Mapped[Any] = mapped_column(type_ = PickleType, nullable=True, default=None)
     error: Mapped[str] = mapped_column(nullable=True, default=None)
 
+    # Arguments and results may be large pickled blobs, so they live in a side table
+    # and scans over the job state never read them.
+    payload: Mapped[Optional[JobPayload]] = relationship(cascade='all, delete-orphan')
+    arguments = association_proxy('payload', 'arguments', creator=lambda value: JobPayload(arguments=value))
+    result = association_proxy('payload', 'result', creator=lambda value: JobPayload(result=value))
+
+    __table_args__ = (
+        Index('ix_brain_box_jobs_state', 'finished', 'ready', 'has_dependencies'),
+        Index('ix_brain_box_jobs_decider', 'decider', 'decider_parameter', 'finished'),
+        Index('ix_brain_box_jobs_batch', 'batch'),
+    )
+
 
     def get_this_and_dependency_ids(self):
         result = [self.id]
@@ -57,5 +79,16 @@ class Job(BrainBoxBase):
         self.received_timestamp = now
         self.batch = self.batch if self.batch is not None else self.id
         self.has_dependencies = self.dependencies is not None
+        if self.payload is None:
+            self.payload = JobPayload()
         return self
 
+    def to_dict(self) -> dict:
+        result = {
+            column.key: self.__dict__[column.key]
+            for column in Job.__table__.columns
+            if column.key in self.__dict__
+        }
+        result['arguments'] = self.arguments
+        return result
+
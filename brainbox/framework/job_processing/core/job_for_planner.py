@@ -10,6 +10,7 @@ class JobForPlanner:
     received_timestamp: datetime
     assigned: bool
     ordering_token: str|None
+    method: str|None = None
 
     def get_decider_instance_key(self):
         return DeciderInstanceKey(self.decider, self.decider_parameters)
\ No newline at end of file
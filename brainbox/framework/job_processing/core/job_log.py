@@ -0,0 +1,32 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Index, PickleType, JSON
+from typing import Any
+from datetime import datetime
+from .job import BrainBoxBase
+
+
+class JobLog(BrainBoxBase):
+    __tablename__ = "brain_box_job_logs"
+
+    record_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column()
+    timestamp: Mapped[datetime] = mapped_column()
+    # Stored as JSON, so structured log entries come back as they were logged
+    payload: Mapped[Any] = mapped_column(JSON, nullable=True)
+
+    __table_args__ = (
+        Index('ix_brain_box_job_logs_job_id', 'job_id'),
+    )
+
+
+class JobChunk(BrainBoxBase):
+    __tablename__ = "brain_box_job_chunks"
+
+    record_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column()
+    timestamp: Mapped[datetime] = mapped_column()
+    payload: Mapped[Any] = mapped_column(PickleType, nullable=True)
+
+    __table_args__ = (
+        Index('ix_brain_box_job_chunks_job_id', 'job_id'),
+    )
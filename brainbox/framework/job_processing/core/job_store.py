@@ -0,0 +1,146 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from threading import RLock
+from sqlalchemy import Engine, Select, create_engine, text, select, event
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.pool import StaticPool
+from .job import BrainBoxBase, Job
+from .schema_migration import migrate_schema
+
+
+class IJobStore(ABC):
+    @abstractmethod
+    def _create_engine(self) -> Engine:
+        pass
+
+    @property
+    def engine(self) -> Engine:
+        if getattr(self, '_engine', None) is None:
+            self._engine = self._create_engine()
+        return self._engine
+
+    def create_session(self) -> Session:
+        return Session(self.engine)
+
+    def initialize(self):
+        BrainBoxBase.metadata.create_all(self.engine)
+        migrate_schema(self.engine)
+
+    def _claim_query(self, ids: list[str]) -> Select:
+        return (
+            select(Job)
+            .where(Job.id.in_(ids) & Job.ready & ~Job.assigned & ~Job.finished)
+            .order_by(Job.ordering_token, Job.received_timestamp)
+            .limit(len(ids))
+            .options(selectinload(Job.payload))
+        )
+
+    def claim_for_assignment(self, session: Session, ids: list[str]) -> list[Job]:
+        # Returns the jobs of `ids` that may be assigned now. The rest are either gone or claimed by another assigner
+        if len(ids) == 0:
+            return []
+        return list(session.scalars(self._claim_query(ids)))
+
+    def dispose(self):
+        if getattr(self, '_engine', None) is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    def __getstate__(self):
+        # Stores travel inside the settings to forked servers, and engines cannot be pickled
+        state = dict(self.__dict__)
+        state.pop('_engine', None)
+        return state
+
+
+class EngineJobStore(IJobStore):
+    def __init__(self, engine: Engine):
+        self._engine = engine
+
+    def _create_engine(self) -> Engine:
+        raise ValueError("EngineJobStore was disposed and cannot recreate the engine")
+
+    def __getstate__(self):
+        raise ValueError("EngineJobStore wraps an existing engine and cannot be transferred to another process")
+
+
+class SqliteJobStore(IJobStore):
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _create_engine(self) -> Engine:
+        return create_engine('sqlite:///'+str(self.path))
+
+
+class PostgresJobStore(IJobStore):
+    def __init__(self, url: str, pool_size: int = 10, max_overflow: int = 20):
+        self.url = url
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+
+    def _create_engine(self) -> Engine:
+        return create_engine(
+            self.url,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            pool_pre_ping=True
+        )
+
+    def initialize(self):
+        super().initialize()
+        with self.engine.begin() as connection:
+            connection.execute(text(
+                'CREATE INDEX IF NOT EXISTS ix_brain_box_jobs_unfinished_by_decider '
+                'ON brain_box_jobs (decider, decider_parameter, ready, assigned) '
+                'WHERE NOT finished'
+            ))
+
+    def _claim_query(self, ids: list[str]) -> Select:
+        # The rows locked by a concurrent assigner are skipped instead of waited for
+        return super()._claim_query(ids).with_for_update(skip_locked=True, of=Job)
+
+
+class _LockedSession(Session):
+    # The lock is held for the duration of each transaction rather than the lifetime of the session,
+    # so a session that is left open between transactions does not block the others
+    def __init__(self, lock: RLock, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._store_lock = lock
+        self._store_lock_held = False
+        event.listen(self, 'after_transaction_create', self._on_transaction_create)
+        event.listen(self, 'after_transaction_end', self._on_transaction_end)
+
+    def _on_transaction_create(self, session, transaction):
+        if transaction.parent is None and not self._store_lock_held:
+            self._store_lock.acquire()
+            self._store_lock_held = True
+
+    def _on_transaction_end(self, session, transaction):
+        if transaction.parent is None and self._store_lock_held:
+            self._store_lock_held = False
+            self._store_lock.release()
+
+
+class InMemoryJobStore(IJobStore):
+    def __init__(self):
+        self._lock = RLock()
+
+    def _create_engine(self) -> Engine:
+        return create_engine(
+            'sqlite://',
+            connect_args=dict(check_same_thread=False),
+            poolclass=StaticPool
+        )
+
+    def create_session(self) -> Session:
+        # All the sessions share the only connection to the in-memory database, so they must not interleave
+        return _LockedSession(self._lock, self.engine)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop('_lock')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = RLock()
@@ -0,0 +1,13 @@
+from queue import Queue
+from threading import Event
+
+
+class NotifyingQueue(Queue):
+    def __init__(self, event: Event|None = None, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.event = event
+
+    def put(self, item, block: bool = True, timeout: float|None = None):
+        super().put(item, block, timeout)
+        if self.event is not None:
+            self.event.set()
@@ -8,6 +8,7 @@ from .operator_log import OperatorLog
 from ...controllers.controller import IController
 from ...common import IDecider
 from threading import Thread
+from typing import Callable
 
 @dataclass
 class OperatorStateForPlanner:
@@ -15,6 +16,7 @@ class OperatorStateForPlanner:
     key: DeciderInstanceKey
     busy: bool
     not_busy_since: datetime|None
+    max_batch_size: int = 1
 
 
 @dataclass
@@ -30,6 +32,9 @@ class OperatorState:
     not_busy_since: datetime|None = None
     jobs_queue: Queue[Job] = field(default_factory=Queue)
     results_queue: Queue[OperatorMessage] = field(default_factory=Queue)
+    # Loading the model and waiting for the readiness, run by the operator thread before it processes jobs
+    warm_up: Callable[[], None]|None = None
+    warm_up_error: str|None = None
 
 
 
@@ -0,0 +1,89 @@
+from typing import *
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from .job import Job
+from ...common import CacheStore
+import hashlib
+import json
+import time
+
+
+class ResultCache:
+    # The results of the jobs the deciders declare cacheable are kept in memory, keyed by the hash of the call.
+    # The files among the arguments are keyed by their content, not by their names, and a cached result
+    # that refers to the files evicted from the cache store is considered missing.
+    @dataclass
+    class Entry:
+        result: Any
+        file_names: tuple[str,...]
+        timestamp: float
+
+    def __init__(self, cache_store: CacheStore, max_entries: int = 1000, ttl_in_seconds: float|None = None):
+        self.cache_store = cache_store
+        self.max_entries = max_entries
+        self.ttl_in_seconds = ttl_in_seconds
+        self._lock = Lock()
+        self._entries: OrderedDict[str, ResultCache.Entry] = OrderedDict()
+        self._job_id_to_key: dict[str, str] = {}
+
+    def _normalize(self, value):
+        if isinstance(value, dict):
+            return {str(key): self._normalize(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self._normalize(item) for item in value]
+        if isinstance(value, str) and 0 < len(value) < 256 and self.cache_store.contains(value):
+            return {'*file': self.cache_store.get_hash(value)}
+        return value
+
+    def get_key(self, job: Job) -> str|None:
+        if not job.cacheable or job.dependencies:
+            return None
+        try:
+            serialized = json.dumps(
+                [job.decider, job.decider_parameter, job.method, self._normalize(job.arguments)],
+                sort_keys=True
+            )
+        except (TypeError, ValueError, FileNotFoundError):
+            return None
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def _is_alive(self, entry: 'ResultCache.Entry') -> bool:
+        if self.ttl_in_seconds is not None and time.monotonic() - entry.timestamp > self.ttl_in_seconds:
+            return False
+        return all(self.cache_store.contains(name) for name in entry.file_names)
+
+    def try_get(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if not self._is_alive(entry):
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry.result
+
+    def expect(self, job_id: str, key: str):
+        with self._lock:
+            self._job_id_to_key[job_id] = key
+
+    def forget(self, job_ids: Iterable[str]):
+        with self._lock:
+            for id in job_ids:
+                self._job_id_to_key.pop(id, None)
+
+    def on_jobs_succeeded(self, id_to_result: dict[str, Any]):
+        with self._lock:
+            for id, result in id_to_result.items():
+                key = self._job_id_to_key.pop(id, None)
+                if key is None:
+                    continue
+                self._entries[key] = ResultCache.Entry(
+                    result,
+                    tuple(self.cache_store.find_names(result)),
+                    time.monotonic()
+                )
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,34 @@
+from sqlalchemy import Engine, inspect, text
+from .job import Job, JobPayload
+
+
+def _move_payload_columns_to_side_table(engine: Engine):
+    columns = set(column['name'] for column in inspect(engine).get_columns(Job.__tablename__))
+    moved_columns = [c for c in ('arguments', 'result') if c in columns]
+    if len(moved_columns) == 0:
+        return
+    with engine.begin() as connection:
+        connection.execute(text(
+            f'INSERT INTO {JobPayload.__tablename__} (id, {", ".join(moved_columns)}) '
+            f'SELECT id, {", ".join(moved_columns)} FROM {Job.__tablename__} '
+            f'WHERE id NOT IN (SELECT id FROM {JobPayload.__tablename__})'
+        ))
+        for column in moved_columns:
+            connection.execute(text(f'ALTER TABLE {Job.__tablename__} DROP COLUMN {column}'))
+
+
+def _add_cacheable_column(engine: Engine):
+    columns = set(column['name'] for column in inspect(engine).get_columns(Job.__tablename__))
+    if 'cacheable' in columns:
+        return
+    with engine.begin() as connection:
+        connection.execute(text(f'ALTER TABLE {Job.__tablename__} ADD COLUMN cacheable BOOLEAN NOT NULL DEFAULT FALSE'))
+
+
+def migrate_schema(engine: Engine):
+    # `create_all` only creates missing tables, so the databases created by the previous versions
+    # need their columns moved and their indexes added explicitly
+    _move_payload_columns_to_side_table(engine)
+    _add_cacheable_column(engine)
+    for index in Job.__table__.indexes:
+        index.create(engine, checkfirst=True)
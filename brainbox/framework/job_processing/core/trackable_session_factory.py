@@ -14,13 +14,17 @@ class TrackableSessionFactory:
         def all(self) -> list:
             return self.modified+self.added+self.deleted
 
-    def __init__(self, engine, selector:Callable):
+    def __init__(self, engine, selector:Callable, session_factory: Callable[[], Session]|None = None):
         self.engine = engine
         self.selector = selector
+        self.session_factory = session_factory
         self.changes = TrackableSessionFactory.Changes()
 
     def __call__(self) -> Session:
-        session = Session(self.engine)
+        if self.session_factory is not None:
+            session = self.session_factory()
+        else:
+            session = Session(self.engine)
         event.listen(session, 'before_commit', self._track_changes)
         return session
 
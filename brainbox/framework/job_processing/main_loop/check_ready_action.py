@@ -1,6 +1,6 @@
 from ..core import ICoreAction, Job, Core
 from sqlalchemy.orm import Session
-from sqlalchemy import select
+from sqlalchemy import select, update
 from datetime import datetime
 
 
@@ -23,37 +23,54 @@ class CheckReadyAction(ICoreAction):
 
 
     def assign_ready_to_dependent_tasks(self, core: Core):
+        index = core.dependency_index
         with core.new_session() as session:
-            dependent_tasks = list(session.execute(
-                select(Job.id, Job.dependencies)
-                .where(~Job.finished & ~Job.ready & Job.has_dependencies)
-            ))
+            if not index.initialized:
+                index.on_jobs_added(session.execute(
+                    select(Job.id, Job.dependencies)
+                    .where(~Job.finished & ~Job.ready & Job.has_dependencies)
+                ))
+                index.initialized = True
 
-            dependency_ids = list(set(id for dependent in dependent_tasks for id in dependent.dependencies.values()))
+            ready_ids = self._register_added_tasks(core, session)
+            ready_ids.extend(index.resolve(index.pop_finished()))
 
-            dependency_status = list(session.execute(
+            if len(ready_ids) > 0:
+                session.execute(
+                    update(Job)
+                    .where(Job.id.in_(ready_ids) & ~Job.finished & ~Job.ready)
+                    .values(ready=True, ready_timestamp=datetime.now())
+                )
+                for id in ready_ids:
+                    core.operator_log.task(id).event('Ready')
+
+            session.commit()
+
+    def _register_added_tasks(self, core: Core, session: Session) -> list[str]:
+        added = core.dependency_index.pop_added()
+        if len(added) == 0:
+            return []
+
+        dependency_ids = list(set(id for _, dependencies in added for id in dependencies.values()))
+        id_to_finished = {}
+        for chunk_start in range(0, len(dependency_ids), 500):
+            for status in session.execute(
                 select(Job.id, Job.finished)
-                .where(Job.id.in_(dependency_ids))
-            ))
-            id_to_finished = {status.id: status.finished for status in dependency_status}
-
-            for task in dependent_tasks:
-                set_ready = True
-                for id in task.dependencies.values():
-                    if id not in id_to_finished:
-                        core.close_job(
-                            session,
-                            core.get_job_by_id(session, task.id),
-                            f"id {id} is required by this task but is absent"
-                        )
-                    elif not id_to_finished[id]:
-                        set_ready = False
-                        break
-                if set_ready:
-                    task_obj = core.get_job_by_id(session, task.id)
-                    task_obj.ready = True
-                    task_obj.ready_timestamp = datetime.now()
-                    core.operator_log.task(task_obj.id).event('Ready')
-
-
-            session.commit()
\ No newline at end of file
+                .where(Job.id.in_(dependency_ids[chunk_start:chunk_start+500]))
+            ):
+                id_to_finished[status.id] = status.finished
+
+        ready_ids = []
+        for task_id, dependencies in added:
+            absent = [id for id in dependencies.values() if id not in id_to_finished]
+            if len(absent) > 0:
+                core.close_job(
+                    session,
+                    core.get_job_by_id(session, task_id),
+                    f"id {absent[0]} is required by this task but is absent"
+                )
+                continue
+            remaining = [id for id in dependencies.values() if not id_to_finished[id]]
+            if core.dependency_index.register(task_id, remaining):
+                ready_ids.append(task_id)
+        return ready_ids
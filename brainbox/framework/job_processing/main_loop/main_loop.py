@@ -1,4 +1,3 @@
-import time
 import traceback
 
 from ..core import Core, OperatorStateForPlanner
@@ -7,31 +6,42 @@ from .remove_incorrect_action import RemoveIncorrectJobsAction
 from .tasks_for_planner_sync import TaskForPlannerSync
 from .task_status_updater import TasksStatusUpdater
 from .cancel_action import CancelAction
-from ..planner import IPlanner, PlannerArguments
+from ..planner import IPlanner, PlannerArguments, AssignAction
 from ...job_processing.planner.stop_action import StopCommand
 
 class MainLoop:
     def __init__(self,
                  core: Core,
                  planner: IPlanner,
-                 stop_containers_at_termination: bool = True
+                 stop_containers_at_termination: bool = True,
+                 idle_timeout_in_seconds: float = 1
                  ):
         self.core = core
         self.planner = planner
         self._terminate_request: bool = False
+        self._full_iteration_request: bool = False
         self.stop_containers_at_termination = stop_containers_at_termination
+        self.idle_timeout_in_seconds = idle_timeout_in_seconds
+        self._failed_operators_seen_by_planner: set[str] = set()
 
     def run(self):
+        self.core.notify()
         while True:
+            woken_up = self.core.wake_up_event.wait(self.idle_timeout_in_seconds)
+            self.core.wake_up_event.clear()
             if self._terminate_request:
                 break
             try:
-                self.one_iteration()
+                if woken_up or self._full_iteration_request:
+                    self._full_iteration_request = False
+                    self.one_iteration()
+                else:
+                    self.idle_iteration()
             except:
+                self._full_iteration_request = True
                 message = traceback.format_exc()
                 self.core.operator_log.core().error(traceback.format_exc())
                 print(message)
-            time.sleep(0.1)
         if self.stop_containers_at_termination:
             for state in list(self.core.operator_states.values()):
                 try:
@@ -43,11 +53,14 @@ class MainLoop:
 
     def terminate(self):
         self._terminate_request = True
+        self.core.notify()
 
-
+    def notify(self):
+        self.core.notify()
 
     def cancel(self, job_id: str|None = None, batch_id: str|None = None):
         CancelAction(job_id, batch_id).apply(self.core)
+        self.core.notify()
 
 
     def one_iteration(self):
@@ -55,14 +68,56 @@ class MainLoop:
         TasksStatusUpdater().apply(self.core)
         CheckReadyAction().apply(self.core)
         TaskForPlannerSync().apply(self.core)
+        self._apply_planner()
+
+    def idle_iteration(self):
+        # Nothing was added, cancelled or reported by operators since the last iteration, so the database is unchanged.
+        # Only the planner runs, over the cached jobs, to handle time-dependent decisions such as cooldowns.
+        if self.core.jobs_for_planner is None:
+            return
+        self._apply_planner()
+
+    def _stop_failed_operators(self):
+        # The operator that failed to warm up is stopped only after one planner run has seen it,
+        # so the jobs waiting for its decider are assigned to it and fail, instead of restarting it again and again
+        to_stop = [id for id in self._failed_operators_seen_by_planner if id in self.core.operator_states]
+        if len(to_stop) > 0:
+            # The operator fails the jobs still in its queue before exiting, and these errors are written before its queues are gone
+            for instance_id in to_stop:
+                state = self.core.operator_states[instance_id]
+                self.core.operator_log.decider(state.key).event("Stopping after the failed warm-up")
+                state.exit_request = True
+                state.operator_thread.join()
+            TasksStatusUpdater().apply(self.core)
+            TaskForPlannerSync().apply(self.core)
+            for instance_id in to_stop:
+                StopCommand(instance_id).apply(self.core)
+        self._failed_operators_seen_by_planner = set(
+            instance_id for instance_id, state in self.core.operator_states.items() if state.warm_up_error is not None
+        )
 
-        for action in self._run_planner():
+    def _apply_planner(self):
+        self._stop_failed_operators()
+        actions = self._run_planner()
+        assignments = []
+        for action in actions:
+            # Consecutive assignments are claimed together, the other actions keep their order
+            if isinstance(action, AssignAction):
+                assignments.append(action)
+                continue
+            if len(assignments) > 0:
+                AssignAction.apply_batch(self.core, assignments)
+                assignments = []
             action.apply(self.core)
+        if len(assignments) > 0:
+            AssignAction.apply_batch(self.core, assignments)
+        if len(actions) > 0:
+            self.core.notify()
 
 
     def _run_planner(self):
         states_for_planner = tuple(
-            OperatorStateForPlanner(instance_id, state.key, state.busy, state.not_busy_since)
+            OperatorStateForPlanner(instance_id, state.key, state.busy, state.not_busy_since, state.api.get_max_batch_size())
             for instance_id, state
             in self.core.operator_states.items()
         )
@@ -70,9 +125,17 @@ class MainLoop:
         planner_arguments = PlannerArguments(
             tuple(job for job in self.core.jobs_for_planner),
             states_for_planner,
-            self.core.operator_log.planer()
+            self.core.operator_log.planer(),
+            self._get_resource_costs(states_for_planner),
+            self.core.duration_estimates,
+            self.core.upcoming_jobs_for_planner
         )
 
         return self.planner.plan(planner_arguments)
 
-
+    def _get_resource_costs(self, states_for_planner):
+        names = set(job.decider for job in self.core.jobs_for_planner)
+        names.update(key.decider_name for key in self.core.upcoming_jobs_for_planner)
+        names.update(state.key.decider_name for state in states_for_planner)
+        names.intersection_update(self.core.registry.get_deciders_names())
+        return {name: self.core.registry.get_controller(name).get_resource_cost() for name in names}
@@ -1,5 +1,6 @@
-from ..core import Core, ICoreAction, OperatorMessage, Job
-from sqlalchemy.orm import Session
+from ..core import Core, ICoreAction, OperatorMessage, Job, JobLog, JobChunk, JobPayload
+from sqlalchemy import update, insert, select
+
 
 class TasksStatusUpdater(ICoreAction):
     def apply(self, core: Core):
@@ -8,45 +9,106 @@ class TasksStatusUpdater(ICoreAction):
             while not operator_state.results_queue.empty():
                 updates.append(operator_state.results_queue.get())
 
+        if not core.duration_estimates.initialized:
+            with core.new_session() as session:
+                core.duration_estimates.load_history(session)
+
         if len(updates) == 0:
             return
 
-        id_to_job = {}
+        type_to_rows = {type: {} for type in OperatorMessage.Type}
+        payload_rows = {}
+        log_rows = []
+        chunk_rows = []
+        for update_message in updates:
+            if update_message.type == OperatorMessage.Type.log:
+                log_rows.append(dict(
+                    job_id=update_message.id,
+                    timestamp=update_message.timestamp,
+                    payload=update_message.payload
+                ))
+            elif update_message.type == OperatorMessage.Type.partial_result:
+                chunk_rows.append(dict(
+                    job_id=update_message.id,
+                    timestamp=update_message.timestamp,
+                    payload=update_message.payload
+                ))
+            else:
+                # Only the last message of each type is kept per job, so a stream of progress reports
+                # turns into a single row update
+                type_to_rows[update_message.type][update_message.id] = self._to_row(update_message)
+                if update_message.type == OperatorMessage.Type.result:
+                    payload_rows[update_message.id] = dict(id=update_message.id, result=update_message.payload)
+
         with core.new_session() as session:
-            for update in updates:
-                if update.id not in id_to_job:
-                    id_to_job[update.id] = core.get_job_by_id(session, update.id)
-                self._apply_update(core, update, id_to_job[update.id])
+            for type in OperatorMessage.Type:
+                rows = list(type_to_rows[type].values())
+                if len(rows) > 0:
+                    session.execute(update(Job), rows)
+            if len(payload_rows) > 0:
+                session.execute(update(JobPayload), list(payload_rows.values()))
+            if len(log_rows) > 0:
+                session.execute(insert(JobLog), log_rows)
+            if len(chunk_rows) > 0:
+                session.execute(insert(JobChunk), chunk_rows)
             session.commit()
 
-        changes = core.new_session.changes.all
+            succeeded_ids = list(type_to_rows[OperatorMessage.Type.result])
+            if len(succeeded_ids) > 0:
+                for row in session.execute(
+                    select(Job.decider, Job.decider_parameter, Job.method, Job.accepted_timestamp, Job.finished_timestamp)
+                    .where(Job.id.in_(succeeded_ids) & Job.accepted_timestamp.isnot(None))
+                ):
+                    core.duration_estimates.on_job_processed(
+                        row.decider,
+                        row.decider_parameter,
+                        row.method,
+                        (row.finished_timestamp - row.accepted_timestamp).total_seconds()
+                    )
+
+        if core.result_cache is not None and len(payload_rows) > 0:
+            core.result_cache.on_jobs_succeeded({id: row['result'] for id, row in payload_rows.items()})
+
+        changed_ids = set(id for rows in type_to_rows.values() for id in rows)
+        core.new_session.changes.modified.extend(changed_ids)
 
+        if len(chunk_rows) > 0:
+            core.on_partial_results(set(row['job_id'] for row in chunk_rows))
+        core.on_jobs_finished(
+            list(type_to_rows[OperatorMessage.Type.result]) + list(type_to_rows[OperatorMessage.Type.error])
+        )
 
-    def _apply_update(self, core, update: OperatorMessage, job: Job):
+
+    def _to_row(self, update: OperatorMessage) -> dict:
         if update.type == OperatorMessage.Type.accepted:
-            job.accepted = True
-            job.accepted_timestamp = update.timestamp
+            return dict(
+                id=update.id,
+                accepted=True,
+                accepted_timestamp=update.timestamp
+            )
 
         elif update.type == OperatorMessage.Type.error:
-            job.error = update.payload
-            job.finished = True
-            job.success = False
-            job.finished_timestamp = update.timestamp
+            return dict(
+                id=update.id,
+                error=update.payload,
+                finished=True,
+                success=False,
+                finished_timestamp=update.timestamp
+            )
 
         elif update.type == OperatorMessage.Type.result:
-            job.result = update.payload
-            job.success = True
-            job.finished = True
-            job.finished_timestamp = update.timestamp
+            return dict(
+                id=update.id,
+                success=True,
+                finished=True,
+                finished_timestamp=update.timestamp
+            )
 
         elif update.type == OperatorMessage.Type.report_progress:
-            job.progress = update.payload
-
-        elif update.type == OperatorMessage.Type.log:
-            job.log.append(update.payload)
+            return dict(
+                id=update.id,
+                progress=update.payload
+            )
 
         else:
             raise ValueError(f"Unknown update type {update.type}")
-
-
-
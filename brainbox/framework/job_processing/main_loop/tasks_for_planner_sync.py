@@ -1,5 +1,5 @@
-from ..core import Core, ICoreAction, JobForPlanner, Job
-from sqlalchemy import select
+from ..core import Core, ICoreAction, JobForPlanner, Job, DeciderInstanceKey
+from sqlalchemy import select, func
 from datetime import datetime
 
 
@@ -22,6 +22,7 @@ class TaskForPlannerSync(ICoreAction):
 
     def apply(self, core: Core):
         with core.new_session() as session:
+            core.upcoming_jobs_for_planner = self._get_upcoming_counts(session)
             if self.should_do_full_update(core):
                 self.last_time_full_update = datetime.now()
                 core.jobs_for_planner = self._get_tasks(session)
@@ -38,6 +39,15 @@ class TaskForPlannerSync(ICoreAction):
 
 
 
+    def _get_upcoming_counts(self, session) -> dict[DeciderInstanceKey, int]:
+        # The jobs still waiting for their dependencies are only counted, which is enough for planners to pre-start deciders
+        rows = session.execute(
+            select(Job.decider, Job.decider_parameter, func.count())
+            .where(~Job.finished & ~Job.ready)
+            .group_by(Job.decider, Job.decider_parameter)
+        )
+        return {DeciderInstanceKey(decider, parameter): count for decider, parameter, count in rows}
+
     def _get_tasks(self, session, skip_for_ids: None|set = None):
         condition = ~Job.finished & Job.ready
         if skip_for_ids is not None:
@@ -49,7 +59,8 @@ class TaskForPlannerSync(ICoreAction):
                 Job.decider_parameter,
                 Job.received_timestamp,
                 Job.assigned,
-                Job.ordering_token
+                Job.ordering_token,
+                Job.method
             )
             .where(condition)
         ))
@@ -1,14 +1,36 @@
-from ...common import Logger
+from ...common import Logger, CacheStore
 from ..core import OperatorMessage
+from .file_postprocessor import file_postprocess
 from queue import Queue
 
 class DeciderLogger(Logger):
-    def __init__(self, id: str, queue: Queue[OperatorMessage]):
+    def __init__(self, id: str, queue: Queue[OperatorMessage], cache_store: CacheStore):
         self.id = id
         self.queue = queue
+        self.cache_store = cache_store
 
     def report_progress(self, progress: float):
         self.queue.put(OperatorMessage(self.id, OperatorMessage.Type.report_progress, progress))
 
     def log(self, s):
         self.queue.put(OperatorMessage(self.id, OperatorMessage.Type.log, s))
+
+    def partial_result(self, chunk):
+        chunk = file_postprocess(chunk, self.cache_store, self.id)
+        self.queue.put(OperatorMessage(self.id, OperatorMessage.Type.partial_result, chunk))
+
+
+class BatchDeciderLogger(Logger):
+    def __init__(self, ids: tuple[str,...], queue: Queue[OperatorMessage], cache_store: CacheStore):
+        self.loggers = tuple(DeciderLogger(id, queue, cache_store) for id in ids)
+
+    def report_progress(self, progress: float):
+        for logger in self.loggers:
+            logger.report_progress(progress)
+
+    def log(self, s):
+        for logger in self.loggers:
+            logger.log(s)
+
+    def partial_result(self, chunk):
+        raise ValueError("Partial results cannot be attributed to a single job when jobs are processed in a batch")
@@ -1,24 +1,30 @@
-from pathlib import Path
-from ...common import File
+from ...common import File, CacheStore
 
-def _dump(file, cache_folder: Path):
+def _dump(file, cache_store: CacheStore, names: list[str]):
     if isinstance(file, File):
-        with open(cache_folder / file.name, 'wb') as stream:
-            stream.write(file.content)
-            file.content = None
+        cache_store.put_bytes(file.name, file.content)
+        file.content = None
+        names.append(file.name)
         return file.name
     else:
+        if isinstance(file, str) and cache_store.contains(file):
+            names.append(file)
         return file
 
 
-def file_postprocess(obj, cache_folder: Path):
-    if isinstance(obj, File):
-        return _dump(obj, cache_folder)
-    elif isinstance(obj, tuple):
-        return tuple(_dump(f, cache_folder) for f in obj)
+def _dump_all(obj, cache_store: CacheStore, names: list[str]):
+    if isinstance(obj, tuple):
+        return tuple(_dump(f, cache_store, names) for f in obj)
     elif isinstance(obj, list):
-        return [_dump(f, cache_folder) for f in obj]
+        return [_dump(f, cache_store, names) for f in obj]
     elif isinstance(obj, dict):
-        return {key: _dump(value, cache_folder) for key, value in obj.items()}
+        return {key: _dump(value, cache_store, names) for key, value in obj.items()}
     else:
-        return obj
\ No newline at end of file
+        return _dump(obj, cache_store, names)
+
+
+def file_postprocess(obj, cache_store: CacheStore, owner: str):
+    names = []
+    result = _dump_all(obj, cache_store, names)
+    cache_store.add_references(owner, names)
+    return result
@@ -1,7 +1,7 @@
-from ..core import OperatorMessage, OperatorState
+from ..core import OperatorMessage, OperatorState, Job
 import traceback
 from datetime import datetime
-from .decider_log import DeciderLogger
+from .decider_log import DeciderLogger, BatchDeciderLogger
 from ...common import IDecider, DeciderContext, File, Locator
 from .file_postprocessor import file_postprocess
 import time
@@ -11,8 +11,12 @@ class DeciderOperator:
     def __init__(self, state: OperatorState):
         self.state = state
         self.current_id: str|None = None
+        self.pending: list[Job] = []
 
     def cycle(self):
+        if not self.warm_up():
+            self.fail_until_exit()
+            return
         self.state.logger.decider(self.state.key).event("Starting processing cycle")
         while True:
             if self.state.exit_request:
@@ -22,9 +26,41 @@ class DeciderOperator:
                 time.sleep(0.01)
         self.state.logger.decider(self.state.key).event("Exiting processing cycle")
 
+    def warm_up(self):
+        if self.state.warm_up is not None:
+            self.state.logger.decider(self.state.key).event("Warming up")
+            try:
+                self.state.warm_up()
+            except:
+                self.state.logger.decider(self.state.key).error(traceback.format_exc(), 'Warm-up failed')
+                # The warm-up is over, so the planners no longer count this operator as warming up
+                self.state.busy = False
+                self.state.not_busy_since = datetime.now()
+                self.state.warm_up_error = f"Decider {self.state.key} failed to warm up:\n" + traceback.format_exc()
+                return False
+            self.state.logger.decider(self.state.key).event("Ready")
+        self.state.busy = False
+        self.state.not_busy_since = datetime.now()
+        return True
+
+    def fail_until_exit(self):
+        # The main loop stops the operator that failed to warm up; the jobs assigned to it until then fail
+        while True:
+            exiting = self.state.exit_request
+            while not self.state.jobs_queue.empty():
+                job = self.state.jobs_queue.get()
+                self.state.results_queue.put(OperatorMessage(job.id, OperatorMessage.Type.error, self.state.warm_up_error))
+                self.state.logger.task(job.id).event('Finished with a failure')
+            if exiting:
+                break
+            time.sleep(0.01)
+
 
     def next_task(self):
-        if self.state.jobs_queue.empty():
+        while not self.state.jobs_queue.empty():
+            self.pending.append(self.state.jobs_queue.get())
+
+        if len(self.pending) == 0:
             if self.state.busy:
                 self.state.busy = False
                 self.state.not_busy_since = datetime.now()
@@ -35,41 +71,65 @@ class DeciderOperator:
             self.state.busy = True
             self.state.logger.decider(self.state.key).event('Busy')
 
-        job = self.state.jobs_queue.get()
-        self.current_id = job.id
-        self.state.logger.decider(self.state.key).event(f'Processing task {self.current_id}')
-        self.state.results_queue.put(OperatorMessage(self.current_id, OperatorMessage.Type.accepted))
-        self.state.logger.task(self.current_id).event('Accepted')
-
-        method = job.method
-        arguments = job.arguments
+        jobs = self._take_batch()
+        for job in jobs:
+            self.state.logger.decider(self.state.key).event(f'Processing task {job.id}')
+            self.state.results_queue.put(OperatorMessage(job.id, OperatorMessage.Type.accepted))
+            self.state.logger.task(job.id).event('Accepted')
+        self.current_id = jobs[0].id
 
+        method = jobs[0].method
 
         try:
             decider = self.state.api
             decider.context._current_job_id = self.current_id
-            decider.context._logger = DeciderLogger(self.current_id, self.state.results_queue)
-
-
-
-            if method is not None:
-                method_instance = getattr(decider, method)
-            elif callable(decider):
-                method_instance = decider
+            if len(jobs) == 1:
+                decider.context._current_batch_ids = None
+                decider.context._logger = DeciderLogger(self.current_id, self.state.results_queue, decider.context.cache_store)
             else:
-                raise ValueError(f'Method is not set for {self.state.key.decider_name}, and the decider is not callable')
-
-            result = method_instance(**arguments)
-
-            result = file_postprocess(result, decider.cache_folder)
-
-            self.state.results_queue.put(OperatorMessage(self.current_id, OperatorMessage.Type.result, result))
-            self.state.logger.task(self.current_id).event('Finished with a success')
+                decider.context._current_batch_ids = tuple(job.id for job in jobs)
+                decider.context._logger = BatchDeciderLogger(
+                    decider.context._current_batch_ids, self.state.results_queue, decider.context.cache_store
+                )
+
+            if len(jobs) > 1:
+                results = decider.run_batch(method, [job.arguments for job in jobs])
+                if len(results) != len(jobs):
+                    raise ValueError(f'Decider {self.state.key} returned {len(results)} results for a batch of {len(jobs)} jobs')
+            else:
+                if method is not None:
+                    method_instance = getattr(decider, method)
+                elif callable(decider):
+                    method_instance = decider
+                else:
+                    raise ValueError(f'Method is not set for {self.state.key.decider_name}, and the decider is not callable')
+                results = [method_instance(**jobs[0].arguments)]
+
+            for job, result in zip(jobs, results):
+                result = file_postprocess(result, decider.context.cache_store, job.id)
+                self.state.results_queue.put(OperatorMessage(job.id, OperatorMessage.Type.result, result))
+                self.state.logger.task(job.id).event('Finished with a success')
             return True
         except:
             msg = f"Error when executing job {self.current_id} for decider {self.state.key}\n" + traceback.format_exc()
-            self.state.results_queue.put(OperatorMessage(self.current_id, OperatorMessage.Type.error, msg))
-            self.state.logger.task(self.current_id).event('Finished with a failure')
+            for job in jobs:
+                self.state.results_queue.put(OperatorMessage(job.id, OperatorMessage.Type.error, msg))
+                self.state.logger.task(job.id).event('Finished with a failure')
             return False
         finally:
             self.current_id = None
+
+    def _take_batch(self) -> list[Job]:
+        first = self.pending.pop(0)
+        max_batch_size = self.state.api.get_max_batch_size()
+        if max_batch_size <= 1:
+            return [first]
+        batch = [first]
+        rest = []
+        for job in self.pending:
+            if len(batch) < max_batch_size and job.method == first.method and job.ordering_token == first.ordering_token:
+                batch.append(job)
+            else:
+                rest.append(job)
+        self.pending = rest
+        return batch
@@ -2,8 +2,8 @@ from dataclasses import dataclass
 from ..core import DeciderInstanceKey, Core, Job
 from .planner_action import IPlannerAction
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from datetime import datetime
-import copy
 
 @dataclass
 class FailedJobArgument:
@@ -16,40 +16,59 @@ class AssignAction(IPlannerAction):
     key: DeciderInstanceKey
 
     def apply(self, core: Core):
+        AssignAction.apply_batch(core, [self])
+
+    @staticmethod
+    def apply_batch(core: Core, actions: list['AssignAction']):
+        # All the jobs of the batch are claimed with one query; with PostgresJobStore the rows locked
+        # by another assigner are skipped, and stay unassigned until a later planning round
+        id_to_action = {action.job_id: action for action in actions}
         with core.new_session() as session:
-            job = core.get_job_by_id(session, self.job_id)
-            if job.finished:
-                return
-            arguments = job.arguments
-            if job.dependencies is not None:
-                requirements = list(job.dependencies.values())
-                requirement_to_result = {}
-                for element in session.scalars(select(Job).where(Job.id.in_(requirements))):
-                    if element.success:
-                        requirement_to_result[element.id] = element.result
-                    else:
-                        session.expunge(element)
-                        requirement_to_result[element.id] = FailedJobArgument(element)
+            jobs = core.store.claim_for_assignment(session, list(id_to_action))
+            skipped = set(id_to_action) - set(job.id for job in jobs)
+            for id in skipped:
+                core.operator_log.task(id).event('Assignment skipped: the job is finished, assigned or claimed by another assigner')
+            for job in jobs:
+                id_to_action[job.id]._assign(core, session, job)
+            session.commit()
+        if len(skipped) > 0:
+            core.notify()
 
-                for arg_name, id in job.dependencies.items():
-                    if id not in requirement_to_result:
-                        core.close_job(
-                            session,
-                            job,
-                            f'Something is wrong: task was ready, but dependency {id} for argument {arg_name} was not found'
-                        )
-                        return
-                    if isinstance(arg_name, str) and len(arg_name) > 0 and arg_name[0] != '*':
-                        arguments[arg_name] = requirement_to_result[id]
+    def _assign(self, core: Core, session, job: Job):
+        arguments = job.arguments
+        if job.dependencies is not None:
+            requirements = list(job.dependencies.values())
+            requirement_to_result = {}
+            for element in session.scalars(select(Job).where(Job.id.in_(requirements)).options(selectinload(Job.payload))):
+                if element.success:
+                    requirement_to_result[element.id] = element.result
+                else:
+                    session.expunge(element)
+                    requirement_to_result[element.id] = FailedJobArgument(element)
 
-            try:
-                job_clone = copy.copy(job)
-                core.operator_states[self.instance_id].jobs_queue.put(job_clone)
-                job.assigned = True
-                job.assigned_timestamp = datetime.now()
-                core.operator_log.task(self.job_id).event('Assigned')
-            except:
-                core.close_job(session, job, "Assignment failed")
+            for arg_name, id in job.dependencies.items():
+                if id not in requirement_to_result:
+                    core.close_job(
+                        session,
+                        job,
+                        f'Something is wrong: task was ready, but dependency {id} for argument {arg_name} was not found'
+                    )
+                    return
+                if isinstance(arg_name, str) and len(arg_name) > 0 and arg_name[0] != '*':
+                    arguments[arg_name] = requirement_to_result[id]
 
-            finally:
-                session.commit()
\ No newline at end of file
+        try:
+            job_clone = Job(
+                id=job.id,
+                decider=job.decider,
+                decider_parameter=job.decider_parameter,
+                method=job.method,
+                ordering_token=job.ordering_token,
+                arguments=arguments
+            )
+            core.operator_states[self.instance_id].jobs_queue.put(job_clone)
+            job.assigned = True
+            job.assigned_timestamp = datetime.now()
+            core.operator_log.task(self.job_id).event('Assigned')
+        except:
+            core.close_job(session, job, "Assignment failed")
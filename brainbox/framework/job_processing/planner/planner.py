@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from ..core import JobForPlanner, OperatorStateForPlanner, OperatorLogHandle, OperatorLogItem
+from ..core import JobForPlanner, OperatorStateForPlanner, OperatorLogHandle, OperatorLogItem, DurationEstimates, DeciderInstanceKey
 from .planner_action import IPlannerAction
+from ...controllers.controller import ResourceCost
 
 
 
@@ -12,6 +13,9 @@ class PlannerArguments:
     non_finished_tasks: tuple[JobForPlanner,...]
     deciders: tuple[OperatorStateForPlanner,...]
     log_handler: OperatorLogHandle = field(default_factory=lambda:OperatorLogHandle(None,OperatorLogItem.Level.Planer,None))
+    resource_costs: dict[str, ResourceCost] = field(default_factory=dict)
+    duration_estimates: DurationEstimates = field(default_factory=DurationEstimates)
+    upcoming_tasks: dict[DeciderInstanceKey, int] = field(default_factory=dict)
 
 
 class IPlanner(ABC):
@@ -3,10 +3,13 @@ from ..core import DeciderInstanceKey, Core, OperatorState, Job
 from ..operator import DeciderOperator
 from threading import Thread
 from ...common import IDecider
+from ...controllers.controller import ISingleLoadableModelApi
 from sqlalchemy import select
 import traceback
 from dataclasses import dataclass
 from enum import Enum
+from datetime import datetime
+import time
 
 @dataclass
 class StartCommand(IPlannerAction):
@@ -17,13 +20,32 @@ class StartCommand(IPlannerAction):
 
     key: DeciderInstanceKey
     mode: 'StartCommand.Mode'
-
+    warm_up_model: str|None = None
+    readiness_timeout_in_seconds: float = 600
+    # A speculative start is made before any job needs the decider, so its failure fails no jobs
+    speculative: bool = False
 
     def _start(self, controller):
         instance_id = controller.run(self.key.parameter)
         api: IDecider = controller.find_api(instance_id)
         return instance_id, api
 
+    def _warm_up(self, controller, instance_id: str, api: IDecider, state: OperatorState, core: Core, begin: datetime):
+        # Runs in the operator thread before it accepts jobs, so the main loop is not blocked by the model loading.
+        # The model is loaded before the first job arrives, so the jobs don't wait for the cold load one by one
+        if self.warm_up_model is not None:
+            if not isinstance(api, ISingleLoadableModelApi):
+                raise ValueError(f"Decider {self.key} cannot preload the model {self.warm_up_model}, as it is not ISingleLoadableModelApi")
+            if api.get_loaded_model_name() != self.warm_up_model:
+                api.load_model(self.warm_up_model)
+        while not controller.is_ready(instance_id, self.warm_up_model):
+            if state.exit_request:
+                raise ValueError(f"Decider {self.key} was stopped before it was ready")
+            if (datetime.now() - begin).total_seconds() > self.readiness_timeout_in_seconds:
+                raise ValueError(f"Decider {self.key} was not ready within {self.readiness_timeout_in_seconds} seconds")
+            time.sleep(0.1)
+        core.duration_estimates.on_decider_started(self.key, (datetime.now() - begin).total_seconds())
+
     def _use_existing_or_start(self, controller):
         instances = controller.get_running_instances_id_to_parameter()
         instance_id = None
@@ -49,19 +71,26 @@ class StartCommand(IPlannerAction):
         core.operator_log.decider(self.key).event(f"Setting up container in the mode {self.mode.name}")
         try:
             controller = core.registry.get_controller(self.key.decider_name)
+            begin = datetime.now()
             if self.mode == StartCommand.Mode.StartOnly:
                 instance_id, api = self._start(controller)
             else:
                 instance_id, api = self._use_existing_or_start(controller)
 
             api.context._cache_folder = core.locator.cache_folder
+            api.context._cache_store = core.cache_store
             op_state = OperatorState(
                 self.key,
                 controller,
                 instance_id,
                 api,
                 core.operator_log,
+                # The decider is busy while it warms up, so it is neither stopped after the cooldown nor evicted meanwhile
+                busy=True,
+                not_busy_since=datetime.now(),
+                results_queue=core.create_results_queue()
             )
+            op_state.warm_up = lambda: self._warm_up(controller, instance_id, api, op_state, core, begin)
             operator = DeciderOperator(op_state)
             thread = Thread(target=operator.cycle)
             op_state.operator_thread = thread
@@ -70,6 +99,9 @@ class StartCommand(IPlannerAction):
             core.operator_log.decider(self.key).event("Initialized")
         except:
             core.operator_log.decider(self.key).event("Initialization failed")
+            if self.speculative:
+                core.operator_log.decider(self.key).error(traceback.format_exc())
+                return
             with core.new_session() as session:
                 tasks: list[Job] = list(session.scalars(
                     select(Job)
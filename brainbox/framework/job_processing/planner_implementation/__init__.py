@@ -1,2 +1,4 @@
 from .always_on_planner import AlwaysOnPlanner
-from .simple_planner import SimplePlanner
\ No newline at end of file
+from .simple_planner import SimplePlanner
+from .resource_aware_planner import ResourceAwarePlanner
+from .cost_model_planner import CostModelPlanner
@@ -0,0 +1,28 @@
+from ..planner import PlannerArguments, StartCommand
+from .simple_planner import SimplePlanner
+
+
+class CostModelPlanner(SimplePlanner):
+    def _get_tasks_in_first_ordering_group(self, args: PlannerArguments):
+        # The cost only decides within the lowest pending ordering_token; the tasks without a token are not ordered
+        tokens = [task.ordering_token for task in args.non_finished_tasks if task.ordering_token is not None]
+        if len(tokens) == 0:
+            return args.non_finished_tasks
+        first_token = min(tokens)
+        keys = set(
+            task.get_decider_instance_key()
+            for task in args.non_finished_tasks
+            if task.ordering_token is None or task.ordering_token == first_token
+        )
+        return [task for task in args.non_finished_tasks if task.get_decider_instance_key() in keys]
+
+    def _choose_next_decider_to_activate(self, args: PlannerArguments):
+        estimates = args.duration_estimates.estimate_queue(self._get_tasks_in_first_ordering_group(args))
+        if len(estimates) == 0:
+            return []
+        best = estimates[0]
+        args.log_handler.event(
+            f"No active services, starting {best.key}: {best.tasks_count} tasks, "
+            f"expected {best.total_in_seconds:.1f} seconds including {best.startup_in_seconds:.1f} seconds of startup"
+        )
+        return [StartCommand(best.key, StartCommand.Mode.StartOnly)]
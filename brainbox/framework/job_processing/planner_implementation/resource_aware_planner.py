@@ -0,0 +1,180 @@
+from typing import *
+from ..planner import IPlanner, PlannerArguments, StartCommand, StopCommand, AssignAction, IPlannerAction
+from ..core import DeciderInstanceKey, OperatorStateForPlanner, JobForPlanner
+from ...controllers.controller import ResourceCost
+from yo_fluq import *
+from datetime import datetime
+from dataclasses import dataclass
+
+
+class ResourceAwarePlanner(IPlanner):
+    @dataclass
+    class WarmPoolEntry:
+        decider: str
+        parameter: str|None = None
+        model: str|None = None
+
+        def get_key(self) -> DeciderInstanceKey:
+            return DeciderInstanceKey(self.decider, self.parameter)
+
+    def __init__(self,
+                 limits: ResourceCost,
+                 max_assigned_per_decider: int = 2,
+                 cooldown_delay_in_seconds: int|None = 60*30,
+                 datetime_factory: Optional[Callable[[], datetime]] = datetime.now,
+                 warm_pool: Iterable['ResourceAwarePlanner.WarmPoolEntry'] = (),
+                 prestart_for_upcoming_tasks: bool = True,
+                 prestart_retry_delay_in_seconds: float = 60
+                 ):
+        self.limits = limits
+        self.max_assigned_per_decider = max_assigned_per_decider
+        self.cooldown_delay_in_seconds = cooldown_delay_in_seconds
+        self.datetime_factory = datetime_factory
+        self.has_cooldown_delay = self.cooldown_delay_in_seconds is not None and self.datetime_factory is not None
+        self.warm_pool = {entry.get_key(): entry for entry in warm_pool}
+        self.prestart_for_upcoming_tasks = prestart_for_upcoming_tasks
+        self.prestart_retry_delay_in_seconds = prestart_retry_delay_in_seconds
+        self._prestart_timestamps: dict[DeciderInstanceKey, datetime] = {}
+
+    def _get_cost(self, args: PlannerArguments, key: DeciderInstanceKey) -> ResourceCost:
+        return args.resource_costs.get(key.decider_name, ResourceCost())
+
+    def _cooldown_passed(self, state: OperatorStateForPlanner) -> bool:
+        if not self.has_cooldown_delay:
+            return True
+        if state.not_busy_since is None:
+            return False
+        delta = (self.datetime_factory() - state.not_busy_since).total_seconds()
+        return delta >= self.cooldown_delay_in_seconds
+
+    def _assign(self, state: OperatorStateForPlanner, tasks: list[JobForPlanner], args: PlannerArguments) -> list[IPlannerAction]:
+        assigned_count = len([task for task in tasks if task.assigned])
+        free_slots = self.max_assigned_per_decider*state.max_batch_size - assigned_count
+        if free_slots <= 0:
+            return []
+        next_tasks = (
+            Query
+            .en(tasks)
+            .where(lambda z: not z.assigned)
+            .order_by(lambda z: z.ordering_token)
+            .then_by(lambda z: z.received_timestamp)
+            .take(free_slots)
+            .to_list()
+        )
+        for task in next_tasks:
+            args.log_handler.event(f'Assigning task {task.id} to {state.key}')
+        return [AssignAction(task.id, state.instance_id, state.key) for task in next_tasks]
+
+    def plan(self, args: PlannerArguments) -> list[IPlannerAction]:
+        key_to_tasks: dict[DeciderInstanceKey, list[JobForPlanner]] = {}
+        for task in args.non_finished_tasks:
+            key_to_tasks.setdefault(task.get_decider_instance_key(), []).append(task)
+
+        result = []
+        used = ResourceCost()
+        working_count = 0
+        active_keys = set()
+        idle: list[OperatorStateForPlanner] = []
+        for state in args.deciders:
+            active_keys.add(state.key)
+            tasks = key_to_tasks.get(state.key, [])
+            if len(tasks) > 0:
+                result.extend(self._assign(state, tasks, args))
+                used += self._get_cost(args, state.key)
+                working_count += 1
+            elif state.key in self.warm_pool:
+                # The deciders of the warm pool stay loaded: they are neither stopped after the cooldown nor evicted
+                used += self._get_cost(args, state.key)
+            elif not state.busy and self._cooldown_passed(state):
+                args.log_handler.event(f"No tasks for {state.key}, cooldown time waited, stopping")
+                result.append(StopCommand(state.instance_id))
+            elif state.busy:
+                # Still warming up
+                used += self._get_cost(args, state.key)
+            else:
+                idle.append(state)
+                used += self._get_cost(args, state.key)
+
+        # Least recently used deciders are evicted first; those that have never been busy count as the oldest
+        idle.sort(key=lambda z: (z.not_busy_since is not None, z.not_busy_since or datetime.min, z.instance_id))
+
+        waiting_keys = (
+            Query
+            .en(key_to_tasks.items())
+            .where(lambda z: z[0] not in active_keys)
+            .order_by_descending(lambda z: len(z[1]))
+            .then_by(lambda z: str(z[0]))
+            .select(lambda z: z[0])
+            .to_list()
+        )
+
+        started_keys = set()
+        for key in waiting_keys:
+            cost = self._get_cost(args, key)
+            if not cost.fits_into(self.limits):
+                if working_count > 0:
+                    continue
+                args.log_handler.event(f"{key} exceeds the resource limits, starting it alone")
+                for state in idle:
+                    result.append(StopCommand(state.instance_id))
+                result.append(StartCommand(key, StartCommand.Mode.StartOnly))
+                return result
+
+            # The limits are never subtracted from, since an unspecified limit is unlimited
+            to_evict = []
+            freed = ResourceCost()
+            for state in idle:
+                if (used - freed + cost).fits_into(self.limits):
+                    break
+                to_evict.append(state)
+                freed += self._get_cost(args, state.key)
+            if not (used - freed + cost).fits_into(self.limits):
+                continue
+
+            for state in to_evict:
+                args.log_handler.event(f"Evicting {state.key} to free resources for {key}")
+                result.append(StopCommand(state.instance_id))
+                idle.remove(state)
+            used = used - freed + cost
+            working_count += 1
+            started_keys.add(key)
+            args.log_handler.event(f"Starting {key}")
+            result.append(StartCommand(key, StartCommand.Mode.StartOnly, self._get_warm_up_model(key)))
+
+        result.extend(self._start_speculatively(args, active_keys | started_keys, used))
+        return result
+
+    def _get_warm_up_model(self, key: DeciderInstanceKey) -> str|None:
+        entry = self.warm_pool.get(key)
+        return entry.model if entry is not None else None
+
+    def _start_speculatively(self, args: PlannerArguments, running_keys: set[DeciderInstanceKey], used: ResourceCost) -> list[IPlannerAction]:
+        # The warm pool, and then the deciders of the jobs that wait for their dependencies, are started in the free resources only,
+        # so that the containers are booted and the models are loaded by the time the jobs become ready
+        keys = list(self.warm_pool)
+        if self.prestart_for_upcoming_tasks:
+            keys.extend(
+                Query
+                .en(args.upcoming_tasks.items())
+                .order_by_descending(lambda z: z[1])
+                .then_by(lambda z: str(z[0]))
+                .select(lambda z: z[0])
+            )
+        # A failed pre-start fails no jobs, so it is not retried on every iteration
+        now = (self.datetime_factory or datetime.now)()
+        result = []
+        for key in keys:
+            if key in running_keys:
+                continue
+            last_attempt = self._prestart_timestamps.get(key)
+            if last_attempt is not None and (now - last_attempt).total_seconds() < self.prestart_retry_delay_in_seconds:
+                continue
+            cost = self._get_cost(args, key)
+            if not (used + cost).fits_into(self.limits):
+                continue
+            running_keys.add(key)
+            used += cost
+            self._prestart_timestamps[key] = now
+            args.log_handler.event(f"Pre-starting {key}")
+            result.append(StartCommand(key, StartCommand.Mode.StartOnly, self._get_warm_up_model(key), speculative=True))
+        return result
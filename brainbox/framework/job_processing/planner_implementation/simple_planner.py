@@ -16,6 +16,8 @@ class SimplePlanner(IPlanner):
     def _cooldown_respecting_delay(self, active_service: OperatorStateForPlanner):
         if not self.has_cooldown_delay:
             return [StopCommand(active_service.instance_id)]
+        if active_service.not_busy_since is None:
+            return []
         now = self.datetime_factory()
         delta = (now - active_service.not_busy_since).total_seconds()
         if delta < self.cooldown_delay_in_seconds:
@@ -78,15 +80,16 @@ class SimplePlanner(IPlanner):
                 args.log_handler.event("No tasks, cooldown time waited, stopping")
             return result
 
-        if len(currently_at_active_service) >= 2:
-            return []
-
-        if len(next_for_active_service) == 0:
+        # Batching deciders get enough tasks to form a batch while the previous one is processed
+        free_slots = 2*active_service.max_batch_size - len(currently_at_active_service)
+        if free_slots <= 0:
             return []
 
-        next = next_for_active_service[0]
-        args.log_handler.event(f'Assigning task {next.id}')
-        return [AssignAction(next.id, active_service.instance_id, active_service.key)]
+        result = []
+        for next in next_for_active_service[:min(free_slots, active_service.max_batch_size)]:
+            args.log_handler.event(f'Assigning task {next.id}')
+            result.append(AssignAction(next.id, active_service.instance_id, active_service.key))
+        return result
 
 
 
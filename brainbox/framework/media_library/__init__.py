@@ -1 +1,2 @@
-from .media_library import MediaLibrary
\ No newline at end of file
+from .media_library import MediaLibrary
+from .media_library_archive import MediaLibraryArchive
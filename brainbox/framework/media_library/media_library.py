@@ -9,15 +9,26 @@ import pickle
 from ..common import FileIO
 from copy import deepcopy
 from ..common import File
+from .media_library_archive import MediaLibraryArchive
+from .parallel_map import parallel_map
+from .zip_library_writer import ZipLibraryWriter
 
+import numpy as np
 import pandas as pd
-from yo_fluq import Queryable
 from copy import copy
 
 DESCRIPTION_FILE_NAME = 'description.pkl'
 ERRORS_FILE_NAME = 'errors.pkl'
 
 
+def _appended_file_name(file_name: str, index: int):
+    # Each append to a zip library adds its own description and errors, so the files written earlier are never rewritten
+    if index == 0:
+        return file_name
+    stem, suffix = file_name.split('.')
+    return f'{stem}.{index}.{suffix}'
+
+
 class MediaLibrary:
     @dataclass(frozen=True)
     class Record:
@@ -54,15 +65,40 @@ class MediaLibrary:
             elif self.unpacked:
                 with open(self.holder_location / self.filename, 'rb') as stream:
                     return stream.read()
+            elif MediaLibraryArchive.is_archive(self.holder_location):
+                return MediaLibraryArchive.open(self.holder_location).read(self.filename)
             else:
                 if zip_file is not None:
                     return zip_file.read(self.filename)
                 with zipfile.ZipFile(self.holder_location, 'r', zipfile.ZIP_DEFLATED) as zp:
                     return zp.read(self.filename)
 
+        def get_content_view(self) -> memoryview:
+            # For the uncompressed records of an archive, this is a view of the memory-mapped file, without copying
+            if self.packed and MediaLibraryArchive.is_archive(self.holder_location):
+                return MediaLibraryArchive.open(self.holder_location).read_view(self.filename)
+            return memoryview(self.get_content())
+
         def get_file(self, zip_file=None):
             return File(self.filename, self.get_content(zip_file))
 
+    # The inverted index of one tag: the value of the tag in each record is replaced by its code,
+    # and the positions of the records are grouped by the code
+    @dataclass
+    class TagColumn:
+        value_to_code: dict[Any, int]
+        codes: np.ndarray
+        positions: tuple[np.ndarray, ...]
+
+        def get_positions(self, value) -> np.ndarray:
+            try:
+                code = self.value_to_code.get(value)
+            except TypeError:
+                code = None
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            return self.positions[code]
+
 
     def __init__(self,
                  records: Tuple['MediaLibrary.Record', ...] = (),
@@ -73,6 +109,9 @@ class MediaLibrary:
         self._errors = tuple(errors)
         self._mapping = {r.filename: r for r in self.records}
         self._info = info
+        # The library is immutable, so the columnar representation is built once, on the first request
+        self._tags_frame: pd.DataFrame|None = None
+        self._tag_columns: dict[str, MediaLibrary.TagColumn|None] = {}
 
     @property
     def records(self) -> Tuple[Record,...]:
@@ -108,58 +147,158 @@ class MediaLibrary:
     def __iter__(self):
         yield from self.records
 
-    def enumerate_content(self) -> Iterable[Tuple['MediaLibrary.Record',bytes]]:
+    def enumerate_content(self, max_workers: int = 1) -> Iterable[Tuple['MediaLibrary.Record',bytes]]:
         non_packed = []
         packed = {}
         for record in self.records:
-            if record.packed:
+            if record.packed and not MediaLibraryArchive.is_archive(record.holder_location):
                 if record.holder_location not in packed:
                     packed[record.holder_location] = []
                 packed[record.holder_location].append(record)
             else:
                 non_packed.append(record)
-        for record in non_packed:
-            yield (record, record.get_content())
+        yield from parallel_map(MediaLibrary.Record.get_content, non_packed, max_workers)
         for zp_location, records in packed.items():
             with zipfile.ZipFile(zp_location, 'r', zipfile.ZIP_DEFLATED) as zp:
                 for record in records:
                     yield (record, record.get_content(zp))
 
-    def to_df(self):
-        df = pd.DataFrame([r.tags for r in self.records])
-        for field in ['filename','timestamp','job_id']:
-            df[field] = [getattr(r, field) for r in self.records]
-        return df
-
-
-    def save(self, location: Path, with_progress_bar: bool = False):
-        with zipfile.ZipFile(location, 'w', zipfile.ZIP_DEFLATED) as zp:
-            source = Queryable(self.enumerate_content(), len(self.records))
+    def _get_tags_frame(self) -> pd.DataFrame:
+        if self._tags_frame is None:
+            df = pd.DataFrame([r.tags for r in self.records])
+            for field in ['filename','timestamp','job_id']:
+                df[field] = [getattr(r, field) for r in self.records]
+            self._tags_frame = df
+        return self._tags_frame
+
+    def _get_tag_column(self, tag: str) -> Optional['MediaLibrary.TagColumn']:
+        if tag not in self._tag_columns:
+            column = None
+            values = [r.tags.get(tag, None) for r in self.records]
+            try:
+                codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+            except TypeError:
+                # Unhashable values can't be indexed, and such tags are compared record by record
+                codes = None
+            if codes is not None:
+                order = np.argsort(codes, kind='stable')
+                counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+                starts = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+                column = MediaLibrary.TagColumn(
+                    {value: code for code, value in enumerate(uniques)},
+                    codes,
+                    tuple(order[starts[i]:starts[i+1]] for i in range(len(uniques)))
+                )
+            self._tag_columns[tag] = column
+        return self._tag_columns[tag]
+
+    def find_positions(self, tags: Dict[str, Any]) -> np.ndarray:
+        result = np.arange(len(self.records))
+        for tag, value in tags.items():
+            column = self._get_tag_column(tag) if value is not None else None
+            if column is not None:
+                positions = column.get_positions(value)
+            else:
+                positions = np.flatnonzero([tag in r.tags and r.tags[tag] == value for r in self.records])
+            result = np.intersect1d(result, positions, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result
 
-            records = {}
-            for record, content in source:
-                if not record.inline:
-                    zp.writestr(record.filename, content)
-                dct = copy(record.__dict__)
-                del dct['holder_location']
-                records[record.filename] = dct
+    def to_df(self, positions: Optional[np.ndarray] = None) -> pd.DataFrame:
+        df = self._get_tags_frame()
+        if positions is None:
+            return df.copy()
+        return df.iloc[positions].reset_index(drop=True)
 
-            zp.writestr(DESCRIPTION_FILE_NAME, pickle.dumps(records))
-            zp.writestr(ERRORS_FILE_NAME, pickle.dumps(list(self.errors)))
 
+    @staticmethod
+    def _get_description(record: 'MediaLibrary.Record') -> dict:
+        dct = copy(record.__dict__)
+        del dct['holder_location']
+        return dct
+
+    def _enumerate_with_progress(self, max_workers: int, on_progress: Callable[[float], None]|None):
+        for index, (record, content) in enumerate(self.enumerate_content(max_workers)):
+            yield record, content
+            if on_progress is not None:
+                on_progress((index+1)/len(self.records))
+
+    def _enumerate_for_archive(self, max_workers: int, on_progress: Callable[[float], None]|None):
+        for record, content in self._enumerate_with_progress(max_workers, on_progress):
+            yield MediaLibrary._get_description(record), (None if record.inline else content)
+
+    def _write_zip(self, location: Path, append: bool, max_workers: int, on_progress: Callable[[float], None]|None):
+        writer = ZipLibraryWriter(location, append)
+        duplicates = [record.filename for record in self.records if record.filename in writer.base_names]
+        if len(duplicates) > 0:
+            raise ValueError(f"Files {duplicates[:10]} are already in {location}")
+        index = 0
+        while _appended_file_name(DESCRIPTION_FILE_NAME, index) in writer.base_names:
+            index += 1
+
+        # After an interruption, the entries that are already in the partial file are not read or compressed again
+        to_write = [record for record in self.records if not record.inline]
+        remaining = MediaLibrary(tuple(record for record in to_write if record.filename not in writer.completed_names))
+        compressed = parallel_map(
+            lambda item: ZipLibraryWriter.Entry.compress(item[0].filename, item[1]),
+            remaining.enumerate_content(max_workers),
+            max_workers
+        )
 
+        def entries():
+            for done, ((record, content), entry) in enumerate(compressed, len(to_write) - len(remaining.records) + 1):
+                yield record.filename, entry
+                if on_progress is not None:
+                    on_progress(done/len(to_write))
+
+        records = {record.filename: MediaLibrary._get_description(record) for record in self.records}
+        writer.write(entries(), {
+            _appended_file_name(DESCRIPTION_FILE_NAME, index): pickle.dumps(records),
+            _appended_file_name(ERRORS_FILE_NAME, index): pickle.dumps(list(self.errors)),
+        })
+
+    def save(self,
+             location: Path,
+             with_progress_bar: bool = False,
+             max_workers: int = 4,
+             on_progress: Callable[[float], None]|None = None
+             ):
+        # The contents are read and compressed on max_workers threads. An interrupted save to a zip
+        # is resumed by the next save of the same library to the same location
+        if MediaLibraryArchive.is_archive(location):
+            MediaLibraryArchive.write(location, self._enumerate_for_archive(max_workers, on_progress), self.errors, max_workers=max_workers)
+            return
+        self._write_zip(location, False, max_workers, on_progress)
+
+    def append_to(self, location: Path, max_workers: int = 4, on_progress: Callable[[float], None]|None = None):
+        # The content already written stays in place, and the library is created if it doesn't exist
+        location = Path(location)
+        if not location.is_file():
+            self.save(location, max_workers=max_workers, on_progress=on_progress)
+        elif MediaLibraryArchive.is_archive(location):
+            MediaLibraryArchive.write(location, self._enumerate_for_archive(max_workers, on_progress), self.errors, append=True, max_workers=max_workers)
+        else:
+            self._write_zip(location, True, max_workers, on_progress)
 
-    def unzip(self, folder: Path, with_progress_bar: bool = False):
+    @staticmethod
+    def convert_to_archive(archive_location: Path, *zip_files: Path):
+        MediaLibrary.read(*zip_files).save(archive_location)
+
+    def unzip(self,
+              folder: Path,
+              with_progress_bar: bool = False,
+              max_workers: int = 4,
+              on_progress: Callable[[float], None]|None = None
+              ):
         if os.path.isfile(folder):
             raise ValueError(f'{folder} is a file')
         elif os.path.isdir(folder):
             shutil.rmtree(folder)
         os.makedirs(folder)
 
-        source = Queryable(self.enumerate_content(), len(self.records))
-
         records = []
-        for record, content in source:
+        for record, content in self._enumerate_with_progress(max_workers, on_progress):
             if not record.inline:
                 with open(folder/record.filename, 'wb') as stream:
                     stream.write(content)
@@ -180,10 +319,15 @@ class MediaLibrary:
     @staticmethod
     def _load_zip(zip_file: Path, host_folder: Optional[Path]) -> 'MediaLibrary':
         with zipfile.ZipFile(zip_file, 'r', zipfile.ZIP_DEFLATED) as zp:
-            errors = pickle.loads(zp.read(ERRORS_FILE_NAME))
+            name_list = set(zp.namelist())
+            errors = []
+            desc = {}
+            index = 0
+            while index == 0 or _appended_file_name(DESCRIPTION_FILE_NAME, index) in name_list:
+                errors.extend(pickle.loads(zp.read(_appended_file_name(ERRORS_FILE_NAME, index))))
+                desc.update(pickle.loads(zp.read(_appended_file_name(DESCRIPTION_FILE_NAME, index))))
+                index += 1
             result = []
-            desc = pickle.loads(zp.read(DESCRIPTION_FILE_NAME))
-            name_list = zp.namelist()
             for key, value in desc.items():
                 if 'inline_content' not in value:
                     value['inline_content'] = None #compatibility assignment
@@ -201,16 +345,28 @@ class MediaLibrary:
                 result.append(item)
         return MediaLibrary(tuple(result), tuple(errors))
 
+    @staticmethod
+    def _load_archive(archive_file: Path) -> 'MediaLibrary':
+        description = MediaLibraryArchive.open(archive_file).description
+        records = []
+        for value in description['records']:
+            location = None if value['inline_content'] is not None else archive_file
+            records.append(MediaLibrary.Record(holder_location=location, **value))
+        return MediaLibrary(tuple(records), tuple(description['errors']))
+
     @staticmethod
     def _load_zips(zip_files: Iterable[Path], host_folder: Optional[Path]) -> 'MediaLibrary':
-        result = None
+        # The records are concatenated once, instead of merging the libraries pairwise
+        records = []
+        errors = []
         for zip_file in zip_files:
-            addition = MediaLibrary._load_zip(zip_file, host_folder)
-            if result is None:
-                result = addition
+            if MediaLibraryArchive.is_archive(zip_file):
+                addition = MediaLibrary._load_archive(zip_file)
             else:
-                result = result.merge(addition)
-        return result
+                addition = MediaLibrary._load_zip(zip_file, host_folder)
+            records.extend(addition.records)
+            errors.extend(addition.errors)
+        return MediaLibrary(tuple(records), tuple(errors))
 
     @staticmethod
     def read(*zip_files: Path) -> 'MediaLibrary':
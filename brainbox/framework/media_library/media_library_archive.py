@@ -0,0 +1,187 @@
+from typing import *
+from pathlib import Path
+from threading import Lock
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+import numpy as np
+
+from .parallel_map import parallel_map
+
+
+class MediaLibraryArchive:
+    # The archive is a single file: the payloads of the records, then the table of their positions, then the description
+    # of the records (tags, timestamps, inline content), then the fixed-size footer that points to the table and the description.
+    # The file is memory-mapped, the table is read as a numpy array over the mapping, and the uncompressed payloads
+    # are served as views of the mapping. Appending never changes the bytes already written: the new payloads,
+    # table, description and footer go after the end of the file, and the footer is written last. If an append is
+    # interrupted, the archive is read up to the last complete footer.
+    Suffix = '.mla'
+    Magic = b'BBMLA\x00\x00\x01'
+    Footer = struct.Struct('<QQQQ8s')
+    EntryType = np.dtype([('offset', '<u8'), ('size', '<u8'), ('raw_size', '<u8'), ('compression', '<u8')])
+
+    NoCompression = 0
+    ZlibCompression = 1
+    InlineContent = 2
+
+    # The formats that are already compressed are stored as they are
+    CompressedExtensions = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.mp3', '.ogg', '.opus', '.mp4', '.zip', '.gz')
+
+    _lock = Lock()
+    _archives: dict[Path, 'MediaLibraryArchive'] = {}
+
+    def __init__(self, path: Path):
+        self.path = path
+        stat = os.stat(path)
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        table_offset, count, description_offset, description_size, magic = MediaLibraryArchive._read_footer(self._mmap, path)
+        self.entries = np.frombuffer(self._mmap, MediaLibraryArchive.EntryType, count, table_offset)
+        self._description_offset = description_offset
+        self._description_size = description_size
+        self._description: dict|None = None
+        self._name_to_position: dict[str, int]|None = None
+
+    @staticmethod
+    def _is_complete_footer(footer: tuple, end: int) -> bool:
+        table_offset, count, description_offset, description_size, magic = footer
+        return (
+            magic == MediaLibraryArchive.Magic
+            and table_offset + count*MediaLibraryArchive.EntryType.itemsize == description_offset
+            and description_offset + description_size + MediaLibraryArchive.Footer.size == end
+        )
+
+    @staticmethod
+    def _read_footer(buffer, path: Path):
+        magic_size = len(MediaLibraryArchive.Magic)
+        footer_size = MediaLibraryArchive.Footer.size
+        if len(buffer) < magic_size + footer_size or buffer[:magic_size] != MediaLibraryArchive.Magic:
+            raise ValueError(f"{path} is not a media library archive")
+        end = len(buffer)
+        while end >= magic_size + footer_size:
+            footer = MediaLibraryArchive.Footer.unpack(buffer[end - footer_size:end])
+            if MediaLibraryArchive._is_complete_footer(footer, end):
+                return footer
+            # The tail of an interrupted append: the previous complete footer ends with the magic too
+            position = buffer.rfind(MediaLibraryArchive.Magic, magic_size, end - 1)
+            if position < 0:
+                break
+            end = position + magic_size
+        raise ValueError(f"{path} is not a media library archive, or its footer is damaged")
+
+    @staticmethod
+    def is_archive(path: Path) -> bool:
+        return Path(path).suffix == MediaLibraryArchive.Suffix
+
+    @staticmethod
+    def open(path: Path) -> 'MediaLibraryArchive':
+        # The opened archives are shared, and are reopened when the file was appended to since they were mapped
+        path = Path(path).absolute()
+        stat = os.stat(path)
+        with MediaLibraryArchive._lock:
+            archive = MediaLibraryArchive._archives.get(path)
+            if archive is None or archive.version != (stat.st_mtime_ns, stat.st_size):
+                archive = MediaLibraryArchive(path)
+                MediaLibraryArchive._archives[path] = archive
+            return archive
+
+    @property
+    def description(self) -> dict:
+        if self._description is None:
+            start = self._description_offset
+            self._description = pickle.loads(self._mmap[start:start+self._description_size])
+        return self._description
+
+    def _get_position(self, name: str) -> int:
+        if self._name_to_position is None:
+            self._name_to_position = {record['filename']: i for i, record in enumerate(self.description['records'])}
+        if name not in self._name_to_position:
+            raise ValueError(f"File {name} is absent from archive file {self.path}")
+        return self._name_to_position[name]
+
+    def read_view(self, name: str) -> memoryview:
+        entry = self.entries[self._get_position(name)]
+        if entry['compression'] == MediaLibraryArchive.InlineContent:
+            raise ValueError(f"File {name} has inline content, and is not stored in the payload of {self.path}")
+        offset, size = int(entry['offset']), int(entry['size'])
+        view = memoryview(self._mmap)[offset:offset+size]
+        if entry['compression'] == MediaLibraryArchive.ZlibCompression:
+            return memoryview(zlib.decompress(view))
+        return view
+
+    def read(self, name: str) -> bytes:
+        return bytes(self.read_view(name))
+
+    @staticmethod
+    def is_compressed_format(name: str) -> bool:
+        return name.lower().endswith(MediaLibraryArchive.CompressedExtensions)
+
+    @staticmethod
+    def _compress(name: str, content: bytes) -> tuple[int, bytes]:
+        if MediaLibraryArchive.is_compressed_format(name):
+            return MediaLibraryArchive.NoCompression, content
+        compressed = zlib.compress(content)
+        if len(compressed) < len(content):
+            return MediaLibraryArchive.ZlibCompression, compressed
+        return MediaLibraryArchive.NoCompression, content
+
+    @staticmethod
+    def write(path: Path, items: Iterable[tuple[dict, bytes|None]], errors: Iterable[str] = (), append: bool = False, max_workers: int = 1):
+        # Each item is the description of the record and its content, which is None for the inline records.
+        # A new archive replaces the file, so the archives mapped by the readers stay valid
+        path = Path(path)
+        if not append or not path.is_file():
+            temp_path = path.parent/(path.name+'.tmp')
+            with open(temp_path, 'wb') as file:
+                file.write(MediaLibraryArchive.Magic)
+                MediaLibraryArchive._write_tail(file, len(MediaLibraryArchive.Magic), [], [], items, errors, max_workers)
+            os.replace(temp_path, path)
+            return
+
+        archive = MediaLibraryArchive.open(path)
+        entries = [tuple(int(value) for value in entry) for entry in archive.entries]
+        records = list(archive.description['records'])
+        all_errors = list(archive.description['errors'])
+        with open(path, 'r+b') as file:
+            offset = file.seek(0, os.SEEK_END)
+            MediaLibraryArchive._write_tail(file, offset, entries, records, items, all_errors + list(errors), max_workers)
+
+    @staticmethod
+    def _compress_item(item: tuple[dict, bytes|None]) -> tuple[int, bytes]|None:
+        description, content = item
+        if content is None:
+            return None
+        return MediaLibraryArchive._compress(description['filename'], content)
+
+    @staticmethod
+    def _write_tail(file, offset: int, entries: list[tuple], records: list[dict], items: Iterable[tuple[dict, bytes|None]], errors: Iterable[str], max_workers: int):
+        # The entries are compressed on the pool, and written in the order of the items
+        for (description, content), compressed in parallel_map(MediaLibraryArchive._compress_item, items, max_workers):
+            records.append(description)
+            if compressed is None:
+                entries.append((0, 0, 0, MediaLibraryArchive.InlineContent))
+                continue
+            compression, payload = compressed
+            file.write(payload)
+            entries.append((offset, len(payload), len(content), compression))
+            offset += len(payload)
+
+        table = np.array(entries, dtype=MediaLibraryArchive.EntryType)
+        file.write(table.tobytes())
+        description = pickle.dumps(dict(records=records, errors=list(errors)))
+        file.write(description)
+        # The footer makes the appended entries visible, so it must not reach the disk before them
+        file.flush()
+        os.fsync(file.fileno())
+        file.write(MediaLibraryArchive.Footer.pack(
+            offset,
+            len(entries),
+            offset + table.nbytes,
+            len(description),
+            MediaLibraryArchive.Magic
+        ))
@@ -0,0 +1,25 @@
+from typing import *
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+T = TypeVar('T')
+TResult = TypeVar('TResult')
+
+
+def parallel_map(function: Callable[[T], TResult], items: Iterable[T], max_workers: int) -> Iterable[tuple[T, TResult]]:
+    # Unlike ThreadPoolExecutor.map, only a few items are in flight at a time, so the contents of a large library
+    # are not all loaded into memory at once. The order of the items is preserved
+    if max_workers <= 1:
+        for item in items:
+            yield item, function(item)
+        return
+    with ThreadPoolExecutor(max_workers) as pool:
+        window = deque()
+        for item in items:
+            window.append((item, pool.submit(function, item)))
+            if len(window) >= 2*max_workers:
+                item, future = window.popleft()
+                yield item, future.result()
+        while len(window) > 0:
+            item, future = window.popleft()
+            yield item, future.result()
@@ -0,0 +1,139 @@
+from typing import *
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import os
+import shutil
+import time
+import zipfile
+import zlib
+
+from .media_library_archive import MediaLibraryArchive
+
+
+class ZipLibraryWriter:
+    # The zip is written to `<location>.partial`, which replaces the location only when complete, so an interrupted
+    # save or append leaves the library intact. The entries arrive already compressed, so the compression runs
+    # on the workers, and here they are only written one after another. Each complete entry is recorded
+    # in `<location>.partial.manifest`, and the writer created for the same location after an interruption continues
+    # after the last recorded entry. At the end, zipfile writes the central directory after the entries.
+    PartialSuffix = '.partial'
+    ManifestSuffix = '.partial.manifest'
+
+    @dataclass
+    class Entry:
+        compress_type: int
+        crc: int
+        file_size: int
+        payload: bytes
+        date_time: tuple
+
+        @staticmethod
+        def compress(name: str, content: bytes) -> 'ZipLibraryWriter.Entry':
+            date_time = time.localtime(time.time())[:6]
+            crc = zlib.crc32(content)
+            if not MediaLibraryArchive.is_compressed_format(name):
+                # The raw deflate stream, same as zipfile's ZIP_DEFLATED
+                compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+                payload = compressor.compress(content) + compressor.flush()
+                if len(payload) < len(content):
+                    return ZipLibraryWriter.Entry(zipfile.ZIP_DEFLATED, crc, len(content), payload, date_time)
+            return ZipLibraryWriter.Entry(zipfile.ZIP_STORED, crc, len(content), bytes(content), date_time)
+
+    def __init__(self, location: Path, append: bool = False):
+        self.location = Path(location)
+        self.partial_location = self.location.parent/(self.location.name + ZipLibraryWriter.PartialSuffix)
+        self.manifest_location = self.location.parent/(self.location.name + ZipLibraryWriter.ManifestSuffix)
+        self.base_infos: list[zipfile.ZipInfo] = []
+        self.base_end = 0
+        self.base_version = None
+        if append and self.location.is_file():
+            with zipfile.ZipFile(self.location, 'r') as zp:
+                self.base_infos = zp.infolist()
+                self.base_end = zp.start_dir
+            stat = os.stat(self.location)
+            self.base_version = [stat.st_mtime_ns, stat.st_size]
+        self.base_names = set(info.filename for info in self.base_infos)
+        self.infos = self._read_manifest()
+        self.resumed = self.infos is not None
+        if self.infos is None:
+            self.infos = []
+        self.completed_names = set(info.filename for info in self.infos)
+
+    def _read_manifest(self) -> list[zipfile.ZipInfo]|None:
+        # The first line identifies the library the partial file was appended to, so it is not resumed after that library changed
+        if not self.manifest_location.is_file() or not self.partial_location.is_file():
+            return None
+        with open(self.manifest_location) as stream:
+            lines = stream.read().split('\n')
+        try:
+            if json.loads(lines[0]) != self.base_version:
+                return None
+        except ValueError:
+            return None
+        size = os.stat(self.partial_location).st_size
+        infos = []
+        for line in lines[1:]:
+            try:
+                name, date_time, compress_type, crc, file_size, compress_size, header_offset = json.loads(line)
+            except ValueError:
+                # The empty line at the end, or the line that was being written when the process stopped
+                break
+            info = ZipLibraryWriter._create_info(name, tuple(date_time), compress_type, crc, file_size, compress_size)
+            info.header_offset = header_offset
+            if ZipLibraryWriter._get_end(info) > size:
+                break
+            infos.append(info)
+        return infos
+
+    @staticmethod
+    def _create_info(name: str, date_time: tuple, compress_type: int, crc: int, file_size: int, compress_size: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time)
+        info.compress_type = compress_type
+        info.CRC = crc
+        info.file_size = file_size
+        info.compress_size = compress_size
+        info.external_attr = 0o600 << 16
+        return info
+
+    @staticmethod
+    def _get_end(info: zipfile.ZipInfo) -> int:
+        return info.header_offset + len(info.FileHeader()) + info.compress_size
+
+    def _start(self):
+        if self.base_end > 0:
+            # The entries of the library being appended to are copied as they are, without the central directory
+            shutil.copyfile(self.location, self.partial_location)
+            os.truncate(self.partial_location, self.base_end)
+        else:
+            open(self.partial_location, 'wb').close()
+        with open(self.manifest_location, 'w') as stream:
+            stream.write(json.dumps(self.base_version) + '\n')
+
+    def write(self, entries: Iterable[tuple[str, 'ZipLibraryWriter.Entry']], files: dict[str, bytes]):
+        # `entries` must skip `completed_names`; `files` are small and are written at the end, deflated by zipfile
+        if not self.resumed:
+            self._start()
+        end = self._get_end(self.infos[-1]) if len(self.infos) > 0 else self.base_end
+        with open(self.partial_location, 'r+b') as file, open(self.manifest_location, 'a') as manifest:
+            file.seek(end)
+            file.truncate()
+            for name, entry in entries:
+                info = ZipLibraryWriter._create_info(name, entry.date_time, entry.compress_type, entry.crc, entry.file_size, len(entry.payload))
+                info.header_offset = file.tell()
+                file.write(info.FileHeader())
+                file.write(entry.payload)
+                # The entry is recorded only after its bytes have left the process
+                file.flush()
+                manifest.write(json.dumps([
+                    name, info.date_time, info.compress_type, info.CRC, info.file_size, info.compress_size, info.header_offset
+                ]) + '\n')
+                manifest.flush()
+                self.infos.append(info)
+
+            with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as zp:
+                zp.filelist.extend(self.base_infos + self.infos)
+                for name, content in files.items():
+                    zp.writestr(name, content)
+        os.replace(self.partial_location, self.location)
+        os.remove(self.manifest_location)
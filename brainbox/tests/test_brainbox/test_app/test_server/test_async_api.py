@@ -0,0 +1,34 @@
+from brainbox.deciders import FakeText, Collector
+from unittest import TestCase
+from brainbox import BrainBoxApi, BrainBoxTask
+from yo_fluq import Query
+import asyncio
+
+
+class AsyncApiTestCase(TestCase):
+    async def _run(self, address, cache_folder):
+        async with BrainBoxApi.Async(address, cache_folder) as api:
+            tasks = [BrainBoxTask.call(FakeText)(f'chat {i}') for i in range(5)]
+            results = await asyncio.gather(*[api.execute(task) for task in tasks])
+            for i, result in enumerate(results):
+                self.assertTrue(result.startswith(f'chat {i}'))
+
+            pack = (
+                Query
+                .combinatorics.grid(a=list(range(2)), b=list(range(2)))
+                .feed(Collector.FunctionalTaskBuilder(
+                    lambda z: BrainBoxTask.call(FakeText)(f'{z.a}/{z.b}'),
+                    method='to_array'
+                )))
+            result = await api.execute(pack)
+            self.assertEqual(4, len(result))
+
+            task = BrainBoxTask.call(FakeText)('streamed')
+            await api.add(task)
+            chunks = [chunk async for chunk in api.iterate_results(task)]
+            self.assertEqual(1, len(chunks))
+            self.assertTrue(chunks[0].startswith('streamed'))
+
+    def test_async_api(self):
+        with BrainBoxApi.Test() as api:
+            asyncio.run(self._run(api.address, api.cache_folder))
@@ -1,5 +1,8 @@
 from unittest import TestCase
-from brainbox.framework import File, BrainBoxApi, FileIO, IDecider, FileLike, BrainBoxTask, Loc
+from brainbox.framework import File, BrainBoxApi, FileIO, IDecider, FileLike, BrainBoxTask, Loc, CacheStore
+from io import BytesIO
+import requests
+import os
 
 class FileDecider(IDecider):
     def process(self, file: FileLike.Type):
@@ -46,3 +49,34 @@ class UploadsDownloadsTestCase(TestCase):
 
 
 
+
+    def test_streaming_and_resuming(self):
+        content = bytes(range(256))*100
+        with Loc.create_test_folder() as api_folder:
+            with BrainBoxApi.Test([FileDecider()]) as api:
+                api.cache_folder = api_folder
+                api.upload_chunk_size = 1000
+                hash = CacheStore.hash_stream(BytesIO(content))
+                address = f'http://{api.address}/cache/upload_stream/{hash}'
+                requests.put(address, params=dict(offset=0), data=content[:1500])
+                self.assertEqual('1500', requests.get(address).text)
+                reply = requests.put(address, params=dict(offset=1000), data=content[1000:2000])
+                self.assertEqual(409, reply.status_code)
+                self.assertEqual('1500', reply.text)
+
+                api.upload('big.bin', content)
+                self.assertEqual(content, FileIO.read_bytes(api.download('big.bin')))
+
+                reply = requests.get(f'http://{api.address}/cache/download/big.bin', headers={'Range': 'bytes=100-199'})
+                self.assertEqual(206, reply.status_code)
+                self.assertEqual(content[100:200], reply.content)
+
+                os.unlink(api_folder/'big.bin')
+                FileIO.write_bytes(content[:500], api_folder/'big.bin.partial')
+                self.assertEqual(content, FileIO.read_bytes(api.download('big.bin')))
+                self.assertFalse((api_folder/'big.bin.partial').is_file())
+
+                os.unlink(api_folder/'big.bin')
+                with api.open_file_stream('big.bin') as stream:
+                    self.assertEqual(content[:10], stream.read(10))
+                    self.assertEqual(content[10:], stream.read())
@@ -1,8 +1,10 @@
 from brainbox.framework import (
     BrainBoxTask, BrainBoxApi, FailedJobArgument, ControllerOverDecider,
-    IDecider, ISelfManagingDecider
+    IDecider, ISelfManagingDecider, ResourceAwarePlanner, ResourceCost
 )
 from unittest import TestCase
+from threading import Event
+import time
 
 class WaitingDecider(IDecider):
     def __call__(self, arg = None):
@@ -39,12 +41,86 @@ class CollectingDecider(IDecider):
         return dict(collected=True, arg=args)
 
 
+class SleepingDecider(IDecider):
+    def __call__(self, seconds: float = 1):
+        time.sleep(seconds)
+        return 'OK'
+
+
+class ChattyDecider(IDecider):
+    def __call__(self, count: int = 100):
+        for i in range(count):
+            self.context.logger.report_progress(i/count)
+            self.context.logger.log(f'Step {i}')
+        self.context.logger.log(dict(steps=count, done=True))
+        return 'OK'
+
+
+class StreamingDecider(IDecider):
+    def __call__(self, count: int = 3, delay: float = 0.1):
+        for i in range(count):
+            time.sleep(delay)
+            self.context.logger.partial_result(f'Chunk {i}')
+        return count
+
+
+class BatchingDecider(IDecider):
+    def __init__(self):
+        self.batch_sizes = []
+
+    @classmethod
+    def get_max_batch_size(cls) -> int:
+        return 4
+
+    def __call__(self, arg):
+        return self.run_batch(None, [dict(arg=arg)])[0]
+
+    def run_batch(self, method, arguments):
+        time.sleep(0.1)
+        self.batch_sizes.append(len(arguments))
+        return [f'OK-{a["arg"]}' for a in arguments]
+
+
+class CountingDecider(IDecider):
+    def __init__(self):
+        self.calls = 0
+
+    @classmethod
+    def is_result_cacheable(cls, method: str|None) -> bool:
+        return method == 'read'
+
+    def read(self, file: str):
+        self.calls += 1
+        with open(self.cache_folder/file) as stream:
+            return stream.read()
+
+    def uncached(self, file: str):
+        self.calls += 1
+        return file
+
+
+class SlowReadinessController(ControllerOverDecider):
+    def __init__(self, decider: IDecider, custom_name: str, fail: bool = False):
+        super().__init__(decider, custom_name)
+        self.fail = fail
+        self.ready = Event()
+
+    def is_ready(self, instance_id: str, model: str|None = None) -> bool:
+        if self.fail:
+            raise ValueError("Not ready")
+        return self.ready.is_set()
+
+
 services = [
     ControllerOverDecider(WaitingDecider(), 'a'),
     ControllerOverDecider(WaitingDecider(), 'b'),
     ControllerOverDecider(ErroneousDecider(True, False), 'err'),
     ControllerOverDecider(CollectingDecider(), 'collect'),
-    ControllerOverDecider(ErroneousDecider(False, True), 'err_warm')
+    ControllerOverDecider(ErroneousDecider(False, True), 'err_warm'),
+    ControllerOverDecider(ChattyDecider(), 'chatty'),
+    ControllerOverDecider(SleepingDecider(), 'sleeping'),
+    ControllerOverDecider(StreamingDecider(), 'streaming'),
+    ControllerOverDecider(BatchingDecider(), 'batching'),
 ]
 
 class ServiceTestCase(TestCase):
@@ -169,4 +245,101 @@ class ServiceTestCase(TestCase):
         with BrainBoxApi.ServerlessTest(services) as api:
             task = BrainBoxTask(id=f'test', decider = 'a', arguments = {})
             self.assertEqual('OK', api.execute(task))
-            self.assertEqual('OK', api.result(task.id))
\ No newline at end of file
+            self.assertEqual('OK', api.result(task.id))
+
+    def test_progress_and_log(self):
+        with BrainBoxApi.ServerlessTest(services) as api:
+            task = BrainBoxTask(id='test', decider='chatty', arguments=dict(count=100))
+            self.assertEqual('OK', api.execute(task))
+            job = api.job(task.id)
+            self.assertEqual(0.99, job.progress)
+            self.assertListEqual([f'Step {i}' for i in range(100)] + [dict(steps=100, done=True)], job.log)
+
+    def test_join_time_limit(self):
+        with BrainBoxApi.ServerlessTest(services) as api:
+            task = BrainBoxTask(id='test', decider='sleeping', arguments=dict(seconds=2))
+            api.add(task)
+            with self.assertRaises(ValueError):
+                api.base_join([task.id], time_limit_in_secods=0.5)
+            self.assertEqual(['OK'], api.base_join([task.id], time_limit_in_secods=10))
+
+    def test_iterate_results(self):
+        with BrainBoxApi.ServerlessTest(services) as api:
+            task = BrainBoxTask(id='test', decider='streaming', arguments=dict(count=5))
+            api.add(task)
+            self.assertListEqual([f'Chunk {i}' for i in range(5)], list(api.iterate_results(task)))
+            self.assertEqual(5, api.join(task))
+
+            task = BrainBoxTask(id='not-streaming', decider='a', arguments=dict())
+            api.add(task)
+            self.assertListEqual(['OK'], list(api.iterate_results(task.id)))
+
+            task = BrainBoxTask(id='error', decider='err', arguments=dict())
+            api.add(task)
+            with self.assertRaises(ValueError):
+                list(api.iterate_results(task))
+
+    def test_resource_aware_planner(self):
+        planner = ResourceAwarePlanner(ResourceCost(memory_in_gb=4))
+        with BrainBoxApi.ServerlessTest(services, planner=planner) as api:
+            tasks = [
+                BrainBoxTask(id=f'{decider}-{i}', decider=decider, arguments=dict(arg=i))
+                for i in range(5) for decider in ['a', 'b']
+            ]
+            result = api.execute(tasks)
+            self.assertListEqual([f'OK-{i}' for i in range(5) for _ in ['a', 'b']], result)
+            self.assertEqual(2, len(api.loop.core.operator_states))
+
+    def test_resource_aware_planner_warm_pool(self):
+        planner = ResourceAwarePlanner(ResourceCost(memory_in_gb=4), warm_pool=[ResourceAwarePlanner.WarmPoolEntry('a')])
+        with BrainBoxApi.ServerlessTest(services, planner=planner) as api:
+            api.execute(BrainBoxTask(id='b', decider='b', arguments=dict(arg=0)))
+            keys = set(state.key.decider_name for state in api.loop.core.operator_states.values())
+            self.assertEqual({'a', 'b'}, keys)
+
+    def test_warm_up_does_not_block_main_loop(self):
+        slow = SlowReadinessController(WaitingDecider(), 'slow')
+        planner = ResourceAwarePlanner(ResourceCost(memory_in_gb=4))
+        with BrainBoxApi.ServerlessTest(services + [slow], planner=planner) as api:
+            slow_task = BrainBoxTask(id='slow', decider='slow', arguments=dict(arg=0))
+            api.add(slow_task)
+            self.assertEqual('OK-1', api.execute(BrainBoxTask(id='a', decider='a', arguments=dict(arg=1))))
+            slow.ready.set()
+            self.assertEqual('OK-0', api.join(slow_task))
+
+    def test_failed_warm_up(self):
+        failing = SlowReadinessController(WaitingDecider(), 'failing', fail=True)
+        planner = ResourceAwarePlanner(ResourceCost(memory_in_gb=4))
+        with BrainBoxApi.ServerlessTest(services + [failing], planner=planner) as api:
+            task = BrainBoxTask(id='failing', decider='failing', arguments=dict())
+            api.add(task)
+            with self.assertRaises(ValueError):
+                api.join(task)
+            self.assertIn('failed to warm up', api.job(task.id).error)
+            self.assertEqual('OK', api.execute(BrainBoxTask(id='a', decider='a', arguments=dict())))
+            keys = set(state.key.decider_name for state in api.loop.core.operator_states.values())
+            self.assertNotIn('failing', keys)
+
+    def test_batching(self):
+        with BrainBoxApi.ServerlessTest(services) as api:
+            tasks = [BrainBoxTask(id=f'test-{i}', decider='batching', arguments=dict(arg=i)) for i in range(10)]
+            self.assertListEqual([f'OK-{i}' for i in range(10)], api.execute(tasks))
+            decider = api.loop.core.registry.get_controller('batching').decider
+            self.assertEqual(10, sum(decider.batch_sizes))
+            self.assertGreater(max(decider.batch_sizes), 1)
+            self.assertLessEqual(max(decider.batch_sizes), 4)
+
+    def test_result_cache(self):
+        decider = CountingDecider()
+        with BrainBoxApi.ServerlessTest([decider], result_cache_max_entries=1000) as api:
+            api.cache_store.put_bytes('first.txt', b'content')
+            api.cache_store.put_bytes('same_content.txt', b'content')
+            api.cache_store.put_bytes('other_content.txt', b'other')
+            self.assertEqual('content', api.execute(BrainBoxTask.call(CountingDecider).read('first.txt')))
+            self.assertEqual('content', api.execute(BrainBoxTask.call(CountingDecider).read('same_content.txt')))
+            self.assertEqual(1, decider.calls)
+            self.assertEqual('other', api.execute(BrainBoxTask.call(CountingDecider).read('other_content.txt')))
+            self.assertEqual(2, decider.calls)
+            api.execute(BrainBoxTask.call(CountingDecider).uncached('first.txt'))
+            api.execute(BrainBoxTask.call(CountingDecider).uncached('first.txt'))
+            self.assertEqual(4, decider.calls)
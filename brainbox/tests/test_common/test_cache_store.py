@@ -0,0 +1,92 @@
+from unittest import TestCase
+from unittest.mock import patch
+from brainbox.framework import CacheStore, Loc, FileIO
+import os
+import time
+
+
+class CacheStoreTestCase(TestCase):
+    def test_deduplication(self):
+        with Loc.create_test_folder() as folder:
+            store = CacheStore(folder/'cache')
+            hash = store.put_bytes('a.txt', b'Hello')
+            self.assertEqual(hash, store.put_bytes('b.txt', b'Hello'))
+            self.assertEqual(b'Hello', FileIO.read_bytes(folder/'cache/b.txt'))
+            self.assertEqual(1, len(os.listdir(store.blobs_folder)))
+            self.assertListEqual(['a.txt', 'b.txt'], sorted(os.listdir(folder/'cache')))
+
+            self.assertTrue(store.link('c.txt', hash))
+            self.assertFalse(store.link('d.txt', 'unknown'))
+            self.assertEqual(b'Hello', FileIO.read_bytes(folder/'cache/c.txt'))
+
+            store.put_bytes('a.txt', b'Bye')
+            self.assertEqual(b'Bye', FileIO.read_bytes(folder/'cache/a.txt'))
+            self.assertEqual(b'Hello', FileIO.read_bytes(folder/'cache/b.txt'))
+
+    def test_ingestion(self):
+        with Loc.create_test_folder() as folder:
+            store = CacheStore(folder/'cache', ingestion_delay_in_seconds=0)
+            os.makedirs(folder/'cache')
+            FileIO.write_bytes(b'Hello', folder/'cache/a.txt')
+            FileIO.write_bytes(b'Hello', folder/'cache/b.txt')
+            report = store.maintain()
+            self.assertEqual(2, report.ingested_files)
+            self.assertEqual(1, report.deduplicated_files)
+            self.assertEqual(5, report.total_bytes)
+            self.assertEqual(b'Hello', FileIO.read_bytes(folder/'cache/b.txt'))
+
+    def test_eviction(self):
+        with Loc.create_test_folder() as folder:
+            store = CacheStore(folder/'cache', byte_budget=10)
+            for i in range(4):
+                store.put_bytes(f'{i}.txt', f'Text{i}'.encode())
+                os.utime(folder/f'cache/{i}.txt', (time.time()-100+i, time.time()-100+i))
+            store.add_references('job', ['0.txt'])
+            report = store.maintain()
+            self.assertListEqual(['1.txt', '2.txt'], report.evicted_files)
+            self.assertListEqual(['0.txt', '3.txt'], sorted(os.listdir(folder/'cache')))
+
+            store.release_references(['job'])
+            store.ttl_in_seconds = 50
+            report = store.maintain()
+            self.assertListEqual(['0.txt', '3.txt'], report.evicted_files)
+            self.assertEqual(0, report.total_bytes)
+
+    def test_copy_on_write(self):
+        with Loc.create_test_folder() as folder:
+            store = CacheStore(folder/'cache')
+            store.put_bytes('a.txt', b'Hello')
+            store.put_bytes('b.txt', b'Hello')
+            with store.write_file('a.txt') as path:
+                FileIO.write_bytes(b'Bye', path)
+            self.assertEqual(b'Bye', FileIO.read_bytes(folder/'cache/a.txt'))
+            self.assertEqual(b'Hello', FileIO.read_bytes(folder/'cache/b.txt'))
+            if os.name == 'posix' and os.geteuid() != 0:
+                with self.assertRaises(PermissionError):
+                    FileIO.write_bytes(b'Bye', folder/'cache/b.txt')
+
+    def test_dependencies_reference_results(self):
+        with Loc.create_test_folder() as folder:
+            store = CacheStore(folder/'cache')
+            store.put_bytes('a.txt', b'Hello')
+            self.assertTrue(store.contains('a.txt'))
+            self.assertFalse(store.contains('b.txt'))
+            store.add_dependencies('dependent', ['job'])
+            store.add_references('job', ['a.txt'])
+            store.release_references(['job'])
+            self.assertTrue(store.is_referenced('a.txt'))
+            store.release_references(['dependent'])
+            self.assertFalse(store.is_referenced('a.txt'))
+
+    def test_get_hash(self):
+        with Loc.create_test_folder() as folder:
+            store = CacheStore(folder/'cache')
+            hash = store.put_bytes('a.txt', b'Hello')
+            with patch.object(CacheStore, 'hash_file', side_effect=AssertionError('The known hash must be reused')):
+                self.assertEqual(hash, store.get_hash('a.txt'))
+
+            FileIO.write_bytes(b'Direct', folder/'cache/direct.txt')
+            self.assertEqual(CacheStore.hash_file(folder/'cache/direct.txt'), store.get_hash('direct.txt'))
+            FileIO.write_bytes(b'Rewritten', folder/'cache/direct.txt')
+            os.utime(folder/'cache/direct.txt', ns=(0, time.time_ns()+10**9))
+            self.assertEqual(CacheStore.hash_file(folder/'cache/direct.txt'), store.get_hash('direct.txt'))
@@ -0,0 +1,19 @@
+from unittest import TestCase
+from brainbox.framework.common import HttpSessions, HttpSessionSettings
+from brainbox.tests.test_common.test_marshalling.marshalling_endpoint_structure import MyApi
+
+
+class HttpSessionTestCase(TestCase):
+    def test_sessions_are_shared(self):
+        self.assertIs(HttpSessions.get('127.0.0.1:1'), HttpSessions.get('127.0.0.1:1'))
+        self.assertIsNot(HttpSessions.get('127.0.0.1:1'), HttpSessions.get('127.0.0.1:2'))
+        self.assertIsNot(HttpSessions.get('127.0.0.1:1'), HttpSessions.get('127.0.0.1:1', HttpSessionSettings(pool_size=1)))
+
+    def test_connection_is_kept_alive(self):
+        with MyApi.Test() as api:
+            for _ in range(5):
+                self.assertEqual('Hello, Test', api.hello('Test'))
+            pool_manager = api.session.get_adapter(f'http://{api.address}').poolmanager
+            pools = [pool_manager.pools[key] for key in pool_manager.pools.keys()]
+            self.assertEqual(1, sum(pool.num_connections for pool in pools))
+            self.assertEqual(5, sum(pool.num_requests for pool in pools))
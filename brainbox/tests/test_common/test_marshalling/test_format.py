@@ -12,3 +12,24 @@ class TupleTestCase(TestCase):
         rs, _ = make(dict(result=(1,2,3)))
         self.assertIsInstance(rs['result'], tuple)
 
+
+
+class BinaryFormatTestCase(TestCase):
+    def test_roundtrip(self):
+        content = bytes(range(256))*100
+        data = dict(arguments=dict(content=content, small=b'abc', items=(1, 'a', None)))
+        body = Format.encode_binary(data)
+        result = Format.decode_binary(body)
+        self.assertEqual(data, result)
+        self.assertIsInstance(result['arguments']['content'], bytes)
+        self.assertIsInstance(result['arguments']['items'], tuple)
+
+    def test_no_base64_overhead(self):
+        content = bytes(range(256))*1000
+        binary = Format.encode_binary(dict(result=content))
+        _, text = make(dict(result=content))
+        self.assertLess(len(binary), len(content) + 200)
+        self.assertGreater(len(text), len(content)*4//3)
+
+    def test_wrong_magic(self):
+        self.assertRaises(ValueError, lambda: Format.decode_binary(b'{"result": 1}'))
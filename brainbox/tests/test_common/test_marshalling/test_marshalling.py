@@ -36,3 +36,9 @@ class MarhsallingTestCase(TestCase):
 
 
 
+
+    def test_json_fallback(self):
+        with MyApi.Test() as api:
+            api.hello.binary = False
+            self.assertEqual("Hello, Test", api.hello('Test'))
+            self.assertEqual(b'x'*5000, api.custom_type(b'x'*5000).data)
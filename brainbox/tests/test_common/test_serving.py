@@ -0,0 +1,74 @@
+from unittest import TestCase
+from brainbox.framework import Fork, ApiUtils, ThreadPoolServing, Loc, FileIO
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import requests
+import socket
+import time
+from flask import Flask
+
+
+class PortReportingServing(ThreadPoolServing):
+    def __init__(self, port_file: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.port_file = port_file
+
+    def on_listening(self, port: int):
+        FileIO.write_text(str(port), self.port_file)
+
+
+class SlowServer:
+    def __init__(self, port_file: Path):
+        self.port_file = port_file
+
+    def __call__(self):
+        app = Flask("TestApp")
+        app.add_url_rule('/', view_func=self.index, methods=['GET'])
+        app.add_url_rule('/slow', view_func=self.slow, methods=['GET'])
+        PortReportingServing(self.port_file, threads=4, keep_alive_timeout_in_seconds=0.5).serve(app, '127.0.0.1', 0)
+
+    def index(self):
+        return 'OK'
+
+    def slow(self):
+        time.sleep(1)
+        return 'OK'
+
+
+class ServingTestCase(TestCase):
+    def wait_for_port(self, port_file: Path) -> int:
+        begin = time.monotonic()
+        while not port_file.is_file() or FileIO.read_text(port_file) == '':
+            if time.monotonic() - begin > 10:
+                raise ValueError("The server didn't start")
+            time.sleep(0.01)
+        return int(FileIO.read_text(port_file))
+
+    def test_thread_pool_serving(self):
+        with Loc.create_test_folder() as folder:
+            fork = Fork(SlowServer(folder/'port')).start()
+            try:
+                address = f'http://127.0.0.1:{self.wait_for_port(folder/"port")}'
+                ApiUtils.wait_for_reply(address, 5)
+                begin = time.monotonic()
+                with ThreadPoolExecutor(4) as executor:
+                    replies = list(executor.map(lambda _: requests.get(f'{address}/slow'), range(4)))
+                self.assertLess(time.monotonic() - begin, 1.9)
+                self.assertTrue(all(reply.text == 'OK' for reply in replies))
+
+                # The idle connections occupy all the workers, until they are idle for longer than the timeout
+                port = int(address.split(':')[-1])
+                idle_connections = [socket.create_connection(('127.0.0.1', port)) for _ in range(4)]
+                time.sleep(1)
+                self.assertEqual('OK', requests.get(address, timeout=2).text)
+                for connection in idle_connections:
+                    connection.close()
+
+                with ThreadPoolExecutor(1) as executor:
+                    in_flight = executor.submit(requests.get, f'{address}/slow')
+                    time.sleep(0.3)
+                    fork.terminate()
+                    self.assertEqual('OK', in_flight.result().text)
+                self.assertRaises(requests.exceptions.ConnectionError, lambda: requests.get(address))
+            finally:
+                fork.terminate()
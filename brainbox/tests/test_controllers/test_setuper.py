@@ -0,0 +1,98 @@
+from unittest import TestCase
+from brainbox.framework import (
+    ControllerOverDecider, ControllersSetup, ControllerServiceStatus, ControllerRegistry, IDecider, Loc, FileIO, Locator
+)
+from threading import Thread
+from brainbox.framework.controllers.app.setuper import Setuper
+from brainbox.framework.controllers.app.service import ControllerService, ControllerServerSettings
+from brainbox.framework.controllers.app.dto import InstallationReport
+import time
+
+
+class SleepingController(ControllerOverDecider):
+    def __init__(self, name: str, fail: bool = False):
+        super().__init__(IDecider(), name)
+        self.fail = fail
+        self.installations = 0
+
+    def install(self):
+        self.installations += 1
+        time.sleep(0.5)
+        if self.fail:
+            raise ValueError("Installation failed")
+
+
+class FakeService:
+    def __init__(self, controllers: list[SleepingController], installed: set[str] = frozenset()):
+        self.controllers = {c.get_name(): c for c in controllers}
+        self.installed = installed
+
+    def get_controller(self, decider):
+        return self.controllers[ControllerRegistry.to_controller_name(decider)]
+
+    def status(self):
+        return ControllerServiceStatus(
+            [
+                ControllerServiceStatus.Controller(name, ControllerServiceStatus.InstallationStatus(name in self.installed, False))
+                for name in self.controllers
+            ],
+            None
+        )
+
+
+class FakeControllerService(ControllerService):
+    def __init__(self, controllers: list[SleepingController], locator: Locator):
+        super().__init__(ControllerServerSettings(ControllerRegistry(controllers, locator)))
+        self.fake = FakeService(controllers)
+
+    def status(self):
+        return self.fake.status()
+
+
+class SetuperTestCase(TestCase):
+    def test_parallel_setup(self):
+        service = FakeService([SleepingController('a'), SleepingController('b'), SleepingController('c')], {'c'})
+        setup = ControllersSetup((ControllersSetup.Instance('a'), ControllersSetup.Instance('b'), ControllersSetup.Instance('c')))
+        begin = time.monotonic()
+        report = Setuper(setup, service, max_parallelism=2).make_all()
+        self.assertLess(time.monotonic() - begin, 0.9)
+        statuses = {step.name: step.status for step in report.steps}
+        self.assertEqual(InstallationReport.Step.Status.Done, statuses['install a'])
+        self.assertEqual(InstallationReport.Step.Status.Skipped, statuses['install c'])
+        self.assertEqual(InstallationReport.Step.Status.Done, statuses['run c'])
+        self.assertGreaterEqual(report.steps[0].duration_in_seconds, 0.5)
+        self.assertEqual(0, service.controllers['c'].installations)
+
+    def test_interrupted_installation_is_resumed(self):
+        with Loc.create_test_folder() as folder:
+            journal = folder/'journal.json'
+            setup = ControllersSetup((ControllersSetup.Instance('a'), ControllersSetup.Instance('b')))
+            failing = FakeService([SleepingController('a'), SleepingController('b', fail=True)])
+            with self.assertRaises(ValueError):
+                Setuper(setup, failing, journal_path=journal).make_all()
+            self.assertListEqual(['b'], FileIO.read_json(journal))
+
+            # The image of b may exist now, but its installation didn't finish, so it is repeated
+            service = FakeService([SleepingController('a'), SleepingController('b')], {'a', 'b'})
+            report = Setuper(setup, service, journal_path=journal).make_all()
+            self.assertEqual(0, service.controllers['a'].installations)
+            self.assertEqual(1, service.controllers['b'].installations)
+            self.assertListEqual([], FileIO.read_json(journal))
+            self.assertIsNone(report.error)
+
+    def test_concurrent_setup_is_rejected(self):
+        with Loc.create_test_folder() as folder:
+            a = SleepingController('a')
+            service = FakeControllerService([a, SleepingController('b')], Locator(folder))
+            setup = ControllersSetup((ControllersSetup.Instance('a'),))
+            thread = Thread(target=service.setup, args=(setup,))
+            thread.start()
+            while a.installations == 0:
+                time.sleep(0.01)
+            with self.assertRaises(ValueError):
+                service.setup(setup)
+            with self.assertRaises(ValueError):
+                service.install('b')
+            thread.join()
+            self.assertEqual(1, a.installations)
+            self.assertIsNone(service.running_setup)
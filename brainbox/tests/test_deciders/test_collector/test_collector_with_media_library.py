@@ -105,3 +105,16 @@ class CollectorWithMediaLibraryTestCase(TestCase):
             result = api.summary()
             batches = [r['batch'] for r in result]
             self.assertEqual(1, len(set(batches)))
+
+    def test_media_library_records_are_streamed(self):
+        with BrainBoxApi.ServerlessTest([FakeFile(), Collector()]) as api:
+            tasks = (
+                Query
+                .en(range(3))
+                .select(lambda z: dict(prefix=z))
+                .feed(Collector.FunctionalTaskBuilder(
+                    lambda z: BrainBoxTask.call(FakeFile)(z),
+                )))
+            api.add(tasks)
+            records = list(api.iterate_results(tasks))
+            self.assertEqual([0, 1, 2], list(sorted(r.tags['prefix'] for r in records)))
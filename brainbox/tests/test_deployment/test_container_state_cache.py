@@ -0,0 +1,88 @@
+from brainbox.framework.deployment import IExecutor, Command, Machine, LocalFileSystem, ContainerStateCache
+from unittest import TestCase
+import json
+
+
+class FakeDockerExecutor(IExecutor):
+    def __init__(self, containers: list[dict]):
+        self.containers = containers
+        self.commands = []
+
+    def get_fs(self):
+        return LocalFileSystem()
+
+    def get_machine(self) -> Machine:
+        return Machine(1000, 1000, '10.0.0.1', 'fake')
+
+    def execute_command(self, command: Command):
+        self.commands.append(command.command)
+        if command.command[:2] == ('docker', 'ps'):
+            return '\n'.join(c['Id'][:12] for c in self.containers) + '\n'
+        if command.command[:2] == ('docker', 'inspect'):
+            lines = [
+                json.dumps(dict(id=c['Id'], name='/'+c['Name'], image=c['Image'], env=c['Env']))
+                for c in self.containers
+            ]
+            return '\n'.join(lines + ['Error: No such object: gone'])
+        raise ValueError(f"Unexpected command {command.command}")
+
+
+class ContainerStateCacheTestCase(TestCase):
+    def test_cache(self):
+        executor = FakeDockerExecutor([
+            dict(Id='a'*64, Name='whisper', Image='whisper', Env=['PATH=/bin', 'BRAINBOX_PARAMETER=*base']),
+            dict(Id='b'*64, Name='ollama', Image='ollama:latest', Env=['BRAINBOX_PARAMETER=']),
+            dict(Id='c'*64, Name='other', Image='registry:5000/other:1.0', Env=None),
+        ])
+        cache = ContainerStateCache()
+        whisper = cache.get_containers_by_image(executor, 'whisper:latest')
+        self.assertEqual(1, len(whisper))
+        self.assertEqual('a'*12, whisper[0].id)
+        self.assertEqual('whisper', whisper[0].name)
+        self.assertEqual('*base', whisper[0].environment['BRAINBOX_PARAMETER'])
+        self.assertEqual(['b'*12], [c.id for c in cache.get_containers_by_image(executor, 'ollama')])
+        self.assertEqual(['c'*12], [c.id for c in cache.get_containers_by_image(executor, 'registry:5000/other:1.0')])
+        self.assertEqual(2, len(executor.commands))
+
+        cache.invalidate()
+        cache.get_containers(executor)
+        self.assertEqual(4, len(executor.commands))
+
+    def test_shared_per_machine(self):
+        executor = FakeDockerExecutor([])
+        self.assertIs(ContainerStateCache.for_executor(executor), ContainerStateCache.for_executor(FakeDockerExecutor([])))
+        self.assertEqual([], ContainerStateCache.for_executor(executor).get_containers(executor))
+
+    def test_controller_reads_parameter_from_cache(self):
+        from brainbox.framework.controllers.controller import DockerController
+
+        class Controller(DockerController):
+            def __init__(self, executor):
+                self.executor = executor
+                self.cache = ContainerStateCache()
+
+            def get_executor(self):
+                return self.executor
+
+            def get_container_state_cache(self):
+                return self.cache
+
+            def get_default_settings(self):
+                return None
+
+            def run(self, parameter: str|None = None):
+                raise NotImplementedError()
+
+            def find_api(self, instance_id: str):
+                return None
+
+            def _self_test_internal(self, api, tc):
+                return []
+
+        executor = FakeDockerExecutor([dict(Id='a'*64, Name='whisper', Image='whisper', Env=['BRAINBOX_PARAMETER=*base'])])
+        controller = Controller(executor)
+        self.assertEqual('base', controller.instance_id_to_parameter('a'*12))
+        self.assertEqual('base', controller.instance_id_to_parameter('a'*64))
+        self.assertNotIn('exec', [command[1] for command in executor.commands])
+        with self.assertRaises(ValueError):
+            controller.instance_id_to_parameter('b'*12)
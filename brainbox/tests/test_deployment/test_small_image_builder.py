@@ -0,0 +1,62 @@
+from brainbox.framework.deployment import IExecutor, Command, Machine, LocalFileSystem, SmallImageBuilder
+from brainbox.framework import Loc
+from unittest import TestCase
+from yo_fluq import FileIO
+
+
+class RecordingExecutor(IExecutor):
+    def __init__(self):
+        self.commands = []
+
+    def get_fs(self):
+        return LocalFileSystem()
+
+    def get_machine(self) -> Machine:
+        return Machine(1000, 1000, '127.0.0.1', 'fake')
+
+    def execute_command(self, command: Command):
+        self.commands.append(command.command)
+
+
+TEMPLATE = f'''
+FROM python:3.11
+
+{{{SmallImageBuilder.ADD_USER_PLACEHOLDER}}}
+
+{{{SmallImageBuilder.PIP_INSTALL_PLACEHOLDER}}}
+
+COPY . /home/app/
+'''
+
+
+class SmallImageBuilderTestCase(TestCase):
+    def build(self, template: str, use_build_cache: bool|None):
+        with Loc.create_test_folder() as folder:
+            executor = RecordingExecutor()
+            SmallImageBuilder(folder, template, ['flask', 'requests'], use_build_cache=use_build_cache).build_image('image', executor)
+            return FileIO.read_text(folder/'Dockerfile'), executor.commands[0]
+
+    def test_default_build(self):
+        dockerfile, command = self.build(TEMPLATE, None)
+        self.assertIn('rm -rf /tmp/wheels', dockerfile)
+        self.assertNotIn('--mount', dockerfile)
+        self.assertEqual(('docker', 'build', '-t', 'image', '.'), command)
+
+    def test_build_cache(self):
+        dockerfile, command = self.build(TEMPLATE, True)
+        self.assertTrue(dockerfile.startswith('# syntax=docker/dockerfile:1\n'))
+        self.assertIn(f'--mount=type=cache,id={SmallImageBuilder.WheelhouseCacheId}', dockerfile)
+        self.assertIn(f'--find-links={SmallImageBuilder.WheelhousePath} flask requests', dockerfile)
+        self.assertLess(dockerfile.index('--mount'), dockerfile.index('COPY'))
+        self.assertEqual(('env', 'DOCKER_BUILDKIT=1', 'docker', 'build', '-t', 'image', '.'), command)
+
+    def test_build_cache_requires_dependencies_before_code(self):
+        template = f'''
+FROM python:3.11
+
+COPY . /home/app/
+
+{{{SmallImageBuilder.PIP_INSTALL_PLACEHOLDER}}}
+'''
+        with self.assertRaises(ValueError):
+            self.build(template, True)
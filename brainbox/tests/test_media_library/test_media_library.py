@@ -1,7 +1,8 @@
 import json
+import zipfile
 import os
 
-from brainbox.framework import MediaLibrary, Loc
+from brainbox.framework import MediaLibrary, MediaLibraryArchive, Loc
 from unittest import TestCase
 from uuid import uuid4
 from yo_fluq import FileIO, Query
@@ -73,3 +74,134 @@ class MediaLibraryTestCase(TestCase):
 
 
 
+
+    def test_find_positions(self):
+        records = [
+            MediaLibrary.Record(f'{i}', None, tags=dict(character=['a', 'b', 'c'][i % 3], i=i, options=[i]), inline_content=i)
+            for i in range(30)
+        ]
+        records.append(MediaLibrary.Record('no_tags', None, inline_content=-1))
+        lib = MediaLibrary(tuple(records))
+        self.assertListEqual(list(range(1, 30, 3)), list(lib.find_positions(dict(character='b'))))
+        self.assertListEqual([4], list(lib.find_positions(dict(character='b', i=4))))
+        self.assertListEqual([], list(lib.find_positions(dict(character='b', i=5))))
+        self.assertListEqual([], list(lib.find_positions(dict(character='d'))))
+        self.assertListEqual([7], list(lib.find_positions(dict(options=[7]))))
+        self.assertEqual(31, len(lib.find_positions({})))
+
+        df = lib.to_df(lib.find_positions(dict(character='c')))
+        self.assertListEqual([str(i) for i in range(2, 30, 3)], list(df.filename))
+        df['feedback_seen'] = 1
+        self.assertNotIn('feedback_seen', lib.to_df().columns)
+
+    def test_archive(self):
+        with Loc.create_test_folder('tests/medialibrary') as folder:
+            create_library(folder)
+            MediaLibrary.convert_to_archive(folder/'lib.mla', folder/'lb_0.zip')
+            lib = MediaLibrary.read(folder/'lib.mla')
+            self.assertEqual(10, len(lib.records))
+            for rec in lib.records:
+                self.assertDictEqual(dict(i=rec.tags['i'], lb=rec.tags['lb']), json.loads(rec.get_content()))
+
+            addition = MediaLibrary((
+                MediaLibrary.Record('image.png', folder/'src', tags=dict(lb=2)),
+                MediaLibrary.Record('inline', None, tags=dict(lb=3), inline_content='inline value'),
+            ))
+            FileIO.write_bytes(b'png content', folder/'src'/'image.png')
+            size_before = (folder/'lib.mla').stat().st_size
+            MediaLibrary.read(folder/'lb_1.zip').append_to(folder/'lib.mla')
+            addition.append_to(folder/'lib.mla')
+            self.assertGreater((folder/'lib.mla').stat().st_size, size_before)
+
+            lib = MediaLibrary.read(folder/'lib.mla')
+            self.assertEqual(24, len(lib.records))
+            for rec in lib.records[:22]:
+                self.assertDictEqual(dict(i=rec.tags['i'], lb=rec.tags['lb']), json.loads(rec.get_content()))
+            view = lib['image.png'].get_content_view()
+            self.assertIsInstance(view.obj, type(MediaLibraryArchive.open(folder/'lib.mla')._mmap))
+            self.assertEqual(b'png content', bytes(view))
+            self.assertEqual('inline value', lib['inline'].get_content())
+
+            ulib = lib.unzip(folder/'unzip')
+            self.assertEqual(b'png content', ulib['image.png'].get_content())
+
+    def test_archive_interrupted_append(self):
+        with Loc.create_test_folder('tests/medialibrary') as folder:
+            create_library(folder)
+            MediaLibrary.convert_to_archive(folder/'lib.mla', folder/'lb_0.zip')
+            size_before = (folder/'lib.mla').stat().st_size
+            addition = MediaLibrary.read(folder/'lb_1.zip')
+
+            def interrupted_items():
+                for index, (record, content) in enumerate(addition.enumerate_content()):
+                    if index == 5:
+                        raise KeyboardInterrupt()
+                    yield MediaLibrary._get_description(record), content
+
+            with self.assertRaises(KeyboardInterrupt):
+                MediaLibraryArchive.write(folder/'lib.mla', interrupted_items(), append=True)
+            self.assertGreater((folder/'lib.mla').stat().st_size, size_before)
+
+            lib = MediaLibrary.read(folder/'lib.mla')
+            self.assertEqual(10, len(lib.records))
+            for rec in lib.records:
+                self.assertDictEqual(dict(i=rec.tags['i'], lb=0), json.loads(rec.get_content()))
+
+            addition.append_to(folder/'lib.mla')
+            lib = MediaLibrary.read(folder/'lib.mla')
+            self.assertEqual(22, len(lib.records))
+            for rec in lib.records:
+                self.assertDictEqual(dict(i=rec.tags['i'], lb=rec.tags['lb']), json.loads(rec.get_content()))
+
+    def test_zip_append_with_progress(self):
+        with Loc.create_test_folder('tests/medialibrary') as folder:
+            create_library(folder)
+            FileIO.write_bytes(b'png content', folder/'src'/'image.png')
+            addition = MediaLibrary((MediaLibrary.Record('image.png', folder/'src', tags=dict(lb=2)),), ('error',))
+            progress = []
+            MediaLibrary.read(folder/'lb_1.zip').append_to(folder/'lb_0.zip', on_progress=progress.append)
+            addition.append_to(folder/'lb_0.zip', max_workers=1)
+            self.assertEqual(12, len(progress))
+            self.assertEqual(1, progress[-1])
+
+            lib = MediaLibrary.read(folder/'lb_0.zip')
+            self.assertEqual(23, len(lib.records))
+            self.assertEqual(('error',), lib.errors)
+            for rec in lib.records[:22]:
+                self.assertDictEqual(dict(i=rec.tags['i'], lb=rec.tags['lb']), json.loads(rec.get_content()))
+            self.assertEqual(b'png content', lib['image.png'].get_content())
+            with zipfile.ZipFile(folder/'lb_0.zip') as zp:
+                self.assertEqual(zipfile.ZIP_STORED, zp.getinfo('image.png').compress_type)
+                self.assertEqual(zipfile.ZIP_DEFLATED, zp.getinfo(lib.records[0].filename).compress_type)
+
+            with self.assertRaises(ValueError):
+                addition.append_to(folder/'lb_0.zip')
+
+    def test_zip_resume(self):
+        with Loc.create_test_folder('tests/medialibrary') as folder:
+            create_library(folder)
+            lib = MediaLibrary.read(folder/'lb_0.zip').unzip(folder/'unzipped')
+            missing = lib.records[5]
+            content = FileIO.read_bytes(folder/'unzipped'/missing.filename)
+            os.remove(folder/'unzipped'/missing.filename)
+
+            with self.assertRaises(FileNotFoundError):
+                lib.save(folder/'resumed.zip', max_workers=1)
+            self.assertFalse((folder/'resumed.zip').is_file())
+            with self.assertRaises(FileNotFoundError):
+                lib.append_to(folder/'lb_1.zip', max_workers=1)
+            self.assertEqual(12, len(MediaLibrary.read(folder/'lb_1.zip').records))
+
+            # The entries written before the interruption are not read again
+            for record in lib.records[:5]:
+                os.remove(folder/'unzipped'/record.filename)
+            FileIO.write_bytes(content, folder/'unzipped'/missing.filename)
+            progress = []
+            lib.save(folder/'resumed.zip', on_progress=progress.append)
+            self.assertEqual([i/10 for i in range(6, 11)], progress)
+            self.assertListEqual(['resumed.zip'], [f for f in os.listdir(folder) if f.startswith('resumed')])
+
+            resumed = MediaLibrary.read(folder/'resumed.zip')
+            self.assertEqual(10, len(resumed.records))
+            for rec in resumed.records:
+                self.assertDictEqual(dict(i=rec.tags['i'], lb=0), json.loads(rec.get_content()))
@@ -0,0 +1,46 @@
+from unittest import TestCase
+from brainbox.framework import (
+    Job, JobPayload, Loc, Core, ControllerRegistry, IDecider, MainLoop, SimplePlanner, SqliteJobStore
+)
+from sqlalchemy import insert
+from datetime import datetime
+import time
+
+
+class TestDecider(IDecider):
+    def __call__(self, arg):
+        return f'OK-{arg}'
+
+
+class LoopIterationBenchmark(TestCase):
+    def fill(self, store: SqliteJobStore, historical_count: int, waiting_count: int):
+        now = datetime.now()
+        chunk = 50000
+        with store.engine.begin() as connection:
+            for start in range(0, historical_count+waiting_count, chunk):
+                ids = range(start, min(start+chunk, historical_count+waiting_count))
+                connection.execute(insert(Job), [dict(
+                    id=str(i), decider='TestDecider', batch=str(i), received_timestamp=now, has_dependencies=False,
+                    ready=True, assigned=True, accepted=True, finished=i < historical_count, success=i < historical_count,
+                    finished_timestamp=now
+                ) for i in ids])
+                connection.execute(insert(JobPayload), [dict(id=str(i), arguments=dict(arg='x'*1000), result='x'*1000) for i in ids])
+
+    def measure(self, historical_count: int, iterations: int = 20):
+        with Loc.create_test_file() as file:
+            store = SqliteJobStore(file)
+            store.initialize()
+            self.fill(store, historical_count, 10)
+            core = Core(store, ControllerRegistry([TestDecider()]))
+            loop = MainLoop(core, SimplePlanner())
+            loop.one_iteration()
+            begin = time.perf_counter()
+            for _ in range(iterations):
+                loop.one_iteration()
+            result = (time.perf_counter() - begin) / iterations
+            store.dispose()
+        return result
+
+    def dont_test_loop_iteration(self):
+        for count in [10_000, 100_000, 1_000_000]:
+            print(f'{count} historical jobs: {1000*self.measure(count):.2f} ms per iteration')
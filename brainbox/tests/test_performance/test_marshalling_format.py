@@ -0,0 +1,27 @@
+from unittest import TestCase
+from brainbox.framework.common.marshalling.format import Format
+import json
+import time
+
+
+class MarshallingFormatTestCase(TestCase):
+    def _measure(self, encode, decode, data, repetitions):
+        begin = time.monotonic()
+        for _ in range(repetitions):
+            body = encode(data)
+            decode(body)
+        return (time.monotonic() - begin)/repetitions, len(body)
+
+    def dont_test_json_against_binary(self):
+        for seconds in [1, 10, 60]:
+            # 16-bit mono wav at 22050 Hz
+            content = bytes(range(256))*(seconds*22050*2//256)
+            data = dict(result=content, error=None)
+            json_time, json_size = self._measure(
+                lambda z: json.dumps(Format.encode(z)).encode('utf-8'),
+                lambda z: Format.decode(json.loads(z)),
+                data,
+                10
+            )
+            binary_time, binary_size = self._measure(Format.encode_binary, Format.decode_binary, data, 10)
+            print(f'{seconds}s: json {json_time*1000:.1f}ms {json_size}b, binary {binary_time*1000:.1f}ms {binary_size}b')
@@ -59,3 +59,34 @@ class CheckReadyActionTestCase(TestCase):
             engine.dispose()
 
 
+    def test_readiness_of_added_jobs(self):
+        with Loc.create_test_file() as file:
+            engine = create_engine('sqlite:///'+str(file))
+            BrainBoxBase.metadata.create_all(engine)
+            core = Core(engine, ControllerRegistry([A()]))
+            CheckReadyAction().apply(core)
+
+            with Session(engine) as session:
+                job_0 = BrainBoxTask.call(A)().to_task(id='0')
+                job_1 = BrainBoxTask.call(A)().to_task(id='1')
+                job_2 = BrainBoxTask.call(A)().to_task(id='2')
+                job_3 = BrainBoxTask.call(A)(a=job_0, b=job_1).to_task(id='3')
+                jobs = BrainBoxTask.to_all_jobs([job_0, job_1, job_2, job_3])
+                for job in jobs:
+                    session.add(job.set_defaults())
+                dependencies = [(job.id, job.dependencies) for job in jobs]
+                session.commit()
+            core.dependency_index.on_jobs_added(dependencies)
+
+            CheckReadyAction().apply(core)
+            self.check(core, (True, True, True, False))
+
+            self.close(core, '0')
+            CheckReadyAction().apply(core)
+            self.check(core, (True, True, True, False))
+
+            self.close(core, '1')
+            CheckReadyAction().apply(core)
+            self.check(core, (True, True, True, True))
+
+            engine.dispose()
@@ -0,0 +1,78 @@
+from unittest import TestCase, skipIf
+from brainbox.framework import BrainBoxApi, BrainBoxTask, IDecider, InMemoryJobStore, PostgresJobStore, Job, JobPayload
+from sqlalchemy import text, delete
+from threading import Thread
+from uuid import uuid4
+import pickle
+import os
+
+
+class A(IDecider):
+    def __call__(self, a=1, b=2):
+        return a+b
+
+
+class JobStoreTestCase(TestCase):
+    def test_in_memory_store(self):
+        with BrainBoxApi.ServerlessTest([A()], job_store=InMemoryJobStore()) as api:
+            source = BrainBoxTask.call(A)(a=2, b=3).to_task(id='source')
+            dependent = BrainBoxTask.call(A)(a=source, b=10).to_task(id='dependent')
+            self.assertListEqual([5, 15], api.execute([source, dependent]))
+            self.assertEqual(2, len(api.summary()))
+
+    def test_in_memory_store_is_picklable(self):
+        store = InMemoryJobStore()
+        store.initialize()
+        restored = pickle.loads(pickle.dumps(store))
+        restored.initialize()
+        with restored.create_session() as session:
+            self.assertIsNotNone(session)
+        store.dispose()
+        restored.dispose()
+
+    def test_in_memory_store_locks_per_transaction(self):
+        store = InMemoryJobStore()
+        store.initialize()
+        idle = store.create_session()
+        idle.execute(text('SELECT 1'))
+        idle.commit()
+        # The idle session is never closed, but it is not in a transaction, so other threads are not blocked
+        result = []
+
+        def query():
+            with store.create_session() as session:
+                result.append(session.execute(text('SELECT 2')).scalar())
+
+        thread = Thread(target=query)
+        thread.start()
+        thread.join(5)
+        self.assertEqual([2], result)
+        idle.close()
+        store.dispose()
+
+
+@skipIf(os.environ.get('BRAINBOX_TEST_POSTGRES_URL') is None, 'BRAINBOX_TEST_POSTGRES_URL is not set')
+class PostgresJobStoreTestCase(TestCase):
+    def test_claim_skips_locked_jobs(self):
+        store = PostgresJobStore(os.environ['BRAINBOX_TEST_POSTGRES_URL'])
+        store.initialize()
+        ids = [f'claim-test-{uuid4()}' for _ in range(4)]
+        with store.create_session() as session:
+            for index, id in enumerate(ids):
+                job = Job(id=id, decider='A', arguments={}).set_defaults()
+                job.ready = True
+                job.ordering_token = str(index)
+                session.add(job)
+            session.commit()
+        try:
+            with store.create_session() as first, store.create_session() as second:
+                claimed_first = store.claim_for_assignment(first, ids[:2])
+                claimed_second = store.claim_for_assignment(second, ids)
+                self.assertEqual(ids[:2], [job.id for job in claimed_first])
+                self.assertEqual(ids[2:], [job.id for job in claimed_second])
+        finally:
+            with store.create_session() as session:
+                session.execute(delete(JobPayload).where(JobPayload.id.in_(ids)))
+                session.execute(delete(Job).where(Job.id.in_(ids)))
+                session.commit()
+            store.dispose()
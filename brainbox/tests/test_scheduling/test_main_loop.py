@@ -0,0 +1,45 @@
+from unittest import TestCase
+from brainbox.framework import BrainBoxApi, BrainBoxTask, IDecider, InMemoryJobStore
+from sqlalchemy import event
+from threading import Event
+import time
+
+
+class BlockingDecider(IDecider):
+    def __init__(self):
+        self.started = Event()
+        self.release = Event()
+
+    def __call__(self):
+        self.started.set()
+        self.release.wait(10)
+        return 'OK'
+
+
+class MainLoopTestCase(TestCase):
+    def test_wakes_on_events_and_is_quiet_when_idle(self):
+        decider = BlockingDecider()
+        with BrainBoxApi.ServerlessTest([decider], job_store=InMemoryJobStore()) as api:
+            # With this timeout, only the wake-ups can make the loop react within the test
+            api.loop.idle_timeout_in_seconds = 60
+            time.sleep(1.5)
+
+            task = BrainBoxTask.call(BlockingDecider)().to_task(id='blocking')
+            api.add(task)
+            self.assertTrue(decider.started.wait(5))
+
+            begin = time.monotonic()
+            decider.release.set()
+            self.assertEqual(['OK'], api.base_join([task.id], time_limit_in_secods=5))
+            self.assertLess(time.monotonic() - begin, 5)
+
+            statements = []
+            event.listen(api.store.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+            api.loop.idle_timeout_in_seconds = 0.01
+            api.loop.notify()
+            time.sleep(0.5)
+            # The notified iteration reads the database, the idle ones after it don't
+            self.assertGreater(len(statements), 0)
+            statements.clear()
+            time.sleep(0.5)
+            self.assertEqual([], statements)
@@ -0,0 +1,55 @@
+from unittest import TestCase
+from brainbox.framework.job_processing import StartCommand, DurationEstimates, DeciderInstanceKey
+from brainbox import CostModelPlanner
+from .test_simple_planner import Scene
+
+
+class CostModelPlannerTestCase(TestCase):
+    def make_test(self, scene: Scene, estimates: DurationEstimates):
+        args = scene.get_args()
+        args.duration_estimates = estimates
+        result = CostModelPlanner().plan(args)
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], StartCommand)
+        return result[0].key.decider_name
+
+    def test_prefers_fast_tasks(self):
+        estimates = DurationEstimates()
+        estimates.on_job_processed('a', None, None, 10)
+        estimates.on_job_processed('b', None, None, 1)
+        self.assertEqual('b', self.make_test(Scene().task('a', count=3).task('b', count=2), estimates))
+
+    def test_accounts_for_startup(self):
+        estimates = DurationEstimates()
+        estimates.on_job_processed('a', None, None, 1)
+        estimates.on_job_processed('b', None, None, 1)
+        estimates.on_decider_started(DeciderInstanceKey('a', None), 100)
+        estimates.on_decider_started(DeciderInstanceKey('b', None), 1)
+        self.assertEqual('b', self.make_test(Scene().task('a', count=3).task('b', count=2), estimates))
+
+    def test_startup_is_amortized(self):
+        estimates = DurationEstimates()
+        estimates.on_job_processed('a', None, None, 1)
+        estimates.on_job_processed('b', None, None, 1)
+        estimates.on_decider_started(DeciderInstanceKey('a', None), 20)
+        estimates.on_decider_started(DeciderInstanceKey('b', None), 10)
+        self.assertEqual('a', self.make_test(Scene().task('a', count=20).task('b', count=2), estimates))
+
+    def test_respects_ordering_token(self):
+        estimates = DurationEstimates()
+        estimates.on_job_processed('a', None, None, 10)
+        estimates.on_job_processed('b', None, None, 1)
+        scene = (
+            Scene()
+            .task('a', count=3, ordering_token='1')
+            .task('b', count=2, ordering_token='2')
+        )
+        self.assertEqual('a', self.make_test(scene, estimates))
+
+    def test_estimates_smoothing(self):
+        estimates = DurationEstimates(smoothing=0.5, default_processing_in_seconds=7)
+        estimates.on_job_processed('a', 'x', 'm', 10)
+        estimates.on_job_processed('a', 'x', 'm', 20)
+        self.assertEqual(15, estimates.get_processing_time('a', 'x', 'm'))
+        self.assertEqual(15, estimates.get_processing_time('a', 'y', 'm'))
+        self.assertEqual(7, estimates.get_processing_time('a', 'x', 'n'))
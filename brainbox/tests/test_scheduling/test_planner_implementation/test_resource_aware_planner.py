@@ -0,0 +1,171 @@
+from unittest import TestCase
+from brainbox.framework.job_processing import StartCommand, StopCommand, AssignAction
+from brainbox.framework import ResourceCost
+from brainbox import ResourceAwarePlanner
+from datetime import datetime
+from .test_simple_planner import Scene
+
+
+class ResourceAwarePlannerTestCase(TestCase):
+    def make_test(self, scene: Scene, limits: ResourceCost = ResourceCost(memory_in_gb=4, cpu_cores=4)):
+        planner = ResourceAwarePlanner(limits, datetime_factory=lambda: datetime(2020, 1, 1, 12))
+        return planner.plan(scene.get_args())
+
+    def test_starts_several(self):
+        result = self.make_test(
+            Scene()
+            .task('a', count=2)
+            .task('b', count=1)
+            .cost('a', ResourceCost(memory_in_gb=2))
+            .cost('b', ResourceCost(memory_in_gb=2))
+        )
+        self.assertListEqual(['a', 'b'], [r.key.decider_name for r in result])
+        self.assertTrue(all(isinstance(r, StartCommand) for r in result))
+
+    def test_respects_limits(self):
+        result = self.make_test(
+            Scene()
+            .task('a', count=2)
+            .task('b', count=1)
+            .cost('a', ResourceCost(memory_in_gb=3))
+            .cost('b', ResourceCost(memory_in_gb=2))
+        )
+        self.assertEqual(1, len(result))
+        self.assertEqual('a', result[0].key.decider_name)
+
+    def test_assigns_to_all_active(self):
+        result = self.make_test(
+            Scene()
+            .task('a', count=3)
+            .task('b', count=1)
+            .state('a')
+            .state('b')
+        )
+        self.assertTrue(all(isinstance(r, AssignAction) for r in result))
+        self.assertListEqual(['0', '1', '3'], [r.job_id for r in result])
+
+    def test_keeps_idle_warm(self):
+        result = self.make_test(
+            Scene()
+            .task('a')
+            .state('a')
+            .state('b', busy=False, not_busy_since=datetime(2020, 1, 1, 11, 59))
+        )
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], AssignAction)
+
+    def test_stops_after_cooldown(self):
+        result = self.make_test(
+            Scene()
+            .state('b', busy=False, not_busy_since=datetime(2020, 1, 1, 11))
+        )
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], StopCommand)
+
+    def test_evicts_least_recently_used(self):
+        result = self.make_test(
+            Scene()
+            .task('c')
+            .state('a', busy=False, not_busy_since=datetime(2020, 1, 1, 11, 59))
+            .state('b', busy=False, not_busy_since=datetime(2020, 1, 1, 11, 58))
+            .cost('a', ResourceCost(memory_in_gb=2))
+            .cost('b', ResourceCost(memory_in_gb=2))
+            .cost('c', ResourceCost(memory_in_gb=2))
+        )
+        self.assertEqual(2, len(result))
+        self.assertIsInstance(result[0], StopCommand)
+        self.assertEqual('1', result[0].instance_id)
+        self.assertIsInstance(result[1], StartCommand)
+        self.assertEqual('c', result[1].key.decider_name)
+
+    def test_does_not_evict_working(self):
+        result = self.make_test(
+            Scene()
+            .task('a', assigned=True, count=2)
+            .task('c')
+            .state('a')
+            .cost('a', ResourceCost(memory_in_gb=3))
+            .cost('c', ResourceCost(memory_in_gb=2))
+        )
+        self.assertEqual(0, len(result))
+
+    def test_oversized_starts_alone(self):
+        result = self.make_test(
+            Scene()
+            .task('a')
+            .state('b', busy=False, not_busy_since=datetime(2020, 1, 1, 11, 59))
+            .cost('a', ResourceCost(memory_in_gb=8))
+        )
+        self.assertEqual(2, len(result))
+        self.assertIsInstance(result[0], StopCommand)
+        self.assertIsInstance(result[1], StartCommand)
+
+    def test_unspecified_limit_is_unlimited(self):
+        result = self.make_test(
+            Scene()
+            .task('a')
+            .cost('a', ResourceCost(memory_in_gb=2, cpu_cores=2, gpu_memory_in_gb=1)),
+            ResourceCost(memory_in_gb=4)
+        )
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], StartCommand)
+
+    def test_prestarts_for_upcoming_tasks(self):
+        result = self.make_test(
+            Scene()
+            .task('a')
+            .upcoming('b', 3)
+            .cost('a', ResourceCost(memory_in_gb=2))
+            .cost('b', ResourceCost(memory_in_gb=2))
+        )
+        self.assertListEqual(['a', 'b'], [r.key.decider_name for r in result])
+        self.assertTrue(all(isinstance(r, StartCommand) for r in result))
+        self.assertListEqual([False, True], [r.speculative for r in result])
+
+    def test_failed_prestart_is_not_retried_immediately(self):
+        now = [datetime(2020, 1, 1, 12)]
+        planner = ResourceAwarePlanner(ResourceCost(memory_in_gb=4), datetime_factory=lambda: now[0])
+        scene = Scene().upcoming('b')
+        self.assertEqual(1, len(planner.plan(scene.get_args())))
+        self.assertEqual(0, len(planner.plan(scene.get_args())))
+        now[0] = datetime(2020, 1, 1, 12, 2)
+        self.assertEqual(1, len(planner.plan(scene.get_args())))
+
+    def test_does_not_evict_warming_up(self):
+        result = self.make_test(
+            Scene()
+            .task('c')
+            .state('a', busy=True, not_busy_since=datetime(2020, 1, 1, 11))
+            .cost('a', ResourceCost(memory_in_gb=3))
+            .cost('c', ResourceCost(memory_in_gb=2))
+        )
+        self.assertEqual(0, len(result))
+
+    def test_prestart_does_not_evict(self):
+        result = self.make_test(
+            Scene()
+            .task('a')
+            .upcoming('b')
+            .state('c', busy=False, not_busy_since=datetime(2020, 1, 1, 11, 59))
+            .cost('a', ResourceCost(memory_in_gb=2))
+            .cost('b', ResourceCost(memory_in_gb=2))
+            .cost('c', ResourceCost(memory_in_gb=2))
+        )
+        self.assertEqual(1, len(result))
+        self.assertEqual('a', result[0].key.decider_name)
+
+    def test_warm_pool(self):
+        planner = ResourceAwarePlanner(
+            ResourceCost(memory_in_gb=4),
+            datetime_factory=lambda: datetime(2020, 1, 1, 12),
+            warm_pool=[ResourceAwarePlanner.WarmPoolEntry('a'), ResourceAwarePlanner.WarmPoolEntry('b', model='m')]
+        )
+        result = planner.plan(
+            Scene()
+            .state('a', busy=False, not_busy_since=datetime(2020, 1, 1, 11))
+            .get_args()
+        )
+        self.assertEqual(1, len(result))
+        self.assertIsInstance(result[0], StartCommand)
+        self.assertEqual('b', result[0].key.decider_name)
+        self.assertEqual('m', result[0].warm_up_model)
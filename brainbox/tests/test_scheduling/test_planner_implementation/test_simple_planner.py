@@ -3,6 +3,7 @@ from brainbox.framework.job_processing import (
     JobForPlanner, DeciderInstanceKey, PlannerArguments,
     OperatorStateForPlanner, StartCommand, StopCommand, AssignAction
 )
+from brainbox.framework import ResourceCost
 from brainbox import SimplePlanner
 from datetime import datetime
 
@@ -11,18 +12,35 @@ class Scene:
     def __init__(self):
         self._states = []
         self._tasks = []
-
-    def state(self, decider: str, parameter: str|None = None):
+        self._costs = {}
+        self._upcoming = {}
+
+    def state(self,
+              decider: str,
+              parameter: str|None = None,
+              busy: bool = True,
+              not_busy_since: datetime|None = None,
+              max_batch_size: int = 1
+              ):
         instance_id = str(len(self._states))
         self._states.append(OperatorStateForPlanner(
             instance_id,
             DeciderInstanceKey(decider, parameter),
-            True,
-            None
+            busy,
+            not_busy_since,
+            max_batch_size
         ))
         return self
 
-    def task(self, decider: str, parameter: str|None = None, assigned: bool = False, count: int = 1):
+    def cost(self, decider: str, cost: ResourceCost):
+        self._costs[decider] = cost
+        return self
+
+    def upcoming(self, decider: str, count: int = 1):
+        self._upcoming[DeciderInstanceKey(decider, None)] = count
+        return self
+
+    def task(self, decider: str, parameter: str|None = None, assigned: bool = False, count: int = 1, ordering_token: str|None = None):
         for i in range(count):
             task = JobForPlanner(
                 str(len(self._tasks)),
@@ -30,7 +48,7 @@ class Scene:
                 parameter,
                 received_timestamp=datetime(2020, 1, 1 + len(self._tasks)),
                 assigned=assigned,
-                ordering_token=None,
+                ordering_token=ordering_token,
 
             )
             self._tasks.append(task)
@@ -39,7 +57,9 @@ class Scene:
     def get_args(self):
         return PlannerArguments(
             tuple(self._tasks),
-            tuple(self._states)
+            tuple(self._states),
+            resource_costs=self._costs,
+            upcoming_tasks=self._upcoming
         )
 
 
@@ -144,12 +164,23 @@ class SimplePlannerTestCase(TestCase):
         self.assertIsInstance(result, AssignAction)
         self.assertEqual('1', result.job_id)
 
-
-
-
-
-
-
-
-
-
+    def test_assign_batch(self):
+        args = (
+            Scene()
+            .task('a', count=5)
+            .task('a', assigned=True, count=3)
+            .state('a', max_batch_size=3)
+            .get_args()
+        )
+        result = SimplePlanner().plan(args)
+        self.assertListEqual(['0', '1', '2'], [r.job_id for r in result])
+
+    def test_never_busy_decider_stops_after_cooldown(self):
+        # StartCommand sets not_busy_since to the start time, so an idle decider that got no tasks is still stopped
+        started = datetime(2020, 1, 1, 12)
+        scene = Scene().state('a', busy=False, not_busy_since=started)
+        planner = SimplePlanner(60, lambda: datetime(2020, 1, 1, 12, 0, 30))
+        self.assertEqual([], planner.plan(scene.get_args()))
+        planner = SimplePlanner(60, lambda: datetime(2020, 1, 1, 12, 2))
+        result = planner.plan(scene.get_args())
+        self.assertIsInstance(result[0], StopCommand)
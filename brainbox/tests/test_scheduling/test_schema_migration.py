@@ -0,0 +1,68 @@
+from unittest import TestCase
+from brainbox.framework import Job, Loc, SqliteJobStore
+from sqlalchemy import create_engine, inspect, text, select
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+import pickle
+
+OLD_SCHEMA = '''
+CREATE TABLE brain_box_jobs (
+    id VARCHAR NOT NULL,
+    decider VARCHAR NOT NULL,
+    decider_parameter VARCHAR,
+    method VARCHAR,
+    arguments BLOB NOT NULL,
+    info BLOB,
+    batch VARCHAR NOT NULL,
+    ordering_token VARCHAR,
+    received_timestamp DATETIME NOT NULL,
+    dependencies JSON,
+    has_dependencies BOOLEAN NOT NULL,
+    ready BOOLEAN NOT NULL,
+    ready_timestamp DATETIME,
+    assigned BOOLEAN NOT NULL,
+    assigned_timestamp DATETIME,
+    accepted BOOLEAN NOT NULL,
+    accepted_timestamp DATETIME,
+    progress FLOAT,
+    log JSON,
+    finished BOOLEAN NOT NULL,
+    finished_timestamp DATETIME,
+    success BOOLEAN NOT NULL,
+    result BLOB,
+    error VARCHAR,
+    PRIMARY KEY (id)
+)
+'''
+
+
+class SchemaMigrationTestCase(TestCase):
+    def test_migration_from_pickled_columns(self):
+        with Loc.create_test_file() as file:
+            engine = create_engine('sqlite:///'+str(file))
+            with engine.begin() as connection:
+                connection.execute(text(OLD_SCHEMA))
+                connection.execute(
+                    text(
+                        'INSERT INTO brain_box_jobs (id, decider, arguments, batch, received_timestamp, has_dependencies, '
+                        'ready, assigned, accepted, finished, success, result) '
+                        'VALUES (:id, :decider, :arguments, :id, :now, 0, 1, 1, 1, 1, 1, :result)'
+                    ),
+                    dict(id='old', decider='A', arguments=pickle.dumps(dict(a=1)), now=datetime.now(), result=pickle.dumps('OK'))
+                )
+            engine.dispose()
+
+            store = SqliteJobStore(file)
+            store.initialize()
+            inspector = inspect(store.engine)
+            columns = set(c['name'] for c in inspector.get_columns('brain_box_jobs'))
+            self.assertNotIn('arguments', columns)
+            self.assertNotIn('result', columns)
+            indexes = set(index['name'] for index in inspector.get_indexes('brain_box_jobs'))
+            self.assertIn('ix_brain_box_jobs_state', indexes)
+
+            with store.create_session() as session:
+                job = session.scalar(select(Job).where(Job.id == 'old').options(selectinload(Job.payload)))
+                self.assertDictEqual(dict(a=1), job.arguments)
+                self.assertEqual('OK', job.result)
+            store.dispose()
@@ -25,7 +25,7 @@ class ImageService:
             content.content,
             File.Kind.Image
         )
-        image.metadata = ImageMetadata(content.original_record.tags)
+        image.metadata = ImageMetadata(dict(content.original_record.tags))
         return image
 
     def get_new_image(self, state: State) -> File:
@@ -1,44 +1,129 @@
+import json
 import os
 from pathlib import Path
-from yo_fluq import FileIO
-from brainbox import MediaLibrary
+from threading import Lock
+import numpy as np
+import pandas as pd
 
 
 class FeedbackProvider:
-    def __init__(self, path):
+    # The feedback is kept in memory as one counter column per feedback key, with a row per file.
+    # The file is a log with a line per event, and the compaction replaces the events with a line per file.
+    # The file of the earlier versions, a single json, is converted at the first load
+    def __init__(self, path, compaction_threshold: int = 1000):
         self.path = Path(path)
+        self.compaction_threshold = compaction_threshold
+        self._lock = Lock()
+        self._file_to_row: dict[str, int]|None = None
+        self._columns: dict[str, np.ndarray] = {}
+        self._capacity = 0
+        self._events_since_compaction = 0
 
-    def load_feedback(self):
-        if not self.path.is_file():
-            return {}
-        return FileIO.read_json(self.path)
+    def __getstate__(self):
+        # The provider travels to the forked avatar server, which then loads the feedback from the file itself
+        return dict(path=self.path, compaction_threshold=self.compaction_threshold)
 
-    def save_feedback(self, feedback):
-        os.makedirs(self.path.parent, exist_ok=True)
-        FileIO.write_json(feedback, self.path)
+    def __setstate__(self, state):
+        self.__init__(**state)
 
+    def _add_row(self, file_id: str) -> int:
+        row = self._file_to_row.get(file_id)
+        if row is None:
+            row = len(self._file_to_row)
+            self._file_to_row[file_id] = row
+            if row >= self._capacity:
+                self._capacity = max(2*self._capacity, 16)
+                for key, column in self._columns.items():
+                    self._columns[key] = np.concatenate([column, np.zeros(self._capacity - len(column))])
+        return row
 
-    def add_feedback_to_media_library(self, ml: MediaLibrary) -> MediaLibrary:
-        ml = ml.clone()
-        feedback = self.load_feedback()
-        all_keys = set(key for fb in feedback.values() for key in fb)
-        for file_id, fb in feedback.items():
-            if file_id not in ml.mapping:
+    def _add_values(self, file_id: str, values: dict[str, int]):
+        row = self._add_row(file_id)
+        for key, value in values.items():
+            if key not in self._columns:
+                self._columns[key] = np.zeros(self._capacity)
+            self._columns[key][row] += value
+
+    def _ensure_loaded(self):
+        if self._file_to_row is not None:
+            return
+        self._file_to_row = {}
+        if not self.path.is_file():
+            return
+        with open(self.path) as stream:
+            content = stream.read()
+        if content.lstrip().startswith('{'):
+            for file_id, values in json.loads(content).items():
+                self._add_values(file_id, values)
+            self._compact()
+            return
+        for line in content.split('\n'):
+            try:
+                file_id, values = json.loads(line)
+            except ValueError:
+                # The empty line at the end, or the line that was being written when the process stopped
                 continue
-            for key in all_keys:
-                ml.mapping[file_id].tags['feedback_'+key] = fb.get(key, 0)
-        return ml
+            self._add_values(file_id, values)
+            self._events_since_compaction += 1
+        if not content.endswith('\n'):
+            # Otherwise, the next event would be appended to the broken line
+            self._compact()
 
+    def _to_dict(self) -> dict[str, dict[str, int]]:
+        result = {}
+        for file_id, row in self._file_to_row.items():
+            result[file_id] = {key: int(column[row]) for key, column in self._columns.items() if column[row] != 0}
+        return result
 
-    def append_feedback(self, file_id: str, values: dict[str, int]):
-        feedback = self.load_feedback()
-        if file_id not in feedback:
-            feedback[file_id] = values
-        else:
-            for key, value in values.items():
-                feedback[file_id][key] = feedback[file_id].get(key,0) + value
-        self.save_feedback(feedback)
+    def _compact(self):
+        os.makedirs(self.path.parent, exist_ok=True)
+        temp_path = self.path.parent/(self.path.name + '.tmp')
+        with open(temp_path, 'w') as stream:
+            for file_id, values in self._to_dict().items():
+                stream.write(json.dumps([file_id, values]) + '\n')
+        os.replace(temp_path, self.path)
+        self._events_since_compaction = 0
+
+    def load_feedback(self):
+        with self._lock:
+            self._ensure_loaded()
+            return self._to_dict()
 
+    def save_feedback(self, feedback):
+        with self._lock:
+            self._file_to_row = {}
+            self._columns = {}
+            self._capacity = 0
+            for file_id, values in feedback.items():
+                self._add_values(file_id, values)
+            self._compact()
+
+    def compact(self):
+        with self._lock:
+            self._ensure_loaded()
+            self._compact()
 
+    def get_feedback_columns(self, file_ids: pd.Series) -> dict[str, np.ndarray]:
+        # The files without feedback get NaN, as the strategies fill the missing feedback themselves
+        with self._lock:
+            self._ensure_loaded()
+            rows = file_ids.map(self._file_to_row).to_numpy(dtype=float, na_value=np.nan)
+            known = ~np.isnan(rows)
+            rows = np.where(known, rows, 0).astype(np.int64)
+            return {key: np.where(known, column[rows], np.nan) for key, column in self._columns.items()}
 
+    def add_feedback_to_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        for key, column in self.get_feedback_columns(df.filename).items():
+            df['feedback_'+key] = column
+        return df
 
+    def append_feedback(self, file_id: str, values: dict[str, int]):
+        with self._lock:
+            self._ensure_loaded()
+            os.makedirs(self.path.parent, exist_ok=True)
+            with open(self.path, 'a') as stream:
+                stream.write(json.dumps([file_id, values]) + '\n')
+            self._add_values(file_id, values)
+            self._events_since_compaction += 1
+            if self._events_since_compaction >= self.compaction_threshold:
+                self._compact()
@@ -27,10 +27,9 @@ class MediaLibraryManager:
     def find_content(self, state: dict[str, str], additional_required_tags: None|dict[str, str] = None) -> Optional['MediaLibraryManager.Record']:
         ml = self.media_library
         tag_matcher = self.tag_matcher_factory.prepare(state)
-        filtered_ids = [record.filename for record in ml.records if tag_matcher.match(record.tags, additional_required_tags)]
-        ml = ml.limit_to(filtered_ids)
-        ml = self.feedback_provider.add_feedback_to_media_library(ml)
-        choosen_id = self.strategy.choose_filename(ml)
+        positions = tag_matcher.find_positions(ml, additional_required_tags)
+        df = self.feedback_provider.add_feedback_to_df(ml.to_df(positions))
+        choosen_id = self.strategy.choose_filename(df)
         if choosen_id is None:
             return None
         return MediaLibraryManager.Record(choosen_id, ml.mapping[choosen_id].get_content(), ml.mapping[choosen_id])
@@ -1,30 +1,22 @@
 from  dataclasses import dataclass
 
 import numpy as np
+import pandas as pd
 from abc import ABC, abstractmethod
-from brainbox import MediaLibrary
 
 
 
 def get_random_weighed_element(elements) -> int:
-    csum = []
-    for element in elements:
-        if len(csum) == 0:
-            csum.append(element)
-        else:
-            csum.append(csum[-1]+element)
+    csum = np.cumsum(np.asarray(elements, dtype=float))
     rnd = np.random.rand()*csum[-1]
-    for i, cs in enumerate(csum):
-        if cs > rnd:
-            return i
-    return len(csum) - 1
+    return min(int(np.searchsorted(csum, rnd, side='right')), len(csum) - 1)
 
 
 
 
 class IContentStrategy(ABC):
     @abstractmethod
-    def choose_filename(self, ml: MediaLibrary) -> str | None:
+    def choose_filename(self, df: pd.DataFrame) -> str | None:
         pass
 
     def ensure(self, df, *required_columns):
@@ -40,8 +32,7 @@ class NewContentStrategy(IContentStrategy):
     def __init__(self, randomize: bool = True):
         self.randomize = randomize
 
-    def choose_filename(self, ml: MediaLibrary) -> str|None:
-        df = ml.to_df()
+    def choose_filename(self, df: pd.DataFrame) -> str|None:
         self.ensure(df, 'feedback_bad', 'feedback_seen')
         df = df.loc[df.feedback_bad==0]
         if df.shape[0] == 0:
@@ -55,21 +46,18 @@ class NewContentStrategy(IContentStrategy):
             return df.filename.iloc[0]
 
 class GoodContentStrategy(IContentStrategy):
-    def choose_filename(self, ml: MediaLibrary) -> str | None:
-        df = ml.to_df()
+    def choose_filename(self, df: pd.DataFrame) -> str | None:
         self.ensure(df, 'feedback_bad', 'feedback_seen', 'feedback_good')
         df = df.loc[df.feedback_bad==0]
         df = df.loc[df.feedback_seen>0]
         if df.shape[0] == 0:
             return None
-        df['weight'] = df.feedback_good+df.feedback_seen
-        num = get_random_weighed_element(df.weight)
+        num = get_random_weighed_element((df.feedback_good+df.feedback_seen).to_numpy())
         return df.filename.iloc[num]
 
 
 class AnyContentStrategy(IContentStrategy):
-    def choose_filename(self, ml: MediaLibrary) -> str | None:
-        df = ml.to_df()
+    def choose_filename(self, df: pd.DataFrame) -> str | None:
         return df.sample(1).filename.iloc[0]
 
 
@@ -77,9 +65,9 @@ class SequentialStrategy(IContentStrategy):
     def __init__(self, *strategies):
         self.strategies = strategies
 
-    def choose_filename(self, ml: MediaLibrary) -> str | None:
+    def choose_filename(self, df: pd.DataFrame) -> str | None:
         for s in self.strategies:
-            result = s.choose_filename(ml)
+            result = s.choose_filename(df)
             if result is not None:
                 return result
         return None
@@ -94,9 +82,9 @@ class WeightedStrategy:
     def __init__(self, *weighted_strategies: 'WeightedStrategy.Item'):
         self.random_strategies = weighted_strategies
 
-    def choose_filename(self, ml: MediaLibrary) -> str | None:
+    def choose_filename(self, df: pd.DataFrame) -> str | None:
         random_strategy = get_random_weighed_element([s.weight for s in self.random_strategies])
-        result = self.random_strategies[random_strategy].strategy.choose_filename(ml)
+        result = self.random_strategies[random_strategy].strategy.choose_filename(df)
         return result
 
 
@@ -1,11 +1,16 @@
 from typing import *
 from abc import ABC, abstractmethod
+from brainbox import MediaLibrary
+import numpy as np
 
 class ITagMatcher(ABC):
     @abstractmethod
     def match(self, tags: dict[str, str], additional_required_tags: None|dict[str,str]) -> bool:
         pass
 
+    def find_positions(self, ml: MediaLibrary, additional_required_tags: None|dict[str,str]) -> np.ndarray:
+        return np.flatnonzero([self.match(record.tags, additional_required_tags) for record in ml.records])
+
 class ITagMatcherFactory(ABC):
     @abstractmethod
     def prepare(self, state: dict[str, str]) -> ITagMatcher:
@@ -29,6 +34,14 @@ class ExactTagMatcher(ITagMatcher):
                 return False
         return True
 
+    def find_positions(self, ml: MediaLibrary, additional_required_tags: None|dict[str,str]) -> np.ndarray:
+        tags = {}
+        for key, value in self._yeild_key_values(additional_required_tags):
+            if key in tags and tags[key] != value:
+                return np.empty(0, dtype=np.int64)
+            tags[key] = value
+        return ml.find_positions(tags)
+
     class Factory1to1(ITagMatcherFactory):
         def prepare(self, state: dict[str, str]) -> ITagMatcher:
             return ExactTagMatcher({k:v for k,v in state.items()})
@@ -1,9 +1,10 @@
 import flask
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import struct
 import wave
 from kaia.common import Loc
+from brainbox.framework.common import IServingBackend, ThreadPoolServing
 import os
 import io
 
@@ -11,6 +12,7 @@ import io
 class WavServerSettings:
     folder: Path = Loc.data_folder/'wav_streaming'
     port: int = 13000
+    serving: IServingBackend = field(default_factory=ThreadPoolServing)
 
 
 class WavWriter:
@@ -40,7 +42,7 @@ class WavStreamingServer:
         app.add_url_rule('/', view_func=self.index, methods=['GET'])
         app.add_url_rule('/upload/<sample_rate>/<frame_length>/<file_name>', view_func=self.upload, methods=['POST'])
         app.add_url_rule('/download/<file_name>', view_func=self.download, methods=['GET'])
-        app.run('0.0.0.0', self.settings.port)
+        self.settings.serving.serve(app, '0.0.0.0', self.settings.port)
 
     def index(self):
         return 'OK'
@@ -11,6 +11,7 @@ from kaia.common import Loc
 from .bus import Bus, BusItem
 from dataclasses import dataclass, field
 from yo_fluq import FileIO
+from brainbox.framework.common import IServingBackend, ThreadPoolServing
 
 
 
@@ -30,6 +31,7 @@ class KaiaServerSettings:
     port: int = 8890
     web_folder: Path = Loc.root_folder/'web'
     custom_session_id: str = None
+    serving: IServingBackend = field(default_factory=ThreadPoolServing)
 
 
 class KaiaServer:
@@ -58,7 +60,7 @@ class KaiaServer:
             st = StaticPathProvider(disk_path)
             self.app.add_url_rule(full_path, view_func=st.get_file, endpoint='get_file_'+url_path, methods=['GET'])
 
-        self.app.run('0.0.0.0', self.settings.port)
+        self.settings.serving.serve(self.app, '0.0.0.0', self.settings.port)
 
 
     def index(self):
@@ -0,0 +1,31 @@
+from unittest import TestCase
+from kaia.avatar.media_library_manager import FeedbackProvider
+from kaia.common import Loc
+from yo_fluq import FileIO
+import pandas as pd
+import numpy as np
+
+
+class FeedbackProviderTestCase(TestCase):
+    def test_feedback_provider(self):
+        with Loc.create_test_file('jsonl') as file:
+            provider = FeedbackProvider(file, compaction_threshold=5)
+            provider.append_feedback('a', {'seen': 1})
+            provider.append_feedback('a', {'seen': 1})
+            provider.append_feedback('b', {'bad': 1})
+            self.assertEqual(3, len(FileIO.read_text(file).strip().split('\n')))
+            for i in range(20):
+                provider.append_feedback(f'x{i}', {'seen': 1})
+
+            df = pd.DataFrame(dict(filename=['a', 'b', 'c', 'x19']))
+            df = FeedbackProvider(file).add_feedback_to_df(df)
+            self.assertListEqual([2, 0, -1, 1], list(df.feedback_seen.fillna(-1)))
+            self.assertListEqual([0, 1, -1, 0], list(df.feedback_bad.fillna(-1)))
+            self.assertTrue(np.isnan(df.feedback_seen.iloc[2]))
+
+    def test_legacy_file(self):
+        with Loc.create_test_file('json') as file:
+            FileIO.write_json({'a': {'seen': 2, 'good': 1}}, file)
+            provider = FeedbackProvider(file)
+            provider.append_feedback('a', {'seen': 1})
+            self.assertDictEqual({'a': {'seen': 3, 'good': 1}}, FeedbackProvider(file).load_feedback())